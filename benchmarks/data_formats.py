@@ -0,0 +1,97 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+from devicehive.data_formats.json_data_format import JsonDataFormat
+from devicehive.data_formats.message_pack_data_format import \
+    MessagePackDataFormat
+import argparse
+import random
+import time
+
+
+def _envelopes():
+    rand = random.Random(1)
+    notification = {
+        'action': 'notification/insert',
+        'subscriptionId': 123456,
+        'notification': {
+            'id': 987654321,
+            'deviceId': 'sensor-0042',
+            'networkId': 7,
+            'deviceTypeId': 3,
+            'notification': 'telemetry',
+            'timestamp': '2018-03-01T12:00:00.123',
+            'parameters': {
+                'temperature': 21.37,
+                'humidity': 48,
+                'pressure': 101325,
+                'battery': 3.71,
+                'rssi': -67,
+                'samples': [rand.randint(0, 4095) for _ in range(32)]
+            }
+        }
+    }
+    command = {
+        'action': 'command/insert',
+        'requestId': 'a3b2c1d0-1111-2222-3333-444455556666',
+        'deviceId': 'sensor-0042',
+        'command': {
+            'command': 'set_interval',
+            'parameters': {'interval': 30, 'threshold': 0.25},
+            'lifetime': 600
+        }
+    }
+    floats = dict(notification)
+    floats['notification'] = dict(
+        notification['notification'],
+        parameters={'samples': [rand.random() * 100 for _ in range(1000)]})
+    return (('notification', notification, 1),
+            ('command/insert', command, 1),
+            ('1000 floats', floats, 100))
+
+
+def _time_per_call(call, data, num_calls):
+    start_time = time.time()
+    for _ in range(num_calls):
+        call(data)
+    return (time.time() - start_time) / num_calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare encoded size and encode/decode time of the '
+                    'available data formats on typical envelopes.')
+    parser.add_argument('--calls', type=int, default=20000)
+    args = parser.parse_args()
+    data_formats = [('json %s' % backend, JsonDataFormat(backend=backend))
+                    for backend in JsonDataFormat.available_backends()]
+    data_formats.append(('msgpack', MessagePackDataFormat()))
+    for name, envelope, calls_divider in _envelopes():
+        num_calls = max(args.calls // calls_divider, 1)
+        print(name)
+        for data_format_name, data_format in data_formats:
+            data = data_format.encode(envelope)
+            assert data_format.decode(data) == envelope
+            if not isinstance(data, bytes):
+                data = data.encode('utf-8')
+            print('  %-12s size: %6sB, encode: %8.1fus, decode: %8.1fus' % (
+                data_format_name, len(data),
+                _time_per_call(data_format.encode, envelope, num_calls),
+                _time_per_call(data_format.decode, data, num_calls)))
+
+
+if __name__ == '__main__':
+    main()
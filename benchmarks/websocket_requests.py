@@ -0,0 +1,167 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+from devicehive.transports.websocket_transport import WebsocketTransport
+from devicehive.data_formats.json_data_format import JsonDataFormat
+from devicehive.handlers.handler import Handler
+from collections import deque
+import argparse
+import threading
+import websocket
+import struct
+import json
+import time
+
+
+class FakeWebSocket(object):
+    """Fake websocket class answering every request after a delay."""
+
+    delay = 0.001
+
+    def __init__(self, **options):
+        self.timeout = None
+        self.sock = FakeSocket(self)
+        self._frames = deque()
+        self._condition = threading.Condition()
+
+    def _put(self, opcode, data):
+        with self._condition:
+            self._frames.append((opcode, data))
+            self._condition.notify()
+
+    def _respond(self, data):
+        request = json.loads(data)
+        response = {'requestId': request['requestId'],
+                    'action': request['action'], 'status': 'success'}
+        data = json.dumps(response).encode('utf-8')
+        timer = threading.Timer(self.delay, self._put,
+                                (websocket.ABNF.OPCODE_TEXT, data))
+        timer.daemon = True
+        timer.start()
+
+    def connect(self, url, **options):
+        pass
+
+    def recv_data(self, control_frame=False):
+        with self._condition:
+            while not self._frames:
+                self._condition.wait()
+            return self._frames.popleft()
+
+    def send(self, data, opcode=websocket.ABNF.OPCODE_TEXT):
+        self._respond(data)
+
+    def ping(self, payload=''):
+        self._put(websocket.ABNF.OPCODE_PONG, b'')
+
+    def close(self, **options):
+        self._put(websocket.ABNF.OPCODE_CLOSE, b'')
+
+
+class FakeSocket(object):
+    """Fake socket class splitting batched frames for fake websocket."""
+
+    def __init__(self, fake_websocket):
+        self._fake_websocket = fake_websocket
+
+    def sendall(self, data):
+        data = bytearray(data)
+        offset = 0
+        while offset < len(data):
+            length = data[offset + 1] & 0x7f
+            offset += 2
+            if length == 126:
+                length, = struct.unpack_from('>H', data, offset)
+                offset += 2
+            elif length == 127:
+                length, = struct.unpack_from('>Q', data, offset)
+                offset += 8
+            mask = data[offset:offset + 4]
+            offset += 4
+            payload = bytearray(byte ^ mask[index % 4] for index, byte in
+                                enumerate(data[offset:offset + length]))
+            offset += length
+            self._fake_websocket.send(bytes(payload))
+
+
+class BenchmarkHandler(Handler):
+    """Benchmark handler class."""
+
+    def handle_connect(self):
+        pass
+
+    def handle_event(self, event):
+        pass
+
+    def handle_disconnect(self):
+        pass
+
+
+def _process_time():
+    if hasattr(time, 'process_time'):
+        return time.process_time()
+    return time.clock()
+
+
+def _requests(transport, index, num_requests, latencies):
+    for request_index in range(num_requests):
+        request_id = '%s-%s' % (index, request_index)
+        start_time = time.time()
+        transport.request(request_id, 'benchmark', {})
+        latencies.append(time.time() - start_time)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure websocket transport request latency and cpu '
+                    'time against an in-process fake server.')
+    parser.add_argument('--threads', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--delay', type=float, default=0.001,
+                        help='Server response delay in seconds.')
+    args = parser.parse_args()
+    FakeWebSocket.delay = args.delay
+    websocket.WebSocket = FakeWebSocket
+    transport = WebsocketTransport(JsonDataFormat, {}, BenchmarkHandler, {})
+    transport.connect('ws://benchmark')
+    while not transport.connected:
+        time.sleep(0.01)
+    latencies = []
+    threads = [threading.Thread(target=_requests,
+                                args=(transport, index, args.requests,
+                                      latencies))
+               for index in range(args.threads)]
+    start_clock = _process_time()
+    start_time = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall_time = time.time() - start_time
+    cpu_time = _process_time() - start_clock
+    transport.disconnect()
+    transport.join()
+    latencies.sort()
+    num_requests = len(latencies)
+    print('requests: %s, wall: %.2fs, cpu/request: %.1fus, p50: %.2fms, '
+          'p99: %.2fms' % (num_requests, wall_time,
+                           cpu_time / num_requests * 1e6,
+                           latencies[num_requests // 2] * 1e3,
+                           latencies[int(num_requests * 0.99)] * 1e3))
+
+
+if __name__ == '__main__':
+    main()
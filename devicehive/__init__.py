@@ -17,6 +17,7 @@
 from .handler import Handler
 from .device_hive import DeviceHive
 from .device_hive_api import DeviceHiveApi
+from .token_store import FileTokenStore
 from .transports.transport import TransportError
 from .api_request import ApiRequestError
 from .api_response import ApiResponseError
@@ -25,3 +26,8 @@ from .network import NetworkError
 from .device_type import DeviceTypeError
 from .subscription import SubscriptionError
 from .user import UserError
+from .history_exporter import HistoryExporterError
+import six
+if six.PY3:
+    from .async_handler import AsyncHandler
+    from .async_device_hive import AsyncDeviceHive
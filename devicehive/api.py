@@ -19,6 +19,7 @@ from devicehive.api_request import ApiRequest
 from devicehive.api_request import AuthApiRequest
 from devicehive.api_request import AuthSubscriptionApiRequest
 from devicehive.device import Device
+from devicehive.device import DeviceError
 from devicehive.command import Command
 from devicehive.notification import Notification
 from devicehive.subscription import CommandsSubscription, \
@@ -26,28 +27,44 @@ from devicehive.subscription import CommandsSubscription, \
 from devicehive.network import Network
 from devicehive.device_type import DeviceType
 from devicehive.user import User
+from devicehive.entity_cache import EntityCache
+from devicehive.history_exporter import HistoryExporter
+from devicehive.transports.transport import TransportError
+from collections import deque
+import threading
+import time
+import six
 
 
-class Api(object):
-    """Api class."""
+class BaseApi(object):
+    """Base api class."""
+
+    SUBSCRIPTION_WAIT_TIMEOUT = 30
 
-    def __init__(self, transport, auth):
+    def __init__(self, transport, auth, entity_cache=None):
         self._transport = transport
         self._token = Token(self, auth)
+        self._entity_cache = EntityCache(**(entity_cache or {}))
         self._connected = True
         self._subscriptions = set()
+        self._subscription_ids = {}
+        self._subscription_ids_condition = threading.Condition()
+        self._num_pending_subscriptions = 0
         self.server_timestamp = None
 
-    def _subscribe_insert_commands(self, device_id=None, network_ids=(),
-                                   device_type_ids=(), names=(),
-                                   timestamp=None):
+    def _auth_subscription_api_request(self):
+        return AuthSubscriptionApiRequest(self)
+
+    def _subscribe_insert_commands_api_request(self, device_id, network_ids,
+                                               device_type_ids, names,
+                                               timestamp):
         action = 'command/insert'
         join_names = ','.join(map(str, names))
         join_network_ids = ','.join(map(str, network_ids))
         join_device_type_ids = ','.join(map(str, device_type_ids))
         if not timestamp:
             timestamp = self.server_timestamp
-        auth_subscription_api_request = AuthSubscriptionApiRequest(self)
+        auth_subscription_api_request = self._auth_subscription_api_request()
         auth_subscription_api_request.action(action)
         auth_subscription_api_request.url('device/command/poll')
         auth_subscription_api_request.param('deviceId', device_id)
@@ -65,18 +82,18 @@ class Api(object):
         api_request.set('names', names)
         api_request.set('timestamp', timestamp)
         api_request.subscription_request(auth_subscription_api_request)
-        return api_request.execute('Subscribe insert commands failure.')
+        return api_request
 
-    def _subscribe_update_commands(self, device_id=None, network_ids=(),
-                                   device_type_ids=(), names=(),
-                                   timestamp=None):
+    def _subscribe_update_commands_api_request(self, device_id, network_ids,
+                                               device_type_ids, names,
+                                               timestamp):
         action = 'command/update'
         join_names = ','.join(map(str, names))
         join_network_ids = ','.join(map(str, network_ids))
         join_device_type_ids = ','.join(map(str, device_type_ids))
         if not timestamp:
             timestamp = self.server_timestamp
-        auth_subscription_api_request = AuthSubscriptionApiRequest(self)
+        auth_subscription_api_request = self._auth_subscription_api_request()
         auth_subscription_api_request.action(action)
         auth_subscription_api_request.url('device/command/poll')
         auth_subscription_api_request.param('returnUpdatedCommands', True)
@@ -97,18 +114,18 @@ class Api(object):
         api_request.set('names', names)
         api_request.set('timestamp', timestamp)
         api_request.subscription_request(auth_subscription_api_request)
-        return api_request.execute('Subscribe update commands failure.')
+        return api_request
 
-    def _subscribe_notifications(self, device_id=None, network_ids=(),
-                                 device_type_ids=(), names=(),
-                                 timestamp=None):
+    def _subscribe_notifications_api_request(self, device_id, network_ids,
+                                             device_type_ids, names,
+                                             timestamp):
         action = 'notification/insert'
         join_names = ','.join(map(str, names))
         join_network_ids = ','.join(map(str, network_ids))
         join_device_type_ids = ','.join(map(str, device_type_ids))
         if not timestamp:
             timestamp = self.server_timestamp
-        auth_subscription_api_request = AuthSubscriptionApiRequest(self)
+        auth_subscription_api_request = self._auth_subscription_api_request()
         auth_subscription_api_request.action(action)
         auth_subscription_api_request.url('device/notification/poll')
         auth_subscription_api_request.param('deviceId', device_id)
@@ -126,7 +143,7 @@ class Api(object):
         api_request.set('names', names)
         api_request.set('timestamp', timestamp)
         api_request.subscription_request(auth_subscription_api_request)
-        return api_request.execute('Subscribe notifications failure.')
+        return api_request
 
     def _add_subscription(self, subscription):
         if subscription in self._subscriptions:
@@ -137,10 +154,39 @@ class Api(object):
         if subscription not in self._subscriptions:
             return
         self._subscriptions.remove(subscription)
-
-    def apply_subscription_calls(self):
-        for subscription in self._subscriptions:
-            subscription.subscribe()
+        with self._subscription_ids_condition:
+            self._subscription_ids.pop(subscription.id, None)
+
+    def add_pending_subscription(self):
+        with self._subscription_ids_condition:
+            self._num_pending_subscriptions += 1
+
+    def remove_pending_subscription(self):
+        with self._subscription_ids_condition:
+            self._num_pending_subscriptions -= 1
+            self._subscription_ids_condition.notify_all()
+
+    def set_subscription_id(self, subscription, subscription_id):
+        with self._subscription_ids_condition:
+            self._subscription_ids.pop(subscription.id, None)
+            self._subscription_ids[subscription_id] = subscription
+            self._subscription_ids_condition.notify_all()
+
+    def get_subscription(self, subscription_id):
+        return self._subscription_ids.get(subscription_id)
+
+    def wait_subscription(self, subscription_id, timeout=None):
+        if timeout is None:
+            timeout = self.SUBSCRIPTION_WAIT_TIMEOUT
+        deadline = time.time() + timeout
+        with self._subscription_ids_condition:
+            while (subscription_id not in self._subscription_ids and
+                   self._num_pending_subscriptions):
+                timeout = deadline - time.time()
+                if timeout <= 0:
+                    break
+                self._subscription_ids_condition.wait(timeout)
+            return self._subscription_ids.get(subscription_id)
 
     @property
     def transport(self):
@@ -150,26 +196,285 @@ class Api(object):
     def token(self):
         return self._token
 
+    @property
+    def entity_cache(self):
+        return self._entity_cache
+
     @property
     def connected(self):
         return self._connected
 
-    def get_info(self):
+    def _info_api_request(self):
         api_request = ApiRequest(self)
         api_request.url('info')
         api_request.action('server/info')
         api_request.response_key('info')
-        info = api_request.execute('Info get failure.')
+        return api_request
+
+    @staticmethod
+    def _info(info):
         return {'api_version': info['apiVersion'],
                 'server_timestamp': info['serverTimestamp'],
                 'rest_server_url': info.get('restServerUrl'),
                 'websocket_server_url': info.get('webSocketServerUrl')}
 
-    def get_cluster_info(self):
+    def _cluster_info_api_request(self):
         api_request = ApiRequest(self)
         api_request.url('info/config/cluster')
         api_request.action('cluster/info')
         api_request.response_key('clusterInfo')
+        return api_request
+
+    def _device(self, device=None):
+        return Device(self, device)
+
+    @staticmethod
+    def _put_device(device_id, name, data, network_id, device_type_id,
+                    is_blocked):
+        if not name:
+            name = device_id
+        return {Device.ID_KEY: device_id,
+                Device.NAME_KEY: name,
+                Device.DATA_KEY: data,
+                Device.NETWORK_ID_KEY: network_id,
+                Device.DEVICE_TYPE_ID_KEY: device_type_id,
+                Device.IS_BLOCKED_KEY: is_blocked}
+
+    def _list_devices_api_request(self, name, name_pattern, network_id,
+                                  network_name, sort_field, sort_order, take,
+                                  skip):
+        auth_api_request = AuthApiRequest(self)
+        auth_api_request.url('device')
+        auth_api_request.action('device/list')
+        auth_api_request.param('name', name)
+        auth_api_request.param('namePattern', name_pattern)
+        auth_api_request.param('networkId', network_id)
+        auth_api_request.param('networkName', network_name)
+        auth_api_request.param('sortField', sort_field)
+        auth_api_request.param('sortOrder', sort_order)
+        auth_api_request.param('take', take)
+        auth_api_request.param('skip', skip)
+        auth_api_request.response_key('devices')
+        return auth_api_request
+
+    def _command(self, command):
+        return Command(self, command)
+
+    def _list_commands_api_request(self, device_id, start, end, command,
+                                   status, sort_field, sort_order, take,
+                                   skip):
+        auth_api_request = AuthApiRequest(self)
+        auth_api_request.url('device/{deviceId}/command', deviceId=device_id)
+        auth_api_request.action('command/list')
+        auth_api_request.param('start', start)
+        auth_api_request.param('end', end)
+        auth_api_request.param('command', command)
+        auth_api_request.param('status', status)
+        auth_api_request.param('sortField', sort_field)
+        auth_api_request.param('sortOrder', sort_order)
+        auth_api_request.param('take', take)
+        auth_api_request.param('skip', skip)
+        auth_api_request.response_key('commands')
+        return auth_api_request
+
+    def _send_command_api_request(self, device_id, command_name, parameters,
+                                  lifetime, timestamp, status, result):
+        command = {Command.COMMAND_KEY: command_name}
+        if parameters:
+            command[Command.PARAMETERS_KEY] = parameters
+        if lifetime:
+            command[Command.LIFETIME_KEY] = lifetime
+        if timestamp:
+            command[Command.TIMESTAMP_KEY] = timestamp
+        if status:
+            command[Command.STATUS_KEY] = status
+        if result:
+            command[Command.RESULT_KEY] = result
+        auth_api_request = AuthApiRequest(self)
+        auth_api_request.method('POST')
+        auth_api_request.url('device/{deviceId}/command', deviceId=device_id)
+        auth_api_request.action('command/insert')
+        auth_api_request.set('command', command, True)
+        auth_api_request.response_key('command')
+        return auth_api_request
+
+    def _sent_command(self, command, device_id, command_name, parameters,
+                      lifetime, status, result):
+        command[Command.DEVICE_ID_KEY] = device_id
+        command[Command.COMMAND_KEY] = command_name
+        command[Command.PARAMETERS_KEY] = parameters
+        command[Command.LIFETIME_KEY] = lifetime
+        command[Command.STATUS_KEY] = status
+        command[Command.RESULT_KEY] = result
+        return self._command(command)
+
+    def _list_notifications_api_request(self, device_id, start, end,
+                                        notification, sort_field, sort_order,
+                                        take, skip):
+        auth_api_request = AuthApiRequest(self)
+        auth_api_request.url('device/{deviceId}/notification',
+                             deviceId=device_id)
+        auth_api_request.action('notification/list')
+        auth_api_request.param('start', start)
+        auth_api_request.param('end', end)
+        auth_api_request.param('notification', notification)
+        auth_api_request.param('sortField', sort_field)
+        auth_api_request.param('sortOrder', sort_order)
+        auth_api_request.param('take', take)
+        auth_api_request.param('skip', skip)
+        auth_api_request.response_key('notifications')
+        return auth_api_request
+
+    def _send_notification_api_request(self, device_id, notification_name,
+                                       parameters, timestamp):
+        notification = {'notification': notification_name}
+        if parameters:
+            notification['parameters'] = parameters
+        if timestamp:
+            notification['timestamp'] = timestamp
+        auth_api_request = AuthApiRequest(self)
+        auth_api_request.method('POST')
+        auth_api_request.url('device/{deviceId}/notification',
+                             deviceId=device_id)
+        auth_api_request.action('notification/insert')
+        auth_api_request.set('notification', notification, True)
+        auth_api_request.response_key('notification')
+        return auth_api_request
+
+    @staticmethod
+    def _sent_notification(notification, device_id, notification_name,
+                           parameters):
+        notification[Notification.DEVICE_ID_KEY] = device_id
+        notification[Notification.NOTIFICATION_KEY] = notification_name
+        notification[Notification.PARAMETERS_KEY] = parameters
+        return Notification(notification)
+
+    def _list_networks_api_request(self, name, name_pattern, sort_field,
+                                   sort_order, take, skip):
+        auth_api_request = AuthApiRequest(self)
+        auth_api_request.url('network')
+        auth_api_request.action('network/list')
+        auth_api_request.param('name', name)
+        auth_api_request.param('namePattern', name_pattern)
+        auth_api_request.param('sortField', sort_field)
+        auth_api_request.param('sortOrder', sort_order)
+        auth_api_request.param('take', take)
+        auth_api_request.param('skip', skip)
+        auth_api_request.response_key('networks')
+        return auth_api_request
+
+    def _list_device_types_api_request(self, name, name_pattern, sort_field,
+                                       sort_order, take, skip):
+        auth_api_request = AuthApiRequest(self)
+        auth_api_request.url('devicetype')
+        auth_api_request.action('devicetype/list')
+        auth_api_request.param('name', name)
+        auth_api_request.param('namePattern', name_pattern)
+        auth_api_request.param('sortField', sort_field)
+        auth_api_request.param('sortOrder', sort_order)
+        auth_api_request.param('take', take)
+        auth_api_request.param('skip', skip)
+        auth_api_request.response_key('deviceTypes')
+        return auth_api_request
+
+    def _list_users_api_request(self, login, login_pattern, role, status,
+                                sort_field, sort_order, take, skip):
+        auth_api_request = AuthApiRequest(self)
+        auth_api_request.url('user')
+        auth_api_request.action('user/list')
+        auth_api_request.param('login', login)
+        auth_api_request.param('loginPattern', login_pattern)
+        auth_api_request.param('role', role)
+        auth_api_request.param('status', status)
+        auth_api_request.param('sortField', sort_field)
+        auth_api_request.param('sortOrder', sort_order)
+        auth_api_request.param('take', take)
+        auth_api_request.param('skip', skip)
+        auth_api_request.response_key('users')
+        return auth_api_request
+
+    def disconnect(self):
+        self._connected = False
+        self._token.cancel_refresh()
+        if not self._transport.connected:
+            return
+        self._transport.disconnect()
+
+
+class Api(BaseApi):
+    """Api class."""
+
+    PUT_DEVICE_ARGS = ('device_id', 'name', 'data', 'network_id',
+                       'device_type_id', 'is_blocked')
+
+    def _subscribe_insert_commands(self, device_id=None, network_ids=(),
+                                   device_type_ids=(), names=(),
+                                   timestamp=None, wait=True):
+        api_request = self._subscribe_insert_commands_api_request(
+            device_id, network_ids, device_type_ids, names, timestamp)
+        error_message = 'Subscribe insert commands failure.'
+        if not wait:
+            return api_request.execute_async(error_message)
+        return api_request.execute(error_message)
+
+    def _subscribe_update_commands(self, device_id=None, network_ids=(),
+                                   device_type_ids=(), names=(),
+                                   timestamp=None, wait=True):
+        api_request = self._subscribe_update_commands_api_request(
+            device_id, network_ids, device_type_ids, names, timestamp)
+        error_message = 'Subscribe update commands failure.'
+        if not wait:
+            return api_request.execute_async(error_message)
+        return api_request.execute(error_message)
+
+    def _subscribe_notifications(self, device_id=None, network_ids=(),
+                                 device_type_ids=(), names=(),
+                                 timestamp=None, wait=True):
+        api_request = self._subscribe_notifications_api_request(
+            device_id, network_ids, device_type_ids, names, timestamp)
+        error_message = 'Subscribe notifications failure.'
+        if not wait:
+            return api_request.execute_async(error_message)
+        return api_request.execute(error_message)
+
+    def _iter(self, api_request, entity, error_message, take, skip):
+        api_request_future = api_request(take, skip).execute_async(
+            error_message)
+        while api_request_future:
+            entities = api_request_future.result()
+            skip += len(entities)
+            api_request_future = None
+            if entities:
+                api_request_future = api_request(take, skip).execute_async(
+                    error_message)
+            for entity_value in entities:
+                yield entity(entity_value)
+
+    def apply_subscription_calls(self):
+        for subscription in self._subscriptions:
+            subscription.subscribe()
+
+    def apply_connect_calls(self, api_init=True):
+        self.server_timestamp = None
+        info_future = None
+        if api_init:
+            api_request = self._info_api_request()
+            info_future = api_request.execute_async('Info get failure.')
+        subscription_futures = [subscription.subscribe_async()
+                                for subscription in self._subscriptions]
+        if info_future:
+            info = self._info(info_future.result())
+            self.server_timestamp = info['server_timestamp']
+        for subscription_future in subscription_futures:
+            subscription_future.result()
+
+    def get_info(self):
+        api_request = self._info_api_request()
+        info = api_request.execute('Info get failure.')
+        return self._info(info)
+
+    def get_cluster_info(self):
+        api_request = self._cluster_info_api_request()
         return api_request.execute('Cluster info get failure.')
 
     def get_property(self, name):
@@ -226,30 +531,34 @@ class Api(object):
         return self._token.access_token
 
     def subscribe_insert_commands(self, device_id=None, network_ids=(),
-                                  device_type_ids=(), names=(), timestamp=None):
+                                  device_type_ids=(), names=(), timestamp=None,
+                                  callback=None):
         call = self._subscribe_insert_commands
         args = (device_id, network_ids, device_type_ids, names, timestamp)
-        commands_subscription = CommandsSubscription(self, call, args)
+        commands_subscription = CommandsSubscription(self, call, args,
+                                                     callback)
         commands_subscription.subscribe()
         self._add_subscription(commands_subscription)
         return commands_subscription
 
     def subscribe_update_commands(self, device_id=None, network_ids=(),
                                   device_type_ids=(), names=(),
-                                  timestamp=None):
+                                  timestamp=None, callback=None):
         call = self._subscribe_update_commands
         args = (device_id, network_ids, device_type_ids, names, timestamp)
-        commands_subscription = CommandsSubscription(self, call, args)
+        commands_subscription = CommandsSubscription(self, call, args,
+                                                     callback)
         commands_subscription.subscribe()
         self._add_subscription(commands_subscription)
         return commands_subscription
 
     def subscribe_notifications(self, device_id=None, network_ids=(),
                                 device_type_ids=(), names=(),
-                                timestamp=None):
+                                timestamp=None, callback=None):
         call = self._subscribe_notifications
         args = (device_id, network_ids, device_type_ids, names, timestamp)
-        notifications_subscription = NotificationsSubscription(self, call, args)
+        notifications_subscription = NotificationsSubscription(self, call,
+                                                               args, callback)
         notifications_subscription.subscribe()
         self._add_subscription(notifications_subscription)
         return notifications_subscription
@@ -257,141 +566,232 @@ class Api(object):
     def list_devices(self, name=None, name_pattern=None, network_id=None,
                      network_name=None, sort_field=None, sort_order=None,
                      take=None, skip=None):
-        auth_api_request = AuthApiRequest(self)
-        auth_api_request.url('device')
-        auth_api_request.action('device/list')
-        auth_api_request.param('name', name)
-        auth_api_request.param('namePattern', name_pattern)
-        auth_api_request.param('networkId', network_id)
-        auth_api_request.param('networkName', network_name)
-        auth_api_request.param('sortField', sort_field)
-        auth_api_request.param('sortOrder', sort_order)
-        auth_api_request.param('take', take)
-        auth_api_request.param('skip', skip)
-        auth_api_request.response_key('devices')
+        auth_api_request = self._list_devices_api_request(
+            name, name_pattern, network_id, network_name, sort_field,
+            sort_order, take, skip)
         devices = auth_api_request.execute('List devices failure.')
-        return [Device(self, device) for device in devices]
+        return [self._device(device) for device in devices]
+
+    def iter_devices(self, name=None, name_pattern=None, network_id=None,
+                     network_name=None, sort_field=None, sort_order=None,
+                     take=100, skip=0):
+        return self._iter(
+            lambda page_take, page_skip: self._list_devices_api_request(
+                name, name_pattern, network_id, network_name, sort_field,
+                sort_order, page_take, page_skip),
+            self._device, 'List devices failure.', take, skip)
 
     def get_device(self, device_id):
-        device = Device(self)
+        device = self._entity_cache.get(EntityCache.DEVICE_ENTITY, device_id)
+        if device:
+            return self._device(device)
+        device = self._device()
         device.get(device_id)
         return device
 
     def put_device(self, device_id, name=None, data=None, network_id=None,
                    device_type_id=None, is_blocked=False):
-        if not name:
-            name = device_id
-        device = {Device.ID_KEY: device_id,
-                  Device.NAME_KEY: name,
-                  Device.DATA_KEY: data,
-                  Device.NETWORK_ID_KEY: network_id,
-                  Device.DEVICE_TYPE_ID_KEY: device_type_id,
-                  Device.IS_BLOCKED_KEY: is_blocked}
-        device = Device(self, device)
+        device = self._device(self._put_device(device_id, name, data,
+                                               network_id, device_type_id,
+                                               is_blocked))
         device.save()
         device.get(device_id)
         return device
 
+    def _put_devices_save(self, device_id, name=None, data=None,
+                          network_id=None, device_type_id=None,
+                          is_blocked=False):
+        device = self._device(self._put_device(device_id, name, data,
+                                               network_id, device_type_id,
+                                               is_blocked))
+        result = {'device_id': device.id, 'device': None, 'error': None}
+        auth_api_request = device._save_api_request()
+        api_request_future = auth_api_request.execute_async(
+            'Device save failure.')
+        return result, device, api_request_future, False
+
+    @staticmethod
+    def _put_devices_get(result, device):
+        auth_api_request = device._get_api_request(device.id)
+        api_request_future = auth_api_request.execute_async(
+            'Device get failure.')
+        return result, device, api_request_future, True
+
+    @classmethod
+    def _put_devices_args(cls, devices):
+        devices_args = []
+        for index, device in enumerate(devices):
+            if isinstance(device, six.string_types):
+                device = {'device_id': device}
+            if not isinstance(device, dict):
+                raise DeviceError('Device %s must be a device id or a dict. '
+                                  'Got: %r.' % (index, device))
+            unexpected_keys = set(device) - set(cls.PUT_DEVICE_ARGS)
+            if unexpected_keys:
+                raise DeviceError('Device %s has unexpected keys: %s.' %
+                                  (index, ', '.join(sorted(unexpected_keys))))
+            if not device.get('device_id'):
+                raise DeviceError('Device %s has no device_id.' % index)
+            devices_args.append(device)
+        return devices_args
+
+    def put_devices(self, devices, fetch=True, max_in_flight=64):
+        results = []
+        in_flight = deque()
+        devices = iter(self._put_devices_args(devices))
+        while True:
+            for device in devices:
+                put_device = self._put_devices_save(**device)
+                results.append(put_device[0])
+                in_flight.append(put_device)
+                if len(in_flight) >= max_in_flight:
+                    break
+            if not in_flight:
+                return results
+            result, device, api_request_future, fetched = in_flight.popleft()
+            try:
+                response = api_request_future.result()
+            except TransportError as error:
+                result['error'] = error
+                continue
+            if fetched:
+                device._init(response)
+                device._cache(response)
+            else:
+                device._uncache()
+            if not fetched and fetch:
+                in_flight.append(self._put_devices_get(result, device))
+                continue
+            result['device'] = device
+
     def list_commands(self, device_id, start=None, end=None, command=None,
                       status=None, sort_field=None, sort_order=None, take=None,
                       skip=None):
-        auth_api_request = AuthApiRequest(self)
-        auth_api_request.url('device/{deviceId}/command', deviceId=device_id)
-        auth_api_request.action('command/list')
-        auth_api_request.param('start', start)
-        auth_api_request.param('end', end)
-        auth_api_request.param('command', command)
-        auth_api_request.param('status', status)
-        auth_api_request.param('sortField', sort_field)
-        auth_api_request.param('sortOrder', sort_order)
-        auth_api_request.param('take', take)
-        auth_api_request.param('skip', skip)
-        auth_api_request.response_key('commands')
+        auth_api_request = self._list_commands_api_request(
+            device_id, start, end, command, status, sort_field, sort_order,
+            take, skip)
         commands = auth_api_request.execute('List commands failure.')
-        return [Command(self, command) for command in commands]
+        return [self._command(command) for command in commands]
+
+    def iter_commands(self, device_id, start=None, end=None, command=None,
+                      status=None, sort_field=None, sort_order=None, take=100,
+                      skip=0):
+        return self._iter(
+            lambda page_take, page_skip: self._list_commands_api_request(
+                device_id, start, end, command, status, sort_field,
+                sort_order, page_take, page_skip),
+            self._command, 'List commands failure.', take, skip)
+
+    def export_commands(self, path, device_id, start, end, command=None,
+                        status=None, output_format='ndjson', window=3600,
+                        take=1000, max_in_flight=8, checkpoint_path=None):
+        history_exporter = HistoryExporter(
+            lambda window_start, window_end, page_take, page_skip:
+            self._list_commands_api_request(
+                device_id, window_start, window_end, command, status,
+                HistoryExporter.TIMESTAMP_KEY, 'ASC', page_take, page_skip),
+            'List commands failure.', HistoryExporter.COMMAND_COLUMNS, start,
+            end, window, take, max_in_flight,
+            {'entity': 'commands', 'device_id': device_id,
+             'command': command, 'status': status})
+        return history_exporter.export(path, output_format, checkpoint_path)
 
     def send_command(self, device_id, command_name, parameters=None,
                      lifetime=None, timestamp=None, status=None, result=None):
-        command = {Command.COMMAND_KEY: command_name}
-        if parameters:
-            command[Command.PARAMETERS_KEY] = parameters
-        if lifetime:
-            command[Command.LIFETIME_KEY] = lifetime
-        if timestamp:
-            command[Command.TIMESTAMP_KEY] = timestamp
-        if status:
-            command[Command.STATUS_KEY] = status
-        if result:
-            command[Command.RESULT_KEY] = result
-        auth_api_request = AuthApiRequest(self)
-        auth_api_request.method('POST')
-        auth_api_request.url('device/{deviceId}/command', deviceId=device_id)
-        auth_api_request.action('command/insert')
-        auth_api_request.set('command', command, True)
-        auth_api_request.response_key('command')
+        auth_api_request = self._send_command_api_request(
+            device_id, command_name, parameters, lifetime, timestamp, status,
+            result)
         command = auth_api_request.execute('Command send failure.')
-        command[Command.DEVICE_ID_KEY] = device_id
-        command[Command.COMMAND_KEY] = command_name
-        command[Command.PARAMETERS_KEY] = parameters
-        command[Command.LIFETIME_KEY] = lifetime
-        command[Command.STATUS_KEY] = status
-        command[Command.RESULT_KEY] = result
-        return Command(self, command)
+        return self._sent_command(command, device_id, command_name,
+                                  parameters, lifetime, status, result)
+
+    def send_command_async(self, device_id, command_name, parameters=None,
+                           lifetime=None, timestamp=None, status=None,
+                           result=None):
+        auth_api_request = self._send_command_api_request(
+            device_id, command_name, parameters, lifetime, timestamp, status,
+            result)
+        api_request_future = auth_api_request.execute_async(
+            'Command send failure.')
+        api_request_future.add_result_handler(
+            lambda command: self._sent_command(command, device_id,
+                                               command_name, parameters,
+                                               lifetime, status, result))
+        return api_request_future
 
     def list_notifications(self, device_id, start=None, end=None,
                            notification=None, sort_field=None, sort_order=None,
                            take=None, skip=None):
-        auth_api_request = AuthApiRequest(self)
-        auth_api_request.url('device/{deviceId}/notification',
-                             deviceId=device_id)
-        auth_api_request.action('notification/list')
-        auth_api_request.param('start', start)
-        auth_api_request.param('end', end)
-        auth_api_request.param('notification', notification)
-        auth_api_request.param('sortField', sort_field)
-        auth_api_request.param('sortOrder', sort_order)
-        auth_api_request.param('take', take)
-        auth_api_request.param('skip', skip)
-        auth_api_request.response_key('notifications')
+        auth_api_request = self._list_notifications_api_request(
+            device_id, start, end, notification, sort_field, sort_order, take,
+            skip)
         notifications = auth_api_request.execute('List notifications failure.')
         return [Notification(notification) for notification in notifications]
 
+    def iter_notifications(self, device_id, start=None, end=None,
+                           notification=None, sort_field=None, sort_order=None,
+                           take=100, skip=0):
+        return self._iter(
+            lambda page_take, page_skip: self._list_notifications_api_request(
+                device_id, start, end, notification, sort_field, sort_order,
+                page_take, page_skip),
+            Notification, 'List notifications failure.', take, skip)
+
+    def export_notifications(self, path, device_id, start, end,
+                             notification=None, output_format='ndjson',
+                             window=3600, take=1000, max_in_flight=8,
+                             checkpoint_path=None):
+        history_exporter = HistoryExporter(
+            lambda window_start, window_end, page_take, page_skip:
+            self._list_notifications_api_request(
+                device_id, window_start, window_end, notification,
+                HistoryExporter.TIMESTAMP_KEY, 'ASC', page_take, page_skip),
+            'List notifications failure.',
+            HistoryExporter.NOTIFICATION_COLUMNS, start, end, window, take,
+            max_in_flight, {'entity': 'notifications', 'device_id': device_id,
+                            'notification': notification})
+        return history_exporter.export(path, output_format, checkpoint_path)
+
     def send_notification(self, device_id, notification_name, parameters=None,
                           timestamp=None):
-        notification = {'notification': notification_name}
-        if parameters:
-            notification['parameters'] = parameters
-        if timestamp:
-            notification['timestamp'] = timestamp
-        auth_api_request = AuthApiRequest(self)
-        auth_api_request.method('POST')
-        auth_api_request.url('device/{deviceId}/notification',
-                             deviceId=device_id)
-        auth_api_request.action('notification/insert')
-        auth_api_request.set('notification', notification, True)
-        auth_api_request.response_key('notification')
+        auth_api_request = self._send_notification_api_request(
+            device_id, notification_name, parameters, timestamp)
         notification = auth_api_request.execute('Notification send failure.')
-        notification[Notification.DEVICE_ID_KEY] = device_id
-        notification[Notification.NOTIFICATION_KEY] = notification_name
-        notification[Notification.PARAMETERS_KEY] = parameters
-        return Notification(notification)
+        return self._sent_notification(notification, device_id,
+                                       notification_name, parameters)
+
+    def send_notification_async(self, device_id, notification_name,
+                                parameters=None, timestamp=None):
+        auth_api_request = self._send_notification_api_request(
+            device_id, notification_name, parameters, timestamp)
+        api_request_future = auth_api_request.execute_async(
+            'Notification send failure.')
+        api_request_future.add_result_handler(
+            lambda notification: self._sent_notification(
+                notification, device_id, notification_name, parameters))
+        return api_request_future
 
     def list_networks(self, name=None, name_pattern=None, sort_field=None,
                       sort_order=None, take=None, skip=None):
-        auth_api_request = AuthApiRequest(self)
-        auth_api_request.url('network')
-        auth_api_request.action('network/list')
-        auth_api_request.param('name', name)
-        auth_api_request.param('namePattern', name_pattern)
-        auth_api_request.param('sortField', sort_field)
-        auth_api_request.param('sortOrder', sort_order)
-        auth_api_request.param('take', take)
-        auth_api_request.param('skip', skip)
-        auth_api_request.response_key('networks')
+        auth_api_request = self._list_networks_api_request(
+            name, name_pattern, sort_field, sort_order, take, skip)
         networks = auth_api_request.execute('List networks failure.')
         return [Network(self, network) for network in networks]
 
+    def iter_networks(self, name=None, name_pattern=None, sort_field=None,
+                      sort_order=None, take=100, skip=0):
+        return self._iter(
+            lambda page_take, page_skip: self._list_networks_api_request(
+                name, name_pattern, sort_field, sort_order, page_take,
+                page_skip),
+            lambda network: Network(self, network), 'List networks failure.',
+            take, skip)
+
     def get_network(self, network_id):
+        network = self._entity_cache.get(EntityCache.NETWORK_ENTITY,
+                                         network_id)
+        if network:
+            return Network(self, network)
         network = Network(self)
         network.get(network_id)
         return network
@@ -411,20 +811,25 @@ class Api(object):
 
     def list_device_types(self, name=None, name_pattern=None, sort_field=None,
                           sort_order=None, take=None, skip=None):
-        auth_api_request = AuthApiRequest(self)
-        auth_api_request.url('devicetype')
-        auth_api_request.action('devicetype/list')
-        auth_api_request.param('name', name)
-        auth_api_request.param('namePattern', name_pattern)
-        auth_api_request.param('sortField', sort_field)
-        auth_api_request.param('sortOrder', sort_order)
-        auth_api_request.param('take', take)
-        auth_api_request.param('skip', skip)
-        auth_api_request.response_key('deviceTypes')
+        auth_api_request = self._list_device_types_api_request(
+            name, name_pattern, sort_field, sort_order, take, skip)
         device_types = auth_api_request.execute('List device types failure.')
         return [DeviceType(self, device_type) for device_type in device_types]
 
+    def iter_device_types(self, name=None, name_pattern=None, sort_field=None,
+                          sort_order=None, take=100, skip=0):
+        return self._iter(
+            lambda page_take, page_skip: self._list_device_types_api_request(
+                name, name_pattern, sort_field, sort_order, page_take,
+                page_skip),
+            lambda device_type: DeviceType(self, device_type),
+            'List device types failure.', take, skip)
+
     def get_device_type(self, device_type_id):
+        device_type = self._entity_cache.get(EntityCache.DEVICE_TYPE_ENTITY,
+                                             device_type_id)
+        if device_type:
+            return DeviceType(self, device_type)
         device_type = DeviceType(self)
         device_type.get(device_type_id)
         return device_type
@@ -445,27 +850,30 @@ class Api(object):
 
     def list_users(self, login=None, login_pattern=None, role=None, status=None,
                    sort_field=None, sort_order=None, take=None, skip=None):
-        auth_api_request = AuthApiRequest(self)
-        auth_api_request.url('user')
-        auth_api_request.action('user/list')
-        auth_api_request.param('login', login)
-        auth_api_request.param('loginPattern', login_pattern)
-        auth_api_request.param('role', role)
-        auth_api_request.param('status', status)
-        auth_api_request.param('sortField', sort_field)
-        auth_api_request.param('sortOrder', sort_order)
-        auth_api_request.param('take', take)
-        auth_api_request.param('skip', skip)
-        auth_api_request.response_key('users')
+        auth_api_request = self._list_users_api_request(
+            login, login_pattern, role, status, sort_field, sort_order, take,
+            skip)
         users = auth_api_request.execute('List users failure.')
         return [User(self, user) for user in users]
 
+    def iter_users(self, login=None, login_pattern=None, role=None,
+                   status=None, sort_field=None, sort_order=None, take=100,
+                   skip=0):
+        return self._iter(
+            lambda page_take, page_skip: self._list_users_api_request(
+                login, login_pattern, role, status, sort_field, sort_order,
+                page_take, page_skip),
+            lambda user: User(self, user), 'List users failure.', take, skip)
+
     def get_current_user(self):
         user = User(self)
         user.get_current()
         return user
 
     def get_user(self, user_id):
+        user = self._entity_cache.get(EntityCache.USER_ENTITY, user_id)
+        if user:
+            return User(self, user)
         user = User(self)
         user.get(user_id)
         return user
@@ -491,9 +899,3 @@ class Api(object):
         user[User.STATUS_KEY] = status
         user[User.DATA_KEY] = data
         return User(self, user)
-
-    def disconnect(self):
-        self._connected = False
-        if not self._transport.connected:
-            return
-        self._transport.disconnect()
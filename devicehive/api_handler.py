@@ -15,10 +15,13 @@
 
 
 from devicehive.handlers.handler import Handler
+from devicehive.handler_dispatcher import HandlerDispatcher
+from devicehive.handler_process_pool import HandlerProcessPool
 from devicehive.api import Api
 from devicehive.api_event import ApiEvent
 from devicehive.command import Command
 from devicehive.notification import Notification
+from collections import OrderedDict
 
 
 class ApiHandler(Handler):
@@ -29,43 +32,192 @@ class ApiHandler(Handler):
     EVENT_COMMAND_KEY = 'command'
     EVENT_NOTIFICATION_ACTION = 'notification/insert'
     EVENT_NOTIFICATION_KEY = 'notification'
+    EVENT_DEVICE_ID_KEY = 'deviceId'
+    EVENT_HANDLE_METHODS = {
+        EVENT_COMMAND_INSERT_ACTION: 'handle_command_insert',
+        EVENT_COMMAND_UPDATE_ACTION: 'handle_command_update',
+        EVENT_NOTIFICATION_ACTION: 'handle_notification'}
+    EVENTS_HANDLE_METHODS = {
+        EVENT_COMMAND_INSERT_ACTION: 'handle_commands_insert',
+        EVENT_COMMAND_UPDATE_ACTION: 'handle_commands_update',
+        EVENT_NOTIFICATION_ACTION: 'handle_notifications'}
 
     def __init__(self, transport, auth, handler_class, handler_args,
-                 handler_kwargs, api_init):
+                 handler_kwargs, api_init, entity_cache, fast_connect,
+                 handler_workers=0, handler_queue_max_size=0,
+                 handler_processes=0, handler_process_start_method=None):
         super(ApiHandler, self).__init__(transport)
-        self._api = Api(self._transport, auth)
+        self._api = Api(self._transport, auth, entity_cache)
         self._handler = handler_class(self._api, *handler_args,
                                       **handler_kwargs)
         self._api_init = api_init
+        self._fast_connect = fast_connect
         self._handle_connect = False
+        self._dispatcher = None
+        self._process_pool = None
+        assert not (handler_workers and handler_processes), \
+            'Handler workers and processes can not be used together'
+        if handler_workers:
+            self._dispatcher = HandlerDispatcher(
+                handler_workers, handler_queue_max_size,
+                self._handle_dispatcher_exception)
+        if handler_processes:
+            self._process_pool = HandlerProcessPool(
+                self._api, handler_processes, handler_class, handler_args,
+                handler_kwargs, handler_process_start_method)
 
     @property
     def handler(self):
         return self._handler
 
-    def handle_connect(self):
-        self._api.token.auth()
+    @property
+    def dispatcher(self):
+        return self._dispatcher
+
+    @property
+    def process_pool(self):
+        return self._process_pool
+
+    def _handle_dispatcher_exception(self):
+        try:
+            self._transport.disconnect()
+        except self._transport.error:
+            pass
+
+    def _close_dispatcher(self):
+        self._dispatcher.close()
+        self._dispatcher.join()
+
+    def _close_process_pool(self):
+        self._process_pool.close()
+        self._process_pool.join()
+
+    def _apply_connect_calls(self):
         if self._api_init:
             server_timestamp = self._api.get_info()['server_timestamp']
             self._api.server_timestamp = server_timestamp
         self._api.apply_subscription_calls()
+
+    def handle_connect(self):
+        self._api.token.auth()
+        if self._fast_connect:
+            self._api.apply_connect_calls(self._api_init)
+        else:
+            self._apply_connect_calls()
         if not self._handle_connect:
             self._handle_connect = True
             self._handler.handle_connect()
 
-    def handle_event(self, event):
+    def _event_data(self, event):
         api_event = ApiEvent(event)
         action = api_event.action
         event = api_event.event
-        if action == self.EVENT_COMMAND_INSERT_ACTION:
-            command = Command(self._api, event[self.EVENT_COMMAND_KEY])
-            return self._handler.handle_command_insert(command)
-        if action == self.EVENT_COMMAND_UPDATE_ACTION:
-            command = Command(self._api, event[self.EVENT_COMMAND_KEY])
-            return self._handler.handle_command_update(command)
+        subscription = self._api.wait_subscription(api_event.subscription_id)
+        if subscription and not subscription.handle_event(action, event):
+            return None, None, None
+        callback = subscription.callback if subscription else None
+        if action in (self.EVENT_COMMAND_INSERT_ACTION,
+                      self.EVENT_COMMAND_UPDATE_ACTION):
+            return action, event[self.EVENT_COMMAND_KEY], callback
+        if action == self.EVENT_NOTIFICATION_ACTION:
+            return action, event[self.EVENT_NOTIFICATION_KEY], callback
+        return None, None, None
+
+    def _entity(self, action, data):
         if action == self.EVENT_NOTIFICATION_ACTION:
-            notification = Notification(event[self.EVENT_NOTIFICATION_KEY])
-            return self._handler.handle_notification(notification)
+            return Notification(data)
+        return Command(self._api, data)
+
+    def _event_entity(self, event):
+        action, data, callback = self._event_data(event)
+        if not action:
+            return None, None, None
+        return action, self._entity(action, data), callback
+
+    def _process_events(self, events):
+        self._process_pool.raise_exception()
+        device_events = OrderedDict()
+        for event in events:
+            action, data, callback = self._event_data(event)
+            if not action:
+                continue
+            if callback:
+                callback(self._entity(action, data))
+                continue
+            device_id = data[self.EVENT_DEVICE_ID_KEY]
+            device_events.setdefault(device_id, [])
+            action_events = device_events[device_id]
+            if action_events and action_events[-1][0] == action:
+                action_events[-1][1].append(data)
+                continue
+            action_events.append((action, [data]))
+        for device_id, action_events in device_events.items():
+            self._process_pool.dispatch(device_id, action_events)
+
+    def _handle_entities(self, action, entities):
+        handle = getattr(self._handler, self.EVENTS_HANDLE_METHODS[action])
+        handle(entities)
+
+    def _handle_event_entities(self, event_entities):
+        entities_action = None
+        entities = []
+        for action, entity, callback in event_entities:
+            if entities and (callback or action != entities_action):
+                self._handle_entities(entities_action, entities)
+                entities = []
+            if not self._api.connected:
+                return
+            if callback:
+                callback(entity)
+                continue
+            entities_action = action
+            entities.append(entity)
+        if entities:
+            self._handle_entities(entities_action, entities)
+
+    def handle_event(self, event):
+        if self._process_pool:
+            return self._process_events([event])
+        action, entity, callback = self._event_entity(event)
+        if not action:
+            return
+        handle = callback or getattr(self._handler,
+                                     self.EVENT_HANDLE_METHODS[action])
+        if not self._dispatcher:
+            return handle(entity)
+        self._dispatcher.raise_exception()
+        self._dispatcher.dispatch(entity.device_id, handle, entity)
+
+    def handle_events(self, events):
+        if self._process_pool:
+            return self._process_events(events)
+        event_entities = []
+        for event in events:
+            event_entity = self._event_entity(event)
+            if event_entity[0]:
+                event_entities.append(event_entity)
+        if not self._dispatcher:
+            return self._handle_event_entities(event_entities)
+        self._dispatcher.raise_exception()
+        device_event_entities = OrderedDict()
+        for event_entity in event_entities:
+            device_id = event_entity[1].device_id
+            device_event_entities.setdefault(device_id, [])
+            device_event_entities[device_id].append(event_entity)
+        for device_id, event_entities in device_event_entities.items():
+            self._dispatcher.dispatch(device_id, self._handle_event_entities,
+                                      event_entities)
 
     def handle_disconnect(self):
-        pass
+        if self._dispatcher and self._dispatcher.exception_info:
+            self._close_dispatcher()
+            self._dispatcher.raise_exception()
+        if self._process_pool and self._process_pool.exception:
+            self._close_process_pool()
+            self._process_pool.raise_exception()
+        if self._api.connected:
+            return
+        if self._dispatcher:
+            self._close_dispatcher()
+        if self._process_pool:
+            self._close_process_pool()
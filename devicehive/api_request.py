@@ -17,7 +17,9 @@
 from devicehive.api_response import ApiResponse
 from devicehive.api_response import ApiResponseError
 from devicehive.transports.transport import TransportError
+import threading
 import uuid
+import time
 import logging
 
 
@@ -100,13 +102,17 @@ class ApiRequest(object):
     def response_key(self, key):
         self._params['response_key'] = key
 
-    def execute(self, error_message):
+    def extract(self):
         request_id = self._uuid()
         request = self._request.copy()
         logger.debug('Request id: %s. Action: %s. Request: %s. Params: %s.',
                      request_id, self._action, request, self._params)
-        response = self._api.transport.request(request_id, self._action,
-                                               request, **self._params)
+        return {'request_id': request_id,
+                'action': self._action,
+                'request': request,
+                'params': self._params}
+
+    def handle_response(self, response, error_message):
         api_response = ApiResponse(response, self._params['response_key'])
         logger.debug('Response id: %s. Action: %s. Success: %s. Response: %s.',
                      api_response.id, api_response.action, api_response.success,
@@ -116,20 +122,152 @@ class ApiRequest(object):
         raise ApiResponseError(error_message, self._api.transport.name,
                                api_response.code, api_response.error)
 
+    def _handle_response_error(self, api_response_error, error_message):
+        raise api_response_error
+
+    def execute(self, error_message):
+        request = self.extract()
+        response = self._api.transport.request(request['request_id'],
+                                               request['action'],
+                                               request['request'],
+                                               **request['params'])
+        return self.handle_response(response, error_message)
+
+    def _retry_async(self, api_response_error, error_message):
+        raise api_response_error
+
+    def _execute_async(self, error_message, retry):
+        request = self.extract()
+        transport_future = self._api.transport.request_async(
+            request['request_id'], request['action'], request['request'],
+            **request['params'])
+        return ApiRequestFuture(self, request['request_id'], transport_future,
+                                error_message, retry,
+                                request['params'].get('timeout'))
+
+    def execute_async(self, error_message):
+        return self._execute_async(error_message, True)
+
+    def cancel(self, request_id):
+        self._api.transport.cancel_request(request_id)
+
 
 class AuthApiRequest(ApiRequest):
     """Auth api request class."""
 
-    def execute(self, error_message):
+    def _handle_response_error(self, api_response_error, error_message):
+        if api_response_error.code != 401:
+            raise api_response_error
+        self._api.token.auth(self._access_token)
+        self.header(*self._api.token.auth_header)
+        return super(AuthApiRequest, self).execute(error_message)
+
+    def _retry_async(self, api_response_error, error_message):
+        if api_response_error.code != 401:
+            raise api_response_error
+        self._api.token.auth(self._access_token)
+        self.header(*self._api.token.auth_header)
+        return self._execute_async(error_message, False)
+
+    def _ensure_token(self):
+        if self._api.token.expired:
+            self._api.token.auth()
+        self._access_token = self._api.token.access_token
         self.header(*self._api.token.auth_header)
+
+    def execute(self, error_message):
+        self._ensure_token()
         try:
             return super(AuthApiRequest, self).execute(error_message)
         except ApiResponseError as api_response_error:
-            if api_response_error.code != 401:
+            return self._handle_response_error(api_response_error,
+                                               error_message)
+
+    def execute_async(self, error_message):
+        self._ensure_token()
+        return super(AuthApiRequest, self).execute_async(error_message)
+
+
+class ApiRequestFuture(object):
+    """Api request future class."""
+
+    DEFAULT_TIMEOUT = 30
+
+    def __init__(self, api_request, request_id, transport_future,
+                 error_message, retry=True, default_timeout=None):
+        if default_timeout is None:
+            default_timeout = self.DEFAULT_TIMEOUT
+        self._api_request = api_request
+        self._default_timeout = default_timeout
+        self._request_id = request_id
+        self._transport_future = transport_future
+        self._error_message = error_message
+        self._retry = retry
+        self._result_handlers = []
+        self._resolve_lock = threading.Lock()
+        self._resolved = False
+        self._result = None
+        self._exception = None
+
+    @staticmethod
+    def _timeout(deadline):
+        return max(deadline - time.time(), 0)
+
+    def _wait(self, timeout):
+        try:
+            self._transport_future.exception(timeout)
+        except TransportError:
+            self._api_request.cancel(self._request_id)
+            raise
+
+    def _resolve(self, deadline):
+        response = self._transport_future.result().copy()
+        try:
+            result = self._api_request.handle_response(response,
+                                                       self._error_message)
+        except ApiResponseError as api_response_error:
+            if not self._retry:
                 raise
-        self._api.token.auth()
-        self.header(*self._api.token.auth_header)
-        return super(AuthApiRequest, self).execute(error_message)
+            retry_future = self._api_request._retry_async(
+                api_response_error, self._error_message)
+            result = retry_future.result(self._timeout(deadline))
+        for result_handler in self._result_handlers:
+            result = result_handler(result)
+        return result
+
+    def _response_result(self, transport_future):
+        try:
+            return self._api_request.handle_response(
+                transport_future.result(0).copy(), self._error_message)
+        except Exception:
+            return None
+
+    def add_result_handler(self, result_handler):
+        self._result_handlers.append(result_handler)
+
+    def add_response_handler(self, response_handler):
+        self._transport_future.add_done_callback(
+            lambda transport_future: response_handler(
+                self._response_result(transport_future)))
+
+    def done(self):
+        return self._transport_future.done()
+
+    def result(self, timeout=None):
+        if timeout is None:
+            timeout = self._default_timeout
+        deadline = time.time() + timeout
+        self._wait(timeout)
+        with self._resolve_lock:
+            if not self._resolved:
+                try:
+                    self._result = self._resolve(deadline)
+                except TransportError as transport_error:
+                    self._exception = transport_error
+                self._resolved = True
+        if self._exception:
+            raise self._exception
+        return self._result
 
 
 class SubscriptionApiRequest(object):
@@ -207,8 +345,10 @@ class AuthSubscriptionApiRequest(SubscriptionApiRequest):
         if response_code != 401:
             return
         try:
-            token.auth()
             auth_header_name, auth_header_value = token.auth_header
+            if params['headers'].get(auth_header_name) == auth_header_value:
+                token.auth()
+                auth_header_name, auth_header_value = token.auth_header
             params['headers'][auth_header_name] = auth_header_value
             return True
         except ApiResponseError:
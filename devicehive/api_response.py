@@ -67,6 +67,7 @@ class ApiResponseError(TransportError):
     """Api response error."""
 
     def __init__(self, message, transport_name, code, error):
+        self._message = message
         message = '%s Transport: %s. Code: %s. Error: %s' % (message,
                                                              transport_name,
                                                              code, error)
@@ -75,6 +76,10 @@ class ApiResponseError(TransportError):
         self._code = code
         self._error = error
 
+    def __reduce__(self):
+        return self.__class__, (self._message, self._transport_name,
+                                self._code, self._error)
+
     @property
     def transport_name(self):
         return self._transport_name
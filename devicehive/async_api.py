@@ -0,0 +1,216 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+from devicehive.api import BaseApi
+from devicehive.api_request import AuthApiRequest
+from devicehive.api_response import ApiResponseError
+from devicehive.async_api_request import AsyncAuthSubscriptionApiRequest
+from devicehive.async_token import AsyncToken
+from devicehive.async_device import AsyncDevice
+from devicehive.async_command import AsyncCommand
+from devicehive.notification import Notification
+from devicehive.async_subscription import AsyncCommandsSubscription, \
+    AsyncNotificationsSubscription
+import asyncio
+
+
+class AsyncApi(BaseApi):
+    """Async api class."""
+
+    def __init__(self, transport, auth, entity_cache=None):
+        super(AsyncApi, self).__init__(transport, auth, entity_cache)
+        self._token = AsyncToken(self, auth)
+
+    def _auth_subscription_api_request(self):
+        return AsyncAuthSubscriptionApiRequest(self)
+
+    def _device(self, device=None):
+        return AsyncDevice(self, device)
+
+    def _command(self, command):
+        return AsyncCommand(self, command)
+
+    async def _execute(self, api_request, error_message):
+        request = api_request.extract()
+        response = await self._transport.request(request['request_id'],
+                                                 request['action'],
+                                                 request['request'],
+                                                 **request['params'])
+        return api_request.handle_response(response, error_message)
+
+    async def execute(self, api_request, error_message):
+        if not isinstance(api_request, AuthApiRequest):
+            return await self._execute(api_request, error_message)
+        if self._token.expired:
+            await self._token.auth()
+        access_token = self._token.access_token
+        api_request.header(*self._token.auth_header)
+        try:
+            return await self._execute(api_request, error_message)
+        except ApiResponseError as api_response_error:
+            if api_response_error.code != 401:
+                raise
+        await self._token.auth(access_token)
+        api_request.header(*self._token.auth_header)
+        return await self._execute(api_request, error_message)
+
+    async def _subscribe_insert_commands(self, device_id=None, network_ids=(),
+                                         device_type_ids=(), names=(),
+                                         timestamp=None):
+        api_request = self._subscribe_insert_commands_api_request(
+            device_id, network_ids, device_type_ids, names, timestamp)
+        return await self.execute(api_request,
+                                  'Subscribe insert commands failure.')
+
+    async def _subscribe_update_commands(self, device_id=None, network_ids=(),
+                                         device_type_ids=(), names=(),
+                                         timestamp=None):
+        api_request = self._subscribe_update_commands_api_request(
+            device_id, network_ids, device_type_ids, names, timestamp)
+        return await self.execute(api_request,
+                                  'Subscribe update commands failure.')
+
+    async def _subscribe_notifications(self, device_id=None, network_ids=(),
+                                       device_type_ids=(), names=(),
+                                       timestamp=None):
+        api_request = self._subscribe_notifications_api_request(
+            device_id, network_ids, device_type_ids, names, timestamp)
+        return await self.execute(api_request,
+                                  'Subscribe notifications failure.')
+
+    async def apply_subscription_calls(self):
+        for subscription in self._subscriptions:
+            await subscription.subscribe()
+
+    async def apply_connect_calls(self, api_init=True):
+        self.server_timestamp = None
+        calls = [subscription.subscribe()
+                 for subscription in self._subscriptions]
+        if api_init:
+            calls.insert(0, self.get_info())
+        results = await asyncio.gather(*calls)
+        if api_init:
+            self.server_timestamp = results[0]['server_timestamp']
+
+    async def get_info(self):
+        api_request = self._info_api_request()
+        info = await self.execute(api_request, 'Info get failure.')
+        return self._info(info)
+
+    async def get_cluster_info(self):
+        api_request = self._cluster_info_api_request()
+        return await self.execute(api_request, 'Cluster info get failure.')
+
+    async def refresh_token(self):
+        await self._token.refresh()
+        return self._token.access_token
+
+    async def subscribe_insert_commands(self, device_id=None, network_ids=(),
+                                        device_type_ids=(), names=(),
+                                        timestamp=None, callback=None):
+        call = self._subscribe_insert_commands
+        args = (device_id, network_ids, device_type_ids, names, timestamp)
+        commands_subscription = AsyncCommandsSubscription(self, call, args,
+                                                          callback)
+        await commands_subscription.subscribe()
+        self._add_subscription(commands_subscription)
+        return commands_subscription
+
+    async def subscribe_update_commands(self, device_id=None, network_ids=(),
+                                        device_type_ids=(), names=(),
+                                        timestamp=None, callback=None):
+        call = self._subscribe_update_commands
+        args = (device_id, network_ids, device_type_ids, names, timestamp)
+        commands_subscription = AsyncCommandsSubscription(self, call, args,
+                                                          callback)
+        await commands_subscription.subscribe()
+        self._add_subscription(commands_subscription)
+        return commands_subscription
+
+    async def subscribe_notifications(self, device_id=None, network_ids=(),
+                                      device_type_ids=(), names=(),
+                                      timestamp=None, callback=None):
+        call = self._subscribe_notifications
+        args = (device_id, network_ids, device_type_ids, names, timestamp)
+        notifications_subscription = AsyncNotificationsSubscription(
+            self, call, args, callback)
+        await notifications_subscription.subscribe()
+        self._add_subscription(notifications_subscription)
+        return notifications_subscription
+
+    async def list_devices(self, name=None, name_pattern=None, network_id=None,
+                           network_name=None, sort_field=None, sort_order=None,
+                           take=None, skip=None):
+        auth_api_request = self._list_devices_api_request(
+            name, name_pattern, network_id, network_name, sort_field,
+            sort_order, take, skip)
+        devices = await self.execute(auth_api_request,
+                                     'List devices failure.')
+        return [self._device(device) for device in devices]
+
+    async def get_device(self, device_id):
+        device = self._device()
+        await device.get(device_id)
+        return device
+
+    async def put_device(self, device_id, name=None, data=None,
+                         network_id=None, device_type_id=None,
+                         is_blocked=False):
+        device = self._device(self._put_device(device_id, name, data,
+                                               network_id, device_type_id,
+                                               is_blocked))
+        await device.save()
+        await device.get(device_id)
+        return device
+
+    async def list_commands(self, device_id, start=None, end=None,
+                            command=None, status=None, sort_field=None,
+                            sort_order=None, take=None, skip=None):
+        auth_api_request = self._list_commands_api_request(
+            device_id, start, end, command, status, sort_field, sort_order,
+            take, skip)
+        commands = await self.execute(auth_api_request,
+                                      'List commands failure.')
+        return [self._command(command) for command in commands]
+
+    async def send_command(self, device_id, command_name, parameters=None,
+                           lifetime=None, timestamp=None, status=None,
+                           result=None):
+        auth_api_request = self._send_command_api_request(
+            device_id, command_name, parameters, lifetime, timestamp, status,
+            result)
+        command = await self.execute(auth_api_request, 'Command send failure.')
+        return self._sent_command(command, device_id, command_name,
+                                  parameters, lifetime, status, result)
+
+    async def list_notifications(self, device_id, start=None, end=None,
+                                 notification=None, sort_field=None,
+                                 sort_order=None, take=None, skip=None):
+        auth_api_request = self._list_notifications_api_request(
+            device_id, start, end, notification, sort_field, sort_order, take,
+            skip)
+        notifications = await self.execute(auth_api_request,
+                                           'List notifications failure.')
+        return [Notification(notification) for notification in notifications]
+
+    async def send_notification(self, device_id, notification_name,
+                                parameters=None, timestamp=None):
+        auth_api_request = self._send_notification_api_request(
+            device_id, notification_name, parameters, timestamp)
+        notification = await self.execute(auth_api_request,
+                                          'Notification send failure.')
+        return self._sent_notification(notification, device_id,
+                                       notification_name, parameters)
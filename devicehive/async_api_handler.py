@@ -0,0 +1,121 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+from devicehive.handlers.handler import Handler
+from devicehive.async_api import AsyncApi
+from devicehive.api_event import ApiEvent
+from devicehive.async_command import AsyncCommand
+from devicehive.notification import Notification
+
+
+class AsyncApiHandler(Handler):
+    """Async api handler class."""
+
+    EVENT_COMMAND_INSERT_ACTION = 'command/insert'
+    EVENT_COMMAND_UPDATE_ACTION = 'command/update'
+    EVENT_COMMAND_KEY = 'command'
+    EVENT_NOTIFICATION_ACTION = 'notification/insert'
+    EVENT_NOTIFICATION_KEY = 'notification'
+    EVENT_HANDLE_METHODS = {
+        EVENT_COMMAND_INSERT_ACTION: 'handle_command_insert',
+        EVENT_COMMAND_UPDATE_ACTION: 'handle_command_update',
+        EVENT_NOTIFICATION_ACTION: 'handle_notification'}
+    EVENTS_HANDLE_METHODS = {
+        EVENT_COMMAND_INSERT_ACTION: 'handle_commands_insert',
+        EVENT_COMMAND_UPDATE_ACTION: 'handle_commands_update',
+        EVENT_NOTIFICATION_ACTION: 'handle_notifications'}
+
+    def __init__(self, transport, auth, handler_class, handler_args,
+                 handler_kwargs, api_init, entity_cache, fast_connect):
+        super(AsyncApiHandler, self).__init__(transport)
+        self._api = AsyncApi(self._transport, auth, entity_cache)
+        self._handler = handler_class(self._api, *handler_args,
+                                      **handler_kwargs)
+        self._api_init = api_init
+        self._fast_connect = fast_connect
+        self._handle_connect = False
+
+    @property
+    def handler(self):
+        return self._handler
+
+    async def _apply_connect_calls(self):
+        if self._api_init:
+            info = await self._api.get_info()
+            self._api.server_timestamp = info['server_timestamp']
+        await self._api.apply_subscription_calls()
+
+    async def handle_connect(self):
+        await self._api.token.auth()
+        if self._fast_connect:
+            await self._api.apply_connect_calls(self._api_init)
+        else:
+            await self._apply_connect_calls()
+        if not self._handle_connect:
+            self._handle_connect = True
+            await self._handler.handle_connect()
+
+    def _event_entity(self, event):
+        api_event = ApiEvent(event)
+        action = api_event.action
+        event = api_event.event
+        subscription = self._api.get_subscription(api_event.subscription_id)
+        if subscription and not subscription.handle_event(action, event):
+            return None, None, None
+        callback = subscription.callback if subscription else None
+        if action in (self.EVENT_COMMAND_INSERT_ACTION,
+                      self.EVENT_COMMAND_UPDATE_ACTION):
+            command = AsyncCommand(self._api, event[self.EVENT_COMMAND_KEY])
+            return action, command, callback
+        if action == self.EVENT_NOTIFICATION_ACTION:
+            notification = Notification(event[self.EVENT_NOTIFICATION_KEY])
+            return action, notification, callback
+        return None, None, None
+
+    async def _handle_entities(self, action, entities):
+        handle = getattr(self._handler, self.EVENTS_HANDLE_METHODS[action])
+        await handle(entities)
+
+    async def handle_event(self, event):
+        action, entity, callback = self._event_entity(event)
+        if not action:
+            return
+        handle = callback or getattr(self._handler,
+                                     self.EVENT_HANDLE_METHODS[action])
+        return await handle(entity)
+
+    async def handle_events(self, events):
+        entities_action = None
+        entities = []
+        for event in events:
+            action, entity, callback = self._event_entity(event)
+            if not action:
+                continue
+            if entities and (callback or action != entities_action):
+                await self._handle_entities(entities_action, entities)
+                entities = []
+            if not self._api.connected:
+                return
+            if callback:
+                await callback(entity)
+                continue
+            entities_action = action
+            entities.append(entity)
+        if entities:
+            await self._handle_entities(entities_action, entities)
+
+    async def handle_disconnect(self):
+        pass
@@ -0,0 +1,36 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+from devicehive.api_request import AuthSubscriptionApiRequest
+from devicehive.api_response import ApiResponseError
+
+
+class AsyncAuthSubscriptionApiRequest(AuthSubscriptionApiRequest):
+    """Async auth subscription api request class."""
+
+    @staticmethod
+    async def response_error_handler(params, response_code, token):
+        if response_code != 401:
+            return
+        try:
+            auth_header_name, auth_header_value = token.auth_header
+            if params['headers'].get(auth_header_name) == auth_header_value:
+                await token.auth()
+                auth_header_name, auth_header_value = token.auth_header
+            params['headers'][auth_header_name] = auth_header_value
+            return True
+        except ApiResponseError:
+            return
@@ -0,0 +1,53 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+from devicehive.device import Device
+import asyncio
+
+
+class AsyncDevice(Device):
+    """Async device class."""
+
+    async def get(self, device_id):
+        auth_api_request = self._get_api_request(device_id)
+        device = await self._api.execute(auth_api_request,
+                                         'Device get failure.')
+        self._init(device)
+        self._cache(device)
+
+    async def save(self):
+        auth_api_request = self._save_api_request()
+        await self._api.execute(auth_api_request, 'Device save failure.')
+        self._uncache()
+
+    async def remove(self):
+        auth_api_request = self._remove_api_request()
+        await self._api.execute(auth_api_request, 'Device remove failure.')
+        self._uncache()
+        self._clear()
+
+    def send_command_async(self, command_name, parameters=None, lifetime=None,
+                           timestamp=None, status=None, result=None):
+        self._ensure_exists()
+        return asyncio.ensure_future(self.send_command(
+            command_name, parameters=parameters, lifetime=lifetime,
+            timestamp=timestamp, status=status, result=result))
+
+    def send_notification_async(self, notification_name, parameters=None,
+                                timestamp=None):
+        self._ensure_exists()
+        return asyncio.ensure_future(self.send_notification(
+            notification_name, parameters=parameters, timestamp=timestamp))
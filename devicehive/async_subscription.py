@@ -0,0 +1,44 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+from devicehive.subscription import BaseSubscription
+
+
+class AsyncBaseSubscription(BaseSubscription):
+    """AsyncBaseSubscription class"""
+
+    async def subscribe(self):
+        self._subscribed(await self._call(*self._call_args()))
+
+    async def remove(self):
+        api_request = self._remove_api_request()
+        await self._api.execute(api_request, 'Unsubscribe failure.')
+        self._api.remove_subscription(self)
+        self._id = None
+
+
+class AsyncCommandsSubscription(AsyncBaseSubscription):
+    """AsyncCommandsSubscription class"""
+
+    def _get_subscription_type(self):
+        return 'command'
+
+
+class AsyncNotificationsSubscription(AsyncBaseSubscription):
+    """AsyncNotificationsSubscription class"""
+
+    def _get_subscription_type(self):
+        return 'notification'
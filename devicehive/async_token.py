@@ -0,0 +1,108 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+from devicehive.token import Token
+from devicehive.token import TokenError
+from devicehive.api_response import ApiResponseError
+import asyncio
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncToken(Token):
+    """Async token class."""
+
+    def __init__(self, api, auth):
+        super(AsyncToken, self).__init__(api, auth)
+        self._auth_lock = asyncio.Lock()
+
+    def _schedule_refresh(self):
+        self.cancel_refresh()
+        refresh_delay = self._refresh_delay()
+        if refresh_delay is None:
+            return
+        self._refresh_timer = asyncio.get_event_loop().call_later(
+            refresh_delay,
+            lambda: asyncio.ensure_future(self._background_refresh()))
+
+    async def _background_refresh(self):
+        if not self._api.connected:
+            return
+        self._num_refresh_retries += 1
+        try:
+            await self.auth()
+        except Exception:
+            logger.warning('Background token refresh failure.', exc_info=True)
+            self._schedule_refresh()
+
+    async def _auth(self):
+        api_request = self._auth_api_request()
+        if not api_request.websocket_transport:
+            return
+        await self._api.execute(api_request, 'Authentication failure.')
+
+    async def _tokens(self):
+        api_request = self._tokens_api_request()
+        tokens = await self._api.execute(api_request, 'Login failure.')
+        self._set_tokens(tokens)
+
+    async def _refresh(self):
+        api_request = self._refresh_api_request()
+        tokens = await self._api.execute(api_request,
+                                         'Token refresh failure.')
+        self._set_access_token(tokens)
+
+    async def _authenticate(self):
+        if self._load_tokens():
+            try:
+                await self._auth()
+                return
+            except ApiResponseError as api_response_error:
+                if api_response_error.code != 401:
+                    raise
+        if self._refresh_token:
+            await self._refresh()
+            await self._auth()
+            return
+        if self._access_token:
+            await self._auth()
+            return
+        if self._login and self._password:
+            await self._tokens()
+            await self._auth()
+            return
+        if self._login:
+            raise TokenError('Password required.')
+        if self._password:
+            raise TokenError('Login required.')
+
+    async def auth(self, access_token=None):
+        if access_token is None:
+            access_token = self._access_token
+        async with self._auth_lock:
+            if self._access_token != access_token:
+                return
+            await self._authenticate()
+
+    async def refresh(self, access_token=None):
+        if access_token is None:
+            access_token = self._access_token
+        async with self._auth_lock:
+            if self._access_token != access_token:
+                return
+            await self._refresh()
@@ -75,7 +75,7 @@ class Command(object):
     def last_updated(self):
         return self._last_updated
 
-    def save(self):
+    def _save_api_request(self):
         command = {self.STATUS_KEY: self.status, self.RESULT_KEY: self.result}
         auth_api_request = AuthApiRequest(self._api)
         auth_api_request.method('PUT')
@@ -83,4 +83,8 @@ class Command(object):
                              deviceId=self._device_id, commandId=self._id)
         auth_api_request.action('command/update')
         auth_api_request.set('command', command, True)
+        return auth_api_request
+
+    def save(self):
+        auth_api_request = self._save_api_request()
         auth_api_request.execute('Command save failure.')
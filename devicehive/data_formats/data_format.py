@@ -40,6 +40,13 @@ class DataFormat(object):
     def binary_data_type(self):
         return self._data_type == self.BINARY_DATA_TYPE
 
+    @property
+    def bytes_decoding(self):
+        return self.binary_data_type
+
+    def may_contain_key(self, data, key):
+        return True
+
     def encode(self, data):
         raise NotImplementedError
 
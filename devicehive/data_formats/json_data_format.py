@@ -16,16 +16,94 @@
 
 from devicehive.data_formats.data_format import DataFormat
 import json
+import sys
+import six
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 class JsonDataFormat(DataFormat):
     """Json data format class."""
 
-    def __init__(self):
+    JSON_BACKEND = 'json'
+    ORJSON_BACKEND = 'orjson'
+    BACKENDS = (JSON_BACKEND, ORJSON_BACKEND)
+    SEPARATORS = (',', ':')
+    JSON_BYTES_DECODING = six.PY2 or sys.version_info >= (3, 6)
+
+    def __init__(self, backend=JSON_BACKEND):
         super(JsonDataFormat, self).__init__('json', self.TEXT_DATA_TYPE)
+        assert backend in self.BACKENDS, 'Unexpected json backend'
+        assert backend in self.available_backends(), \
+            'Json backend "%s" is not installed' % backend
+        self._backend = backend
+        self._json_encoder = json.JSONEncoder(separators=self.SEPARATORS,
+                                              ensure_ascii=False)
+        self._ascii_json_encoder = json.JSONEncoder(
+            separators=self.SEPARATORS)
+        if backend == self.ORJSON_BACKEND:
+            self._encode = self._orjson_encode
+            self._decode = self._orjson_decode
+        else:
+            self._encode = self._json_encode
+            self._decode = self._json_decode
+
+    @classmethod
+    def available_backends(cls):
+        if orjson:
+            return cls.BACKENDS
+        return cls.BACKENDS[:1]
+
+    @property
+    def backend(self):
+        return self._backend
+
+    @property
+    def bytes_decoding(self):
+        if self._backend == self.ORJSON_BACKEND:
+            return True
+        return self.JSON_BYTES_DECODING
+
+    @staticmethod
+    def _utf8(data):
+        if isinstance(data, six.text_type):
+            return data.encode('utf-8')
+        return data
+
+    def _json_encode(self, data):
+        try:
+            return self._utf8(self._json_encoder.encode(data))
+        except UnicodeEncodeError:
+            return self._utf8(self._ascii_json_encoder.encode(data))
+
+    def _orjson_encode(self, data):
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            return self._json_encode(data)
+
+    def _json_decode(self, data):
+        if not self.JSON_BYTES_DECODING and \
+                isinstance(data, (bytes, bytearray)):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+    def _orjson_decode(self, data):
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            return self._json_decode(data)
+
+    def may_contain_key(self, data, key):
+        key = '"%s"' % key
+        if not isinstance(data, six.text_type):
+            key = key.encode('utf-8')
+        return key in data
 
     def encode(self, data):
-        return json.dumps(data)
+        return self._encode(data)
 
     def decode(self, data):
-        return json.loads(data)
+        return self._decode(data)
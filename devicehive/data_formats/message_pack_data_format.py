@@ -0,0 +1,212 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+from devicehive.data_formats.data_format import DataFormat
+import struct
+import six
+
+
+class MessagePackDataFormat(DataFormat):
+    """Message pack data format class."""
+
+    UINT8 = struct.Struct('>B')
+    UINT16 = struct.Struct('>H')
+    UINT32 = struct.Struct('>I')
+    UINT64 = struct.Struct('>Q')
+    INT8 = struct.Struct('>b')
+    INT16 = struct.Struct('>h')
+    INT32 = struct.Struct('>i')
+    INT64 = struct.Struct('>q')
+    FLOAT32 = struct.Struct('>f')
+    FLOAT64 = struct.Struct('>d')
+    NIL = b'\xc0'
+    FALSE = b'\xc2'
+    TRUE = b'\xc3'
+    VALUE_TYPES = {0xca: FLOAT32, 0xcb: FLOAT64, 0xcc: UINT8, 0xcd: UINT16,
+                   0xce: UINT32, 0xcf: UINT64, 0xd0: INT8, 0xd1: INT16,
+                   0xd2: INT32, 0xd3: INT64}
+    STR_TYPES = {0xd9: UINT8, 0xda: UINT16, 0xdb: UINT32}
+    BIN_TYPES = {0xc4: UINT8, 0xc5: UINT16, 0xc6: UINT32}
+    ARRAY_TYPES = {0xdc: UINT16, 0xdd: UINT32}
+    MAP_TYPES = {0xde: UINT16, 0xdf: UINT32}
+
+    def __init__(self):
+        super(MessagePackDataFormat, self).__init__('msgpack',
+                                                    self.BINARY_DATA_TYPE)
+
+    def _encode_int(self, value, chunks):
+        if 0 <= value < 0x80:
+            return chunks.append(self.UINT8.pack(value))
+        if -0x20 <= value < 0:
+            return chunks.append(self.INT8.pack(value))
+        if value > 0:
+            if value <= 0xff:
+                return chunks.append(b'\xcc' + self.UINT8.pack(value))
+            if value <= 0xffff:
+                return chunks.append(b'\xcd' + self.UINT16.pack(value))
+            if value <= 0xffffffff:
+                return chunks.append(b'\xce' + self.UINT32.pack(value))
+            if value <= 0xffffffffffffffff:
+                return chunks.append(b'\xcf' + self.UINT64.pack(value))
+        else:
+            if value >= -0x80:
+                return chunks.append(b'\xd0' + self.INT8.pack(value))
+            if value >= -0x8000:
+                return chunks.append(b'\xd1' + self.INT16.pack(value))
+            if value >= -0x80000000:
+                return chunks.append(b'\xd2' + self.INT32.pack(value))
+            if value >= -0x8000000000000000:
+                return chunks.append(b'\xd3' + self.INT64.pack(value))
+        raise ValueError('Integer %s is out of range' % value)
+
+    def _encode_str(self, value, chunks):
+        if isinstance(value, six.text_type):
+            value = value.encode('utf-8')
+        length = len(value)
+        if length < 0x20:
+            chunks.append(self.UINT8.pack(0xa0 | length))
+        elif length <= 0xff:
+            chunks.append(b'\xd9' + self.UINT8.pack(length))
+        elif length <= 0xffff:
+            chunks.append(b'\xda' + self.UINT16.pack(length))
+        else:
+            chunks.append(b'\xdb' + self.UINT32.pack(length))
+        chunks.append(value)
+
+    def _encode_bin(self, value, chunks):
+        length = len(value)
+        if length <= 0xff:
+            chunks.append(b'\xc4' + self.UINT8.pack(length))
+        elif length <= 0xffff:
+            chunks.append(b'\xc5' + self.UINT16.pack(length))
+        else:
+            chunks.append(b'\xc6' + self.UINT32.pack(length))
+        chunks.append(bytes(value))
+
+    def _encode_value(self, value, chunks):
+        if value is None:
+            return chunks.append(self.NIL)
+        if value is True:
+            return chunks.append(self.TRUE)
+        if value is False:
+            return chunks.append(self.FALSE)
+        if isinstance(value, six.string_types):
+            return self._encode_str(value, chunks)
+        if isinstance(value, six.integer_types):
+            return self._encode_int(value, chunks)
+        if isinstance(value, float):
+            return chunks.append(b'\xcb' + self.FLOAT64.pack(value))
+        if isinstance(value, dict):
+            length = len(value)
+            if length < 0x10:
+                chunks.append(self.UINT8.pack(0x80 | length))
+            elif length <= 0xffff:
+                chunks.append(b'\xde' + self.UINT16.pack(length))
+            else:
+                chunks.append(b'\xdf' + self.UINT32.pack(length))
+            for key, item in six.iteritems(value):
+                self._encode_value(key, chunks)
+                self._encode_value(item, chunks)
+            return
+        if isinstance(value, (list, tuple)):
+            length = len(value)
+            if length < 0x10:
+                chunks.append(self.UINT8.pack(0x90 | length))
+            elif length <= 0xffff:
+                chunks.append(b'\xdc' + self.UINT16.pack(length))
+            else:
+                chunks.append(b'\xdd' + self.UINT32.pack(length))
+            for item in value:
+                self._encode_value(item, chunks)
+            return
+        if isinstance(value, (six.binary_type, bytearray)):
+            return self._encode_bin(value, chunks)
+        raise TypeError('%r is not message pack serializable' % (value,))
+
+    def _decode_value(self, data, offset):
+        code = data[offset]
+        offset += 1
+        if code < 0x80:
+            return code, offset
+        if code >= 0xe0:
+            return code - 0x100, offset
+        if code >= 0xa0 and code < 0xc0:
+            end = offset + (code & 0x1f)
+            return data[offset:end].decode('utf-8'), end
+        if code < 0x90:
+            return self._decode_map(data, offset, code & 0x0f)
+        if code < 0xa0:
+            return self._decode_array(data, offset, code & 0x0f)
+        if code == 0xc0:
+            return None, offset
+        if code == 0xc2:
+            return False, offset
+        if code == 0xc3:
+            return True, offset
+        value_type = self.VALUE_TYPES.get(code)
+        if value_type:
+            value, = value_type.unpack_from(data, offset)
+            return value, offset + value_type.size
+        if code in self.STR_TYPES:
+            length_type = self.STR_TYPES[code]
+            length, = length_type.unpack_from(data, offset)
+            offset += length_type.size
+            end = offset + length
+            return data[offset:end].decode('utf-8'), end
+        if code in self.BIN_TYPES:
+            length_type = self.BIN_TYPES[code]
+            length, = length_type.unpack_from(data, offset)
+            offset += length_type.size
+            end = offset + length
+            return bytes(data[offset:end]), end
+        if code in self.ARRAY_TYPES:
+            length_type = self.ARRAY_TYPES[code]
+            length, = length_type.unpack_from(data, offset)
+            return self._decode_array(data, offset + length_type.size, length)
+        if code in self.MAP_TYPES:
+            length_type = self.MAP_TYPES[code]
+            length, = length_type.unpack_from(data, offset)
+            return self._decode_map(data, offset + length_type.size, length)
+        raise ValueError('Unexpected message pack type 0x%02x' % code)
+
+    def _decode_array(self, data, offset, length):
+        array = []
+        for _ in range(length):
+            item, offset = self._decode_value(data, offset)
+            array.append(item)
+        return array, offset
+
+    def _decode_map(self, data, offset, length):
+        obj = {}
+        for _ in range(length):
+            key, offset = self._decode_value(data, offset)
+            obj[key], offset = self._decode_value(data, offset)
+        return obj, offset
+
+    def may_contain_key(self, data, key):
+        return self.encode(key) in data
+
+    def encode(self, data):
+        chunks = []
+        self._encode_value(data, chunks)
+        return b''.join(chunks)
+
+    def decode(self, data):
+        data = bytearray(data)
+        obj, offset = self._decode_value(data, 0)
+        if offset != len(data):
+            raise ValueError('Extra data after message pack object')
+        return obj
@@ -16,6 +16,7 @@
 
 from devicehive.api_request import AuthApiRequest
 from devicehive.api_request import ApiRequestError
+from devicehive.entity_cache import EntityCache
 
 
 class Device(object):
@@ -52,19 +53,14 @@ class Device(object):
             return
         raise DeviceError('Device does not exist.')
 
-    @property
-    def id(self):
-        return self._id
-
-    def get(self, device_id):
+    def _get_api_request(self, device_id):
         auth_api_request = AuthApiRequest(self._api)
         auth_api_request.url('device/{deviceId}', deviceId=device_id)
         auth_api_request.action('device/get')
         auth_api_request.response_key('device')
-        device = auth_api_request.execute('Device get failure.')
-        self._init(device)
+        return auth_api_request
 
-    def save(self):
+    def _save_api_request(self):
         self._ensure_exists()
         device = {self.NAME_KEY: self.name,
                   self.DATA_KEY: self.data,
@@ -76,15 +72,17 @@ class Device(object):
         auth_api_request.url('device/{deviceId}', deviceId=self._id)
         auth_api_request.action('device/save')
         auth_api_request.set('device', device, True)
-        auth_api_request.execute('Device save failure.')
+        return auth_api_request
 
-    def remove(self):
+    def _remove_api_request(self):
         self._ensure_exists()
         auth_api_request = AuthApiRequest(self._api)
         auth_api_request.method('DELETE')
         auth_api_request.url('device/{deviceId}', deviceId=self._id)
         auth_api_request.action('device/delete')
-        auth_api_request.execute('Device remove failure.')
+        return auth_api_request
+
+    def _clear(self):
         self._id = None
         self.name = None
         self.data = None
@@ -92,15 +90,47 @@ class Device(object):
         self.device_type_id = None
         self.is_blocked = None
 
-    def subscribe_insert_commands(self, names=(), timestamp=None):
+    def _cache(self, device):
+        self._api.entity_cache.put(EntityCache.DEVICE_ENTITY,
+                                   device[self.ID_KEY], device)
+
+    def _uncache(self):
+        self._api.entity_cache.remove(EntityCache.DEVICE_ENTITY, self._id)
+
+    @property
+    def id(self):
+        return self._id
+
+    def get(self, device_id):
+        auth_api_request = self._get_api_request(device_id)
+        device = auth_api_request.execute('Device get failure.')
+        self._init(device)
+        self._cache(device)
+
+    def save(self):
+        auth_api_request = self._save_api_request()
+        auth_api_request.execute('Device save failure.')
+        self._uncache()
+
+    def remove(self):
+        auth_api_request = self._remove_api_request()
+        auth_api_request.execute('Device remove failure.')
+        self._uncache()
+        self._clear()
+
+    def subscribe_insert_commands(self, names=(), timestamp=None,
+                                  callback=None):
         self._ensure_exists()
         return self._api.subscribe_insert_commands(self.id, names=names,
-                                                   timestamp=timestamp)
+                                                   timestamp=timestamp,
+                                                   callback=callback)
 
-    def subscribe_update_commands(self, names=(), timestamp=None):
+    def subscribe_update_commands(self, names=(), timestamp=None,
+                                  callback=None):
         self._ensure_exists()
         return self._api.subscribe_update_commands(self.id, names=names,
-                                                   timestamp=timestamp)
+                                                   timestamp=timestamp,
+                                                   callback=callback)
 
     def list_commands(self, start=None, end=None, command=None, status=None,
                       sort_field=None, sort_order=None, take=None, skip=None):
@@ -120,10 +150,21 @@ class Device(object):
                                       timestamp=timestamp, status=status,
                                       result=result)
 
-    def subscribe_notifications(self, names=(), timestamp=None):
+    def send_command_async(self, command_name, parameters=None, lifetime=None,
+                           timestamp=None, status=None, result=None):
+        self._ensure_exists()
+        return self._api.send_command_async(device_id=self._id,
+                                            command_name=command_name,
+                                            parameters=parameters,
+                                            lifetime=lifetime,
+                                            timestamp=timestamp, status=status,
+                                            result=result)
+
+    def subscribe_notifications(self, names=(), timestamp=None, callback=None):
         self._ensure_exists()
         return self._api.subscribe_notifications(self.id, names=names,
-                                                 timestamp=timestamp)
+                                                 timestamp=timestamp,
+                                                 callback=callback)
 
     def list_notifications(self, start=None, end=None, notification=None,
                            sort_field=None, sort_order=None, take=None,
@@ -144,6 +185,13 @@ class Device(object):
                                            parameters=parameters,
                                            timestamp=timestamp)
 
+    def send_notification_async(self, notification_name, parameters=None,
+                                timestamp=None):
+        self._ensure_exists()
+        return self._api.send_notification_async(
+            device_id=self._id, notification_name=notification_name,
+            parameters=parameters, timestamp=timestamp)
+
 
 class DeviceError(ApiRequestError):
     """Device error."""
@@ -31,6 +31,8 @@ class DeviceHive(object):
         self._api_handler_options = {'handler_class': handler_class,
                                      'handler_args': handler_args,
                                      'handler_kwargs': handler_kwargs}
+        self._data_format_class = JsonDataFormat
+        self._data_format_options = {}
         self._transport_name = None
         self._transport = None
 
@@ -39,7 +41,9 @@ class DeviceHive(object):
         class_name = '%sTransport' % self._transport_name.title()
         transport_module = __import__(name, globals(), locals(), [name])
         transport_class = getattr(transport_module, class_name)
-        self._transport = transport_class(JsonDataFormat, {}, ApiHandler,
+        self._transport = transport_class(self._data_format_class,
+                                          self._data_format_options,
+                                          ApiHandler,
                                           self._api_handler_options)
 
     def _ensure_transport_disconnect(self):
@@ -61,6 +65,14 @@ class DeviceHive(object):
     def handler(self):
         return self._transport.handler.handler
 
+    @property
+    def dispatcher(self):
+        return self._transport.handler.dispatcher
+
+    @property
+    def process_pool(self):
+        return self._transport.handler.process_pool
+
     def connect(self, transport_url, **options):
         self._transport_name = self.transport_name(transport_url)
         assert self._transport_name, 'Unexpected transport url scheme'
@@ -73,10 +85,30 @@ class DeviceHive(object):
         auth = {'login': options.pop('login', None),
                 'password': options.pop('password', None),
                 'refresh_token': options.pop('refresh_token', None),
-                'access_token': options.pop('access_token', None)}
+                'access_token': options.pop('access_token', None),
+                'token_store': options.pop('token_store', None),
+                'transport_url': transport_url}
         api_init = options.pop('api_init', True)
+        entity_cache = options.pop('entity_cache', None)
+        fast_connect = options.pop('fast_connect', False)
+        self._data_format_class = options.pop('data_format_class',
+                                              JsonDataFormat)
+        self._data_format_options = options.pop('data_format_options', {})
+        handler_workers = options.pop('handler_workers', 0)
+        handler_queue_max_size = options.pop('handler_queue_max_size', 0)
+        handler_processes = options.pop('handler_processes', 0)
+        handler_process_start_method = options.pop(
+            'handler_process_start_method', None)
         self._api_handler_options['auth'] = auth
         self._api_handler_options['api_init'] = api_init
+        self._api_handler_options['entity_cache'] = entity_cache
+        self._api_handler_options['fast_connect'] = fast_connect
+        self._api_handler_options['handler_workers'] = handler_workers
+        self._api_handler_options['handler_queue_max_size'] = \
+            handler_queue_max_size
+        self._api_handler_options['handler_processes'] = handler_processes
+        self._api_handler_options['handler_process_start_method'] = \
+            handler_process_start_method
         self._init_transport()
         if not transport_keep_alive:
             self._ensure_transport_disconnect()
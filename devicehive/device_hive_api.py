@@ -16,6 +16,7 @@
 
 from devicehive.handler import Handler
 from devicehive.device_hive import DeviceHive
+import threading
 import time
 import six
 
@@ -43,11 +44,27 @@ class ApiCallHandler(Handler):
     def handle_connect(self):
         self._result = getattr(self.api, self._call)(*self._args,
                                                      **self._kwargs)
+        self.api.token.cancel_refresh()
         self._ready = True
         while self.api.transport.connected:
             time.sleep(self._timeout)
 
 
+class ApiSessionHandler(Handler):
+    """Api session handler class."""
+
+    def __init__(self, api):
+        super(ApiSessionHandler, self).__init__(api)
+        self._ready = False
+
+    @property
+    def ready(self):
+        return self._ready
+
+    def handle_connect(self):
+        self._ready = True
+
+
 class DeviceHiveApi(object):
     """Device hive api class."""
 
@@ -56,6 +73,9 @@ class DeviceHiveApi(object):
         transport_alive_sleep_time = options.pop('transport_alive_sleep_time',
                                                  1e-6)
         self._transport_alive_sleep_time = transport_alive_sleep_time
+        self._session = options.pop('session', False)
+        self._session_device_hive = None
+        self._session_lock = threading.Lock()
         options['transport_keep_alive'] = False
         options['api_init'] = False
         self._options = options
@@ -86,15 +106,48 @@ class DeviceHiveApi(object):
         unset_methods = ['list_devices']
         DeviceHiveApi._unset_methods(device_type, unset_methods)
 
-    def _call(self, call, *args, **kwargs):
-        device_hive = DeviceHive(ApiCallHandler, call, *args, **kwargs)
+    def _connect(self, handler_class, *handler_args, **handler_kwargs):
+        device_hive = DeviceHive(handler_class, *handler_args,
+                                 **handler_kwargs)
         device_hive.connect(self._transport_url, **self._options)
         while not device_hive.handler.ready:
             time.sleep(self._transport_alive_sleep_time)
             if device_hive.transport.exception_info:
                 six.reraise(*device_hive.transport.exception_info)
+        return device_hive
+
+    @staticmethod
+    def _session_alive(device_hive):
+        transport = device_hive.transport
+        return transport.connected and not transport.exception_info
+
+    @staticmethod
+    def _close_session(device_hive):
+        try:
+            device_hive.handler.api.disconnect()
+        except device_hive.transport.error:
+            pass
+
+    def _session_api(self):
+        with self._session_lock:
+            device_hive = self._session_device_hive
+            if not device_hive or not self._session_alive(device_hive):
+                if device_hive:
+                    self._close_session(device_hive)
+                device_hive = self._connect(ApiSessionHandler)
+                self._session_device_hive = device_hive
+            return device_hive.handler.api
+
+    def _call(self, call, *args, **kwargs):
+        if self._session:
+            return getattr(self._session_api(), call)(*args, **kwargs)
+        device_hive = self._connect(ApiCallHandler, call, *args, **kwargs)
         return device_hive.handler.result
 
+    @property
+    def session(self):
+        return self._session
+
     def get_info(self):
         return self._call('get_info')
 
@@ -121,6 +174,11 @@ class DeviceHiveApi(object):
         [self._unset_device_methods(device) for device in devices]
         return devices
 
+    def iter_devices(self, *args, **kwargs):
+        for device in self._call('iter_devices', *args, **kwargs):
+            self._unset_device_methods(device)
+            yield device
+
     def get_device(self, *args, **kwargs):
         device = self._call('get_device', *args, **kwargs)
         self._unset_device_methods(device)
@@ -131,15 +189,33 @@ class DeviceHiveApi(object):
         self._unset_device_methods(device)
         return device
 
+    def put_devices(self, *args, **kwargs):
+        results = self._call('put_devices', *args, **kwargs)
+        [self._unset_device_methods(result['device']) for result in results
+         if result['device']]
+        return results
+
     def list_commands(self, *args, **kwargs):
         return self._call('list_commands', *args, **kwargs)
 
+    def iter_commands(self, *args, **kwargs):
+        return self._call('iter_commands', *args, **kwargs)
+
+    def export_commands(self, *args, **kwargs):
+        return self._call('export_commands', *args, **kwargs)
+
     def send_command(self, *args, **kwargs):
         return self._call('send_command', *args, **kwargs)
 
     def list_notifications(self, *args, **kwargs):
         return self._call('list_notifications', *args, **kwargs)
 
+    def iter_notifications(self, *args, **kwargs):
+        return self._call('iter_notifications', *args, **kwargs)
+
+    def export_notifications(self, *args, **kwargs):
+        return self._call('export_notifications', *args, **kwargs)
+
     def send_notification(self, *args, **kwargs):
         return self._call('send_notification', *args, **kwargs)
 
@@ -148,6 +224,11 @@ class DeviceHiveApi(object):
         [self._unset_network_methods(network) for network in networks]
         return networks
 
+    def iter_networks(self, *args, **kwargs):
+        for network in self._call('iter_networks', *args, **kwargs):
+            self._unset_network_methods(network)
+            yield network
+
     def get_network(self, *args, **kwargs):
         network = self._call('get_network', *args, **kwargs)
         self._unset_network_methods(network)
@@ -164,6 +245,11 @@ class DeviceHiveApi(object):
             self._unset_device_type_methods(device_type)
         return device_types
 
+    def iter_device_types(self, *args, **kwargs):
+        for device_type in self._call('iter_device_types', *args, **kwargs):
+            self._unset_device_type_methods(device_type)
+            yield device_type
+
     def get_device_type(self, *args, **kwargs):
         device_type = self._call('get_device_type', *args, **kwargs)
         self._unset_device_type_methods(device_type)
@@ -177,6 +263,9 @@ class DeviceHiveApi(object):
     def list_users(self, *args, **kwargs):
         return self._call('list_users', *args, **kwargs)
 
+    def iter_users(self, *args, **kwargs):
+        return self._call('iter_users', *args, **kwargs)
+
     def get_current_user(self):
         return self._call('get_current_user')
 
@@ -187,4 +276,13 @@ class DeviceHiveApi(object):
         return self._call('create_user', *args, **kwargs)
 
     def disconnect(self):
-        self._call('disconnect')
+        if not self._session:
+            self._call('disconnect')
+            return
+        with self._session_lock:
+            device_hive = self._session_device_hive
+            self._session_device_hive = None
+        if not device_hive:
+            return
+        self._close_session(device_hive)
+        device_hive.transport.join()
@@ -16,6 +16,7 @@
 
 from devicehive.api_request import AuthApiRequest
 from devicehive.api_request import ApiRequestError
+from devicehive.entity_cache import EntityCache
 
 
 class DeviceType(object):
@@ -43,6 +44,15 @@ class DeviceType(object):
             return
         raise DeviceTypeError('DeviceType does not exist.')
 
+    def _cache(self, device_type):
+        self._api.entity_cache.put(EntityCache.DEVICE_TYPE_ENTITY,
+                                   device_type[self.ID_KEY], device_type)
+
+    def _uncache(self, force=False):
+        self._api.entity_cache.remove(EntityCache.DEVICE_TYPE_ENTITY, self._id)
+        if force:
+            self._api.entity_cache.clear(EntityCache.DEVICE_ENTITY)
+
     @property
     def id(self):
         return self._id
@@ -55,6 +65,7 @@ class DeviceType(object):
         auth_api_request.response_key('deviceType')
         devicetype = auth_api_request.execute('DeviceType get failure.')
         self._init(devicetype)
+        self._cache(devicetype)
 
     def save(self):
         self._ensure_exists()
@@ -67,6 +78,7 @@ class DeviceType(object):
         auth_api_request.action('devicetype/update')
         auth_api_request.set('deviceType', device_type, True)
         auth_api_request.execute('DeviceType save failure.')
+        self._uncache()
 
     def remove(self, force=False):
         self._ensure_exists()
@@ -76,6 +88,7 @@ class DeviceType(object):
         auth_api_request.action('devicetype/delete')
         auth_api_request.param('force', force)
         auth_api_request.execute('DeviceType remove failure.')
+        self._uncache(force)
         self._id = None
         self.name = None
         self.description = None
@@ -86,21 +99,26 @@ class DeviceType(object):
         return self._api.list_devices(name, name_pattern, self._id, self.name,
                                       sort_field, sort_order, take, skip)
 
-    def subscribe_insert_commands(self, names=(), timestamp=None):
+    def subscribe_insert_commands(self, names=(), timestamp=None,
+                                  callback=None):
         self._ensure_exists()
         return self._api.subscribe_insert_commands(
-            device_type_ids=[self.id], names=names, timestamp=timestamp)
+            device_type_ids=[self.id], names=names, timestamp=timestamp,
+            callback=callback)
 
-    def subscribe_update_commands(self, names=(), timestamp=None):
+    def subscribe_update_commands(self, names=(), timestamp=None,
+                                  callback=None):
         self._ensure_exists()
         return self._api.subscribe_update_commands(
-            device_type_ids=[self.id], names=names, timestamp=timestamp)
+            device_type_ids=[self.id], names=names, timestamp=timestamp,
+            callback=callback)
 
-    def subscribe_notifications(self, names=(), timestamp=None):
+    def subscribe_notifications(self, names=(), timestamp=None, callback=None):
         self._ensure_exists()
         return self._api.subscribe_notifications(device_type_ids=[self.id],
                                                  names=names,
-                                                 timestamp=timestamp)
+                                                 timestamp=timestamp,
+                                                 callback=callback)
 
 
 class DeviceTypeError(ApiRequestError):
@@ -0,0 +1,114 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+from collections import OrderedDict
+import threading
+import copy
+import time
+
+
+class EntityCache(object):
+    """Entity cache class."""
+
+    DEVICE_ENTITY = 'device'
+    NETWORK_ENTITY = 'network'
+    DEVICE_TYPE_ENTITY = 'device_type'
+    USER_ENTITY = 'user'
+
+    def __init__(self, max_size=0, ttl=60, ttls=None):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._ttls = ttls or {}
+        self._entities = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _entity_ttl(self, entity_type):
+        return self._ttls.get(entity_type, self._ttl)
+
+    @property
+    def enabled(self):
+        return self._max_size > 0
+
+    @property
+    def size(self):
+        return len(self._entities)
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def evictions(self):
+        return self._evictions
+
+    def get(self, entity_type, entity_id):
+        if not self.enabled:
+            return None
+        key = (entity_type, str(entity_id))
+        with self._lock:
+            cached_entity = self._entities.get(key)
+            if not cached_entity:
+                self._misses += 1
+                return None
+            expire_time, entity = cached_entity
+            if expire_time is not None and expire_time <= time.time():
+                del self._entities[key]
+                self._misses += 1
+                return None
+            del self._entities[key]
+            self._entities[key] = cached_entity
+            self._hits += 1
+        return copy.deepcopy(entity)
+
+    def put(self, entity_type, entity_id, entity):
+        if not self.enabled:
+            return
+        ttl = self._entity_ttl(entity_type)
+        if ttl is not None and ttl <= 0:
+            return
+        expire_time = None
+        if ttl is not None:
+            expire_time = time.time() + ttl
+        key = (entity_type, str(entity_id))
+        cached_entity = (expire_time, copy.deepcopy(entity))
+        with self._lock:
+            self._entities.pop(key, None)
+            self._entities[key] = cached_entity
+            while len(self._entities) > self._max_size:
+                self._entities.popitem(last=False)
+                self._evictions += 1
+
+    def remove(self, entity_type, entity_id):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entities.pop((entity_type, str(entity_id)), None)
+
+    def clear(self, entity_type=None):
+        with self._lock:
+            if entity_type is None:
+                self._entities.clear()
+                return
+            keys = [key for key in self._entities if key[0] == entity_type]
+            for key in keys:
+                del self._entities[key]
@@ -43,6 +43,24 @@ class Handler(object):
         message %= notification.id
         warnings.warn(message, HandlerWarning)
 
+    def handle_commands_insert(self, commands):
+        for command in commands:
+            if not self._api.connected:
+                return
+            self.handle_command_insert(command)
+
+    def handle_commands_update(self, commands):
+        for command in commands:
+            if not self._api.connected:
+                return
+            self.handle_command_update(command)
+
+    def handle_notifications(self, notifications):
+        for notification in notifications:
+            if not self._api.connected:
+                return
+            self.handle_notification(notification)
+
 
 class HandlerWarning(UserWarning):
     """Handler warning."""
@@ -0,0 +1,104 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+from devicehive.transports.transport import EventQueue
+import threading
+import sys
+import six
+
+
+class HandlerDispatcher(object):
+    """Handler dispatcher class."""
+
+    def __init__(self, num_workers, queue_max_size=0, handle_exception=None):
+        assert num_workers > 0, 'Number of workers must be positive'
+        self._handle_exception = handle_exception
+        self._queues = [EventQueue(queue_max_size)
+                        for _ in range(num_workers)]
+        self._num_dispatched = 0
+        self._max_queue_size = 0
+        self._exception_info = None
+        self._threads = []
+        for index, queue in enumerate(self._queues):
+            thread = threading.Thread(target=self._work, args=(queue,))
+            thread.name = 'handler-dispatcher-%s' % index
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self, queue):
+        while True:
+            call = queue.get()
+            if not call:
+                return
+            handle, args = call
+            try:
+                handle(*args)
+            except:
+                if self._exception_info:
+                    continue
+                self._exception_info = sys.exc_info()
+                if self._handle_exception:
+                    self._handle_exception()
+
+    def _queue(self, key):
+        return self._queues[hash(key) % len(self._queues)]
+
+    @property
+    def num_workers(self):
+        return len(self._queues)
+
+    @property
+    def queue_sizes(self):
+        return [queue.size for queue in self._queues]
+
+    @property
+    def queue_size(self):
+        return sum(self.queue_sizes)
+
+    @property
+    def max_queue_size(self):
+        return self._max_queue_size
+
+    @property
+    def num_dispatched(self):
+        return self._num_dispatched
+
+    @property
+    def exception_info(self):
+        return self._exception_info
+
+    def raise_exception(self):
+        exception_info = self._exception_info
+        if not exception_info:
+            return
+        self._exception_info = None
+        six.reraise(*exception_info)
+
+    def dispatch(self, key, handle, *args):
+        queue = self._queue(key)
+        queue.put((handle, args))
+        self._num_dispatched += 1
+        self._max_queue_size = max(self._max_queue_size, queue.size)
+
+    def close(self):
+        for queue in self._queues:
+            queue.close()
+            queue.clear()
+
+    def join(self, timeout=None):
+        for thread in self._threads:
+            thread.join(timeout)
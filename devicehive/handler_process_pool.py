@@ -0,0 +1,326 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+from devicehive.api import Api
+from devicehive.token import Token
+from devicehive.command import Command
+from devicehive.notification import Notification
+from devicehive.transports.transport import Future
+from devicehive.transports.transport import TransportError
+import multiprocessing
+import threading
+import traceback
+import itertools
+import logging
+import pickle
+
+
+logger = logging.getLogger(__name__)
+
+
+REQUEST_MESSAGE = 'request'
+TOKEN_MESSAGE = 'token'
+CANCEL_MESSAGE = 'cancel'
+DISCONNECT_MESSAGE = 'disconnect'
+EXCEPTION_MESSAGE = 'exception'
+COMMAND_ACTIONS = ('command/insert', 'command/update')
+EVENTS_HANDLE_METHODS = {'command/insert': 'handle_commands_insert',
+                         'command/update': 'handle_commands_update',
+                         'notification/insert': 'handle_notifications'}
+
+
+class HandlerProcessTransport(object):
+    """Handler process transport class."""
+
+    def __init__(self, name, index, requests_queue, responses_queue):
+        self._name = name
+        self._index = index
+        self._requests_queue = requests_queue
+        self._responses_queue = responses_queue
+        self._message_ids = itertools.count()
+        self._response_futures = {}
+        self._response_futures_lock = threading.Lock()
+        self._connected = True
+        self._response_thread = threading.Thread(target=self._response)
+        self._response_thread.name = 'handler-process-response'
+        self._response_thread.daemon = True
+        self._response_thread.start()
+
+    def _response(self):
+        while True:
+            response = self._responses_queue.get()
+            if not response:
+                return
+            message_id, result, exception = response
+            with self._response_futures_lock:
+                response_future = self._response_futures.pop(message_id)
+            if exception:
+                response_future.set_exception(exception)
+                continue
+            response_future.set_result(result)
+
+    def call_async(self, message, *args):
+        response_future = Future(HandlerProcessTransportError)
+        with self._response_futures_lock:
+            message_id = next(self._message_ids)
+            self._response_futures[message_id] = response_future
+        self._requests_queue.put((self._index, message_id, message, args))
+        return response_future
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def error(self):
+        return HandlerProcessTransportError
+
+    @property
+    def connected(self):
+        return self._connected
+
+    def disconnect(self):
+        self._connected = False
+        self._requests_queue.put((self._index, None, DISCONNECT_MESSAGE, ()))
+
+    def close(self):
+        self._connected = False
+        self._responses_queue.put(None)
+        self._response_thread.join()
+
+    def send_request(self, request_id, action, request, **params):
+        self.request_async(request_id, action, request, **params)
+
+    def request(self, request_id, action, request, **params):
+        timeout = params.pop('timeout', 30)
+        response_future = self.request_async(request_id, action, request,
+                                             **params)
+        return response_future.result(timeout)
+
+    def request_async(self, request_id, action, request, **params):
+        return self.call_async(REQUEST_MESSAGE, request_id, action, request,
+                               params)
+
+    def cancel_request(self, request_id):
+        self._requests_queue.put((self._index, None, CANCEL_MESSAGE,
+                                  (request_id,)))
+
+
+class HandlerProcessToken(Token):
+    """Handler process token class."""
+
+    @property
+    def expired(self):
+        if not self._access_token:
+            return True
+        return super(HandlerProcessToken, self).expired
+
+    def _authenticate(self):
+        response_future = self._api.transport.call_async(TOKEN_MESSAGE,
+                                                         self._access_token)
+        self._set_access_token_value(response_future.result())
+
+
+class HandlerProcessApi(Api):
+    """Handler process api class."""
+
+    def __init__(self, transport):
+        super(HandlerProcessApi, self).__init__(transport, {})
+        self._token = HandlerProcessToken(self, {})
+
+
+def _handle_process_events(api, handler, device_events):
+    for action, events in device_events:
+        if not api.connected:
+            return
+        if action in COMMAND_ACTIONS:
+            entities = [Command(api, event) for event in events]
+        else:
+            entities = [Notification(event) for event in events]
+        getattr(handler, EVENTS_HANDLE_METHODS[action])(entities)
+
+
+def _run_handler_process(index, transport_name, handler_class, handler_args,
+                         handler_kwargs, events_queue, requests_queue,
+                         responses_queue):
+    transport = HandlerProcessTransport(transport_name, index, requests_queue,
+                                        responses_queue)
+    api = HandlerProcessApi(transport)
+    handler = handler_class(api, *handler_args, **handler_kwargs)
+    while True:
+        device_events = events_queue.get()
+        if device_events is None:
+            break
+        try:
+            _handle_process_events(api, handler, device_events)
+        except:
+            requests_queue.put((index, None, EXCEPTION_MESSAGE,
+                                (traceback.format_exc(),)))
+    transport.close()
+
+
+class HandlerProcessPool(object):
+    """Handler process pool class."""
+
+    def __init__(self, api, num_processes, handler_class, handler_args,
+                 handler_kwargs, start_method=None):
+        assert num_processes > 0, 'Number of processes must be positive'
+        context = multiprocessing
+        if start_method:
+            context = multiprocessing.get_context(start_method)
+        self._api = api
+        self._requests_queue = context.Queue()
+        self._events_queues = []
+        self._responses_queues = []
+        self._processes = []
+        self._num_dispatched = [0] * num_processes
+        self._exception = None
+        for index in range(num_processes):
+            events_queue = context.Queue()
+            responses_queue = context.Queue()
+            process = context.Process(
+                target=_run_handler_process,
+                args=(index, api.transport.name, handler_class, handler_args,
+                      handler_kwargs, events_queue, self._requests_queue,
+                      responses_queue))
+            process.name = 'handler-process-%s' % index
+            process.daemon = True
+            process.start()
+            self._events_queues.append(events_queue)
+            self._responses_queues.append(responses_queue)
+            self._processes.append(process)
+        self._requests_thread = threading.Thread(target=self._requests)
+        self._requests_thread.name = 'handler-process-pool-requests'
+        self._requests_thread.daemon = True
+        self._requests_thread.start()
+
+    @staticmethod
+    def _picklable_exception(exception):
+        try:
+            pickle.loads(pickle.dumps(exception))
+        except Exception:
+            return HandlerProcessTransportError(str(exception))
+        return exception
+
+    def _respond(self, index, message_id, result, exception=None):
+        if exception:
+            exception = self._picklable_exception(exception)
+        self._responses_queues[index].put((message_id, result, exception))
+
+    def _respond_future(self, index, message_id, response_future):
+        exception = response_future.exception(0)
+        if exception:
+            return self._respond(index, message_id, None, exception)
+        self._respond(index, message_id, response_future.result(0))
+
+    def _request(self, index, message_id, request_id, action, request,
+                 params):
+        response_future = self._api.transport.request_async(
+            request_id, action, request, **params)
+        response_future.add_done_callback(
+            lambda future: self._respond_future(index, message_id, future))
+
+    def _token(self, index, message_id, access_token):
+        if access_token:
+            self._api.token.auth(access_token)
+        self._respond(index, message_id, self._api.token.access_token)
+
+    def _exception_message(self, index, exception_traceback):
+        logger.error('Handler process %s failure:\n%s', index,
+                     exception_traceback)
+        if self._exception:
+            return
+        self._exception = HandlerProcessError(exception_traceback)
+        try:
+            self._api.transport.disconnect()
+        except self._api.transport.error:
+            pass
+
+    def _message(self, index, message_id, message, args):
+        if message == REQUEST_MESSAGE:
+            return self._request(index, message_id, *args)
+        if message == TOKEN_MESSAGE:
+            return self._token(index, message_id, *args)
+        if message == CANCEL_MESSAGE:
+            return self._api.transport.cancel_request(*args)
+        if message == DISCONNECT_MESSAGE:
+            return self._api.disconnect()
+        if message == EXCEPTION_MESSAGE:
+            return self._exception_message(index, *args)
+
+    def _requests(self):
+        while True:
+            request = self._requests_queue.get()
+            if not request:
+                return
+            index, message_id, message, args = request
+            try:
+                self._message(index, message_id, message, args)
+            except Exception as error:
+                if message_id is None:
+                    logger.warning('Handler process %s %s message failure.',
+                                   index, message, exc_info=True)
+                    continue
+                self._respond(index, message_id, None, error)
+
+    def _index(self, key):
+        return hash(key) % len(self._processes)
+
+    @property
+    def num_processes(self):
+        return len(self._processes)
+
+    @property
+    def num_dispatched(self):
+        return list(self._num_dispatched)
+
+    @property
+    def exception(self):
+        return self._exception
+
+    def raise_exception(self):
+        exception = self._exception
+        if not exception:
+            return
+        self._exception = None
+        raise exception
+
+    def dispatch(self, key, device_events):
+        index = self._index(key)
+        self._events_queues[index].put(device_events)
+        self._num_dispatched[index] += 1
+
+    def close(self):
+        for events_queue in self._events_queues:
+            events_queue.put(None)
+
+    def join(self, timeout=None):
+        for process in self._processes:
+            process.join(timeout)
+        self._requests_queue.put(None)
+        self._requests_thread.join(timeout)
+        for queue in self._events_queues + self._responses_queues + [
+                self._requests_queue]:
+            queue.close()
+            queue.join_thread()
+
+
+class HandlerProcessTransportError(TransportError):
+    """Handler process transport error."""
+
+
+class HandlerProcessError(Exception):
+    """Handler process error."""
@@ -26,5 +26,9 @@ class Handler(object):
     def handle_event(self, event):
         raise NotImplementedError
 
+    def handle_events(self, events):
+        for event in events:
+            self.handle_event(event)
+
     def handle_disconnect(self):
         raise NotImplementedError
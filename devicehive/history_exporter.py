@@ -0,0 +1,209 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+from devicehive.api_request import ApiRequestError
+from collections import deque
+import datetime
+import json
+import csv
+import os
+import six
+
+
+class HistoryExporter(object):
+    """History exporter class."""
+
+    TIMESTAMP_KEY = 'timestamp'
+    TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+    NDJSON_FORMAT = 'ndjson'
+    CSV_FORMAT = 'csv'
+    NOTIFICATION_COLUMNS = ['id', 'deviceId', 'notification', 'timestamp',
+                            'parameters']
+    COMMAND_COLUMNS = ['id', 'deviceId', 'command', 'timestamp',
+                       'lastUpdated', 'userId', 'status', 'result', 'lifetime',
+                       'parameters']
+
+    def __init__(self, api_request, error_message, columns, start, end,
+                 window=3600, take=1000, max_in_flight=8, args=None):
+        self._api_request = api_request
+        self._args = args or {}
+        self._error_message = error_message
+        self._columns = columns
+        self._start = self._timestamp(start)
+        self._end = self._timestamp(end)
+        if not isinstance(window, datetime.timedelta):
+            window = datetime.timedelta(seconds=window)
+        self._window = window
+        self._take = take
+        self._max_in_flight = max_in_flight
+
+    @classmethod
+    def _timestamp(cls, timestamp):
+        if isinstance(timestamp, datetime.datetime):
+            return timestamp
+        timestamp = timestamp.rstrip('Z')
+        if '.' not in timestamp:
+            timestamp += '.0'
+        return datetime.datetime.strptime(timestamp, cls.TIMESTAMP_FORMAT)
+
+    @classmethod
+    def _format_timestamp(cls, timestamp):
+        return timestamp.strftime(cls.TIMESTAMP_FORMAT)[:-3]
+
+    def _windows(self, start):
+        while start < self._end:
+            end = min(start + self._window, self._end)
+            yield start, end
+            start = end
+
+    def _request(self, window_start, window_end, skip):
+        start = window_start - datetime.timedelta(milliseconds=1)
+        api_request = self._api_request(self._format_timestamp(start),
+                                        self._format_timestamp(window_end),
+                                        self._take, skip)
+        api_request_future = api_request.execute_async(self._error_message)
+        return window_start, window_end, skip, api_request_future
+
+    def _before_end(self, event, window_end):
+        timestamp = self._timestamp(event[self.TIMESTAMP_KEY])
+        if window_end == self._end:
+            return timestamp <= window_end
+        return timestamp < window_end
+
+    def _window_events(self, events, window_start, window_end):
+        first = 0
+        while first < len(events) and self._timestamp(
+                events[first][self.TIMESTAMP_KEY]) < window_start:
+            first += 1
+        last = len(events)
+        while last > first and not self._before_end(events[last - 1],
+                                                    window_end):
+            last -= 1
+        return events[first:last]
+
+    @staticmethod
+    def _ndjson_line(event):
+        line = json.dumps(event, separators=(',', ':')) + '\n'
+        return line.encode('utf-8')
+
+    def _csv_line(self, event):
+        row = []
+        for column in self._columns:
+            value = event.get(column)
+            if value is None:
+                value = ''
+            elif isinstance(value, (dict, list)):
+                value = json.dumps(value, separators=(',', ':'))
+            if six.PY2 and isinstance(value, six.text_type):
+                value = value.encode('utf-8')
+            row.append(value)
+        buffer = six.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerow(row)
+        line = buffer.getvalue()
+        if isinstance(line, six.binary_type):
+            return line
+        return line.encode('utf-8')
+
+    def _checkpoint_args(self, output_format):
+        checkpoint_args = dict(self._args)
+        checkpoint_args['start'] = self._format_timestamp(self._start)
+        checkpoint_args['end'] = self._format_timestamp(self._end)
+        checkpoint_args['window'] = self._window.total_seconds()
+        checkpoint_args['output_format'] = output_format
+        return checkpoint_args
+
+    @staticmethod
+    def _load_checkpoint(checkpoint_path, path, checkpoint_args):
+        if not checkpoint_path or not os.path.exists(checkpoint_path):
+            return None
+        if not os.path.exists(path):
+            return None
+        with open(checkpoint_path) as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+        if checkpoint.get('args') != checkpoint_args:
+            raise HistoryExporterError('Checkpoint "%s" was saved by export '
+                                       'with other args: %s.' %
+                                       (checkpoint_path,
+                                        checkpoint.get('args')))
+        return checkpoint
+
+    @staticmethod
+    def _save_checkpoint(checkpoint_path, checkpoint_args, timestamp, count,
+                         offset):
+        checkpoint = {'args': checkpoint_args, 'timestamp': timestamp,
+                      'count': count, 'offset': offset}
+        checkpoint_tmp_path = checkpoint_path + '.tmp'
+        with open(checkpoint_tmp_path, 'w') as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        os.rename(checkpoint_tmp_path, checkpoint_path)
+
+    def export(self, path, output_format=NDJSON_FORMAT, checkpoint_path=None):
+        assert output_format in (self.NDJSON_FORMAT, self.CSV_FORMAT), \
+            'Unexpected output format'
+        if output_format == self.NDJSON_FORMAT:
+            line = self._ndjson_line
+        else:
+            line = self._csv_line
+        checkpoint_args = self._checkpoint_args(output_format)
+        checkpoint = self._load_checkpoint(checkpoint_path, path,
+                                           checkpoint_args)
+        if checkpoint:
+            start = self._timestamp(checkpoint['timestamp'])
+            count = checkpoint['count']
+            output = open(path, 'r+b')
+            output.seek(checkpoint['offset'])
+            output.truncate()
+        else:
+            start = self._start
+            count = 0
+            output = open(path, 'wb')
+            if output_format == self.CSV_FORMAT:
+                output.write(line(dict(zip(self._columns, self._columns))))
+        with output:
+            windows = self._windows(start)
+            in_flight = deque()
+            while True:
+                for window_start, window_end in windows:
+                    in_flight.append(self._request(window_start, window_end,
+                                                   0))
+                    if len(in_flight) >= self._max_in_flight:
+                        break
+                if not in_flight:
+                    return count
+                window_start, window_end, skip, api_request_future = \
+                    in_flight[0]
+                events = api_request_future.result()
+                window_events = self._window_events(events, window_start,
+                                                    window_end)
+                output.write(b''.join(line(event) for event in window_events))
+                count += len(window_events)
+                if events:
+                    in_flight[0] = self._request(window_start, window_end,
+                                                 skip + len(events))
+                    continue
+                in_flight.popleft()
+                if not checkpoint_path:
+                    continue
+                output.flush()
+                timestamp = window_end.strftime(self.TIMESTAMP_FORMAT)
+                self._save_checkpoint(checkpoint_path, checkpoint_args,
+                                      timestamp, count, output.tell())
+
+
+class HistoryExporterError(ApiRequestError):
+    """History exporter error."""
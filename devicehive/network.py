@@ -16,6 +16,7 @@
 
 from devicehive.api_request import AuthApiRequest
 from devicehive.api_request import ApiRequestError
+from devicehive.entity_cache import EntityCache
 
 
 class Network(object):
@@ -43,6 +44,15 @@ class Network(object):
             return
         raise NetworkError('Network does not exist.')
 
+    def _cache(self, network):
+        self._api.entity_cache.put(EntityCache.NETWORK_ENTITY,
+                                   network[self.ID_KEY], network)
+
+    def _uncache(self, force=False):
+        self._api.entity_cache.remove(EntityCache.NETWORK_ENTITY, self._id)
+        if force:
+            self._api.entity_cache.clear(EntityCache.DEVICE_ENTITY)
+
     @property
     def id(self):
         return self._id
@@ -54,6 +64,7 @@ class Network(object):
         auth_api_request.response_key('network')
         network = auth_api_request.execute('Network get failure.')
         self._init(network)
+        self._cache(network)
 
     def save(self):
         self._ensure_exists()
@@ -66,6 +77,7 @@ class Network(object):
         auth_api_request.action('network/update')
         auth_api_request.set('network', network, True)
         auth_api_request.execute('Network save failure.')
+        self._uncache()
 
     def remove(self, force=False):
         self._ensure_exists()
@@ -75,6 +87,7 @@ class Network(object):
         auth_api_request.action('network/delete')
         auth_api_request.param('force', force)
         auth_api_request.execute('Network remove failure.')
+        self._uncache(force)
         self._id = None
         self.name = None
         self.description = None
@@ -85,23 +98,28 @@ class Network(object):
         return self._api.list_devices(name, name_pattern, self._id, self.name,
                                       sort_field, sort_order, take, skip)
 
-    def subscribe_insert_commands(self, names=(), timestamp=None):
+    def subscribe_insert_commands(self, names=(), timestamp=None,
+                                  callback=None):
         self._ensure_exists()
         return self._api.subscribe_insert_commands(network_ids=[self.id],
                                                    names=names,
-                                                   timestamp=timestamp)
+                                                   timestamp=timestamp,
+                                                   callback=callback)
 
-    def subscribe_update_commands(self, names=(), timestamp=None):
+    def subscribe_update_commands(self, names=(), timestamp=None,
+                                  callback=None):
         self._ensure_exists()
         return self._api.subscribe_update_commands(network_ids=[self.id],
                                                    names=names,
-                                                   timestamp=timestamp)
+                                                   timestamp=timestamp,
+                                                   callback=callback)
 
-    def subscribe_notifications(self, names=(), timestamp=None):
+    def subscribe_notifications(self, names=(), timestamp=None, callback=None):
         self._ensure_exists()
         return self._api.subscribe_notifications(network_ids=[self.id],
                                                  names=names,
-                                                 timestamp=timestamp)
+                                                 timestamp=timestamp,
+                                                 callback=callback)
 
 
 class NetworkError(ApiRequestError):
@@ -16,18 +16,28 @@
 
 from devicehive.api_request import RemoveSubscriptionApiRequest, ApiRequest, \
     ApiRequestError
+from collections import deque
 
 
 class BaseSubscription(object):
     """BaseSubscription class"""
 
     ID_KEY = 'subscriptionId'
+    EVENT_ID_KEY = 'id'
+    EVENT_TIMESTAMP_KEY = 'timestamp'
+    EVENT_LAST_UPDATED_KEY = 'lastUpdated'
+    EVENT_COMMAND_UPDATE_ACTION = 'command/update'
+    EVENT_KEYS_WINDOW = 1000
 
-    def __init__(self, api, call, args):
+    def __init__(self, api, call, args, callback=None):
         self._api = api
         self._call = call
         self._args = self._hashable_args(args)
+        self._callback = callback
         self._id = None
+        self._timestamp = None
+        self._event_keys = set()
+        self._event_keys_queue = deque()
 
     @staticmethod
     def _hashable_args(args):
@@ -46,15 +56,77 @@ class BaseSubscription(object):
     def _get_subscription_type(self):
         raise NotImplementedError
 
-    def subscribe(self):
-        subscription = self._call(*self._args)
+    def _call_args(self):
+        if not self._timestamp:
+            return self._args
+        return self._args[:-1] + (self._timestamp,)
+
+    def _subscribed(self, subscription):
+        if not self._timestamp:
+            self._timestamp = self._args[-1] or self._api.server_timestamp
+        self._api.set_subscription_id(self, subscription[self.ID_KEY])
         self._id = subscription[self.ID_KEY]
+        return subscription
+
+    def _subscribe_response(self, subscription):
+        try:
+            if subscription:
+                self._subscribed(subscription)
+        finally:
+            self._api.remove_pending_subscription()
+
+    def subscribe(self):
+        self._api.add_pending_subscription()
+        try:
+            self._subscribed(self._call(*self._call_args()))
+        finally:
+            self._api.remove_pending_subscription()
+
+    def subscribe_async(self):
+        self._api.add_pending_subscription()
+        try:
+            subscription_future = self._call(*self._call_args(), wait=False)
+        except:
+            self._api.remove_pending_subscription()
+            raise
+        subscription_future.add_result_handler(self._subscribed)
+        subscription_future.add_response_handler(self._subscribe_response)
+        return subscription_future
 
     @property
     def id(self):
         return self._id
 
-    def remove(self):
+    @property
+    def timestamp(self):
+        return self._timestamp
+
+    @property
+    def callback(self):
+        return self._callback
+
+    @callback.setter
+    def callback(self, callback):
+        self._callback = callback
+
+    def handle_event(self, action, event):
+        event = event[self._get_subscription_type()]
+        timestamp_key = self.EVENT_TIMESTAMP_KEY
+        if action == self.EVENT_COMMAND_UPDATE_ACTION:
+            timestamp_key = self.EVENT_LAST_UPDATED_KEY
+        timestamp = event.get(timestamp_key)
+        event_key = (event.get(self.EVENT_ID_KEY), timestamp)
+        if event_key in self._event_keys:
+            return False
+        self._event_keys.add(event_key)
+        self._event_keys_queue.append(event_key)
+        if len(self._event_keys_queue) > self.EVENT_KEYS_WINDOW:
+            self._event_keys.discard(self._event_keys_queue.popleft())
+        if timestamp and (not self._timestamp or timestamp > self._timestamp):
+            self._timestamp = timestamp
+        return True
+
+    def _remove_api_request(self):
         self._ensure_exists()
         remove_subscription_api_request = RemoveSubscriptionApiRequest()
         remove_subscription_api_request.subscription_id(self._id)
@@ -62,6 +134,10 @@ class BaseSubscription(object):
         api_request.action('%s/unsubscribe' % self._get_subscription_type())
         api_request.set('subscriptionId', self._id)
         api_request.remove_subscription_request(remove_subscription_api_request)
+        return api_request
+
+    def remove(self):
+        api_request = self._remove_api_request()
         api_request.execute('Unsubscribe failure.')
         self._api.remove_subscription(self)
         self._id = None
@@ -16,6 +16,15 @@
 
 from devicehive.api_request import ApiRequest
 from devicehive.api_request import ApiRequestError
+from devicehive.api_response import ApiResponseError
+import threading
+import logging
+import base64
+import json
+import time
+
+
+logger = logging.getLogger(__name__)
 
 
 class Token(object):
@@ -23,6 +32,9 @@ class Token(object):
 
     AUTH_HEADER_NAME = 'Authorization'
     AUTH_HEADER_VALUE_PREFIX = 'Bearer '
+    REFRESH_MARGIN = 60
+    REFRESH_MIN_DELAY = 1
+    REFRESH_MAX_BACKOFF = 300
 
     def __init__(self, api, auth):
         self._api = api
@@ -30,50 +42,187 @@ class Token(object):
         self._password = auth.get('password')
         self._refresh_token = auth.get('refresh_token')
         self._access_token = auth.get('access_token')
+        self._expiration = self._decode_expiration(self._access_token)
+        self._refresh_timer = None
+        self._num_refresh_retries = 0
+        self._auth_lock = threading.Lock()
+        self._token_store = auth.get('token_store')
+        self._token_store_key = None
+        self._token_store_loaded = False
+        if self._token_store:
+            self._token_store_key = self._token_store.key(
+                auth.get('transport_url'), self._login, self._password,
+                self._refresh_token)
 
-    def _auth(self):
-        api_request = ApiRequest(self._api)
-        if not api_request.websocket_transport:
+    @staticmethod
+    def _decode_expiration(access_token):
+        try:
+            payload = access_token.split('.')[1]
+            payload += '=' * (-len(payload) % 4)
+            payload = base64.urlsafe_b64decode(payload.encode('utf-8'))
+            payload = json.loads(payload.decode('utf-8'))
+        except (AttributeError, IndexError, TypeError, ValueError):
+            return None
+        if 'exp' in payload:
+            return float(payload['exp'])
+        payload = payload.get('payload', {})
+        expiration = payload.get('expiration', payload.get('e'))
+        if expiration:
+            return expiration / 1000.0
+
+    def _refresh_delay(self):
+        if not self._expiration:
+            return None
+        if not self._refresh_token and not (self._login and self._password):
+            return None
+        expires_in = self._expiration - time.time()
+        refresh_delay = expires_in - min(self.REFRESH_MARGIN, expires_in / 2)
+        refresh_backoff = min(
+            self.REFRESH_MIN_DELAY * 2 ** self._num_refresh_retries,
+            self.REFRESH_MAX_BACKOFF)
+        if refresh_delay > refresh_backoff:
+            self._num_refresh_retries = 0
+            return refresh_delay
+        return refresh_backoff
+
+    def _schedule_refresh(self):
+        self.cancel_refresh()
+        refresh_delay = self._refresh_delay()
+        if refresh_delay is None:
             return
+        self._refresh_timer = threading.Timer(refresh_delay,
+                                              self._background_refresh)
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def _background_refresh(self):
+        if not self._api.connected:
+            return
+        self._num_refresh_retries += 1
+        try:
+            self.auth()
+        except Exception:
+            logger.warning('Background token refresh failure.', exc_info=True)
+            self._schedule_refresh()
+
+    def _load_tokens(self):
+        if not self._token_store or self._token_store_loaded:
+            return False
+        self._token_store_loaded = True
+        if not self._refresh_token and not (self._login and self._password):
+            return False
+        tokens = self._token_store.load(self._token_store_key)
+        if not tokens:
+            return False
+        access_token = tokens.get('access_token')
+        expiration = self._decode_expiration(access_token)
+        if not expiration or expiration <= time.time():
+            return False
+        self._refresh_token = tokens.get('refresh_token') or \
+            self._refresh_token
+        self._access_token = access_token
+        self._expiration = expiration
+        self._schedule_refresh()
+        return True
+
+    def _save_tokens(self):
+        if not self._token_store:
+            return
+        tokens = {'access_token': self._access_token,
+                  'refresh_token': self._refresh_token}
+        try:
+            self._token_store.save(self._token_store_key, tokens)
+        except (IOError, OSError):
+            logger.warning('Token store save failure.', exc_info=True)
+
+    def _set_access_token_value(self, access_token):
+        self._access_token = access_token
+        self._expiration = self._decode_expiration(access_token)
+        self._schedule_refresh()
+        self._save_tokens()
+
+    def _auth_api_request(self):
+        api_request = ApiRequest(self._api)
         api_request.action('authenticate')
         api_request.set('token', self._access_token)
+        return api_request
+
+    def _auth(self):
+        api_request = self._auth_api_request()
+        if not api_request.websocket_transport:
+            return
         api_request.execute('Authentication failure.')
 
-    def _tokens(self):
+    def _tokens_api_request(self):
         api_request = ApiRequest(self._api)
         api_request.method('POST')
         api_request.url('token')
         api_request.action('token')
         api_request.set('login', self._login)
         api_request.set('password', self._password)
-        tokens = api_request.execute('Login failure.')
+        return api_request
+
+    def _set_tokens(self, tokens):
         self._refresh_token = tokens['refreshToken']
-        self._access_token = tokens['accessToken']
+        self._set_access_token_value(tokens['accessToken'])
+
+    def _tokens(self):
+        api_request = self._tokens_api_request()
+        tokens = api_request.execute('Login failure.')
+        self._set_tokens(tokens)
+
+    def _refresh_api_request(self):
+        if not self._refresh_token:
+            raise TokenError('Can\'t refresh token without "refresh_token"')
+        api_request = ApiRequest(self._api)
+        api_request.method('POST')
+        api_request.url('token/refresh')
+        api_request.action('token/refresh')
+        api_request.set('refreshToken', self._refresh_token)
+        return api_request
+
+    def _set_access_token(self, tokens):
+        self._set_access_token_value(tokens['accessToken'])
 
     @property
     def access_token(self):
         return self._access_token
 
+    @property
+    def expiration(self):
+        return self._expiration
+
+    @property
+    def expired(self):
+        return bool(self._expiration) and self._expiration <= time.time()
+
     @property
     def auth_header(self):
         auth_header_name = self.AUTH_HEADER_NAME
         auth_header_value = self.AUTH_HEADER_VALUE_PREFIX + self._access_token
         return auth_header_name, auth_header_value
 
-    def refresh(self):
-        if not self._refresh_token:
-            raise TokenError('Can\'t refresh token without "refresh_token"')
-        api_request = ApiRequest(self._api)
-        api_request.method('POST')
-        api_request.url('token/refresh')
-        api_request.action('token/refresh')
-        api_request.set('refreshToken', self._refresh_token)
+    def cancel_refresh(self):
+        if not self._refresh_timer:
+            return
+        self._refresh_timer.cancel()
+        self._refresh_timer = None
+
+    def _refresh(self):
+        api_request = self._refresh_api_request()
         tokens = api_request.execute('Token refresh failure.')
-        self._access_token = tokens['accessToken']
+        self._set_access_token(tokens)
 
-    def auth(self):
+    def _authenticate(self):
+        if self._load_tokens():
+            try:
+                self._auth()
+                return
+            except ApiResponseError as api_response_error:
+                if api_response_error.code != 401:
+                    raise
         if self._refresh_token:
-            self.refresh()
+            self._refresh()
             self._auth()
             return
         if self._access_token:
@@ -88,6 +237,22 @@ class Token(object):
         if self._password:
             raise TokenError('Login required.')
 
+    def auth(self, access_token=None):
+        if access_token is None:
+            access_token = self._access_token
+        with self._auth_lock:
+            if self._access_token != access_token:
+                return
+            self._authenticate()
+
+    def refresh(self, access_token=None):
+        if access_token is None:
+            access_token = self._access_token
+        with self._auth_lock:
+            if self._access_token != access_token:
+                return
+            self._refresh()
+
 
 class TokenError(ApiRequestError):
     """Token error."""
@@ -0,0 +1,142 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+import threading
+import binascii
+import hashlib
+import json
+import os
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class FileTokenStore(object):
+    """File token store class."""
+
+    FILE_MODE = 0o600
+    DIRECTORY_MODE = 0o700
+    KEY_ITERATIONS = 100000
+    SALT_SIZE = 16
+
+    def __init__(self, path):
+        self._path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        return self._path
+
+    def key(self, transport_url, login=None, password=None,
+            refresh_token=None):
+        credentials = json.dumps([transport_url, login, password,
+                                  refresh_token])
+        key = hashlib.pbkdf2_hmac('sha256', credentials.encode('utf-8'),
+                                  self._salt(), self.KEY_ITERATIONS)
+        return binascii.hexlify(key).decode('ascii')
+
+    def _salt(self):
+        salt = self._read().get('salt')
+        if salt:
+            return binascii.unhexlify(salt)
+        lock_file = self._acquire()
+        try:
+            store = self._read()
+            if not store.get('salt'):
+                salt = os.urandom(self.SALT_SIZE)
+                store = {'salt': binascii.hexlify(salt).decode('ascii'),
+                         'tokens': {}}
+                self._write(store)
+            return binascii.unhexlify(store['salt'])
+        finally:
+            self._release(lock_file)
+
+    def _read(self):
+        try:
+            with open(self._path) as store_file:
+                store = json.load(store_file)
+        except (IOError, OSError, ValueError):
+            store = None
+        if not isinstance(store, dict):
+            store = {}
+        if not isinstance(store.get('tokens'), dict):
+            store['tokens'] = {}
+        return store
+
+    def _make_directory(self):
+        directory = os.path.dirname(self._path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory, self.DIRECTORY_MODE)
+
+    def _acquire(self):
+        self._lock.acquire()
+        if not fcntl:
+            return None
+        try:
+            self._make_directory()
+            lock_file = os.open(self._path + '.lock', os.O_RDWR | os.O_CREAT,
+                                self.FILE_MODE)
+        except:
+            self._lock.release()
+            raise
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        except:
+            os.close(lock_file)
+            self._lock.release()
+            raise
+        return lock_file
+
+    def _release(self, lock_file):
+        if lock_file is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            os.close(lock_file)
+        self._lock.release()
+
+    def _write(self, store):
+        self._make_directory()
+        tmp_path = '%s.%s.%s.tmp' % (self._path, os.getpid(),
+                                     threading.current_thread().ident)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+        with os.fdopen(os.open(tmp_path, flags, self.FILE_MODE),
+                       'w') as store_file:
+            json.dump(store, store_file)
+        if os.name == 'nt' and os.path.exists(self._path):
+            os.remove(self._path)
+        os.rename(tmp_path, self._path)
+
+    def load(self, key):
+        return self._read()['tokens'].get(key)
+
+    def save(self, key, tokens):
+        lock_file = self._acquire()
+        try:
+            store = self._read()
+            store['tokens'][key] = tokens
+            self._write(store)
+        finally:
+            self._release(lock_file)
+
+    def remove(self, key):
+        lock_file = self._acquire()
+        try:
+            store = self._read()
+            if store['tokens'].pop(key, None) is None:
+                return
+            self._write(store)
+        finally:
+            self._release(lock_file)
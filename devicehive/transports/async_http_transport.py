@@ -0,0 +1,351 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+from devicehive.transports.async_transport import AsyncTransport
+from devicehive.transports.transport import TransportError
+from urllib.parse import urlsplit, urlencode
+import asyncio
+import ssl
+import sys
+
+
+class AsyncHttpTransport(AsyncTransport):
+    """Async http transport class."""
+
+    def __init__(self, data_format_class, data_format_options, handler_class,
+                 handler_options):
+        super(AsyncHttpTransport, self).__init__('http',
+                                                 AsyncHttpTransportError,
+                                                 data_format_class,
+                                                 data_format_options,
+                                                 handler_class,
+                                                 handler_options)
+        self._url = None
+        self._timeout = None
+        self._headers = None
+        self._ssl_context = None
+        self._connection_pool_size = None
+        self._connections = []
+        self._events_queue = None
+        self._subscription_tasks = {}
+        self._success_codes = [200, 201, 204]
+
+    async def _connect(self, url, **options):
+        self._url = url
+        self._timeout = options.pop('timeout', None)
+        self._headers = options.pop('headers', {})
+        self._ssl_context = options.pop('ssl_context', None)
+        self._connection_pool_size = options.pop('connection_pool_size', 10)
+        self._events_queue = asyncio.Queue()
+        if not self._url.endswith('/'):
+            self._url += '/'
+        self._connected = True
+        await self._handle_connect()
+
+    async def _receive(self):
+        while self._connected and not self._exception_info:
+            events = await self._events_queue.get()
+            if events is None:
+                return
+            await self._handle_events(events)
+
+    async def _disconnect(self):
+        self._cancel_subscription_tasks()
+        self._close_connections()
+        await self._handle_disconnect()
+
+    def _cancel_subscription_tasks(self):
+        subscription_tasks = self._subscription_tasks
+        self._subscription_tasks = {}
+        for subscription_task in subscription_tasks.values():
+            subscription_task.cancel()
+
+    async def _open_connection(self, url):
+        secure = url.scheme == 'https'
+        port = url.port or (443 if secure else 80)
+        ssl_context = None
+        if secure:
+            ssl_context = self._ssl_context or ssl.create_default_context()
+        return await asyncio.open_connection(url.hostname, port,
+                                             ssl=ssl_context)
+
+    async def _acquire_connection(self, url):
+        key = (url.scheme, url.hostname, url.port)
+        for connection in self._connections:
+            if connection[0] != key:
+                continue
+            self._connections.remove(connection)
+            if not connection[1].at_eof():
+                return connection, True
+            connection[2].close()
+        reader, writer = await self._open_connection(url)
+        return (key, reader, writer), False
+
+    def _release_connection(self, connection):
+        if len(self._connections) < self._connection_pool_size:
+            self._connections.append(connection)
+            return
+        connection[2].close()
+
+    def _close_connections(self):
+        connections = self._connections
+        self._connections = []
+        for connection in connections:
+            connection[2].close()
+
+    @staticmethod
+    async def _read_body(reader, method, code, headers):
+        if method == 'HEAD' or code in (204, 304) or 100 <= code < 200:
+            return b'', True
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            chunks = []
+            while True:
+                size_line = await reader.readuntil(b'\r\n')
+                size = int(size_line.split(b';', 1)[0].strip(), 16)
+                if not size:
+                    await reader.readuntil(b'\r\n')
+                    return b''.join(chunks), True
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+        if 'content-length' in headers:
+            length = int(headers['content-length'])
+            return await reader.readexactly(length), True
+        return await reader.read(), False
+
+    async def _http_request(self, method, url, data, headers):
+        connection, reused = await self._acquire_connection(url)
+        _, reader, writer = connection
+        path = url.path or '/'
+        if url.query:
+            path += '?' + url.query
+        host = url.hostname
+        if url.port:
+            host += ':%s' % url.port
+        lines = ['%s %s HTTP/1.1' % (method, path),
+                 'Host: %s' % host,
+                 'Connection: keep-alive',
+                 'Content-Length: %s' % len(data)]
+        lines.extend('%s: %s' % header for header in headers.items())
+        message = ('\r\n'.join(lines) + '\r\n\r\n').encode('utf-8') + data
+        try:
+            try:
+                writer.write(message)
+                await writer.drain()
+                response = await reader.readuntil(b'\r\n\r\n')
+            except (asyncio.IncompleteReadError, ConnectionError):
+                if not reused:
+                    raise
+                writer.close()
+                return await self._http_request(method, url, data, headers)
+            lines = response.decode('latin-1').split('\r\n')
+            status = lines[0].split(' ', 2)
+            code = int(status[1])
+            response_headers = {}
+            for line in lines[1:]:
+                if ':' not in line:
+                    continue
+                name, value = line.split(':', 1)
+                response_headers[name.strip().lower()] = value.strip()
+            body, keep_alive = await self._read_body(reader, method, code,
+                                                     response_headers)
+        except BaseException:
+            writer.close()
+            raise
+        connection_header = response_headers.get('connection', '').lower()
+        if connection_header == 'close' or status[0] == 'HTTP/1.0':
+            keep_alive = False
+        if keep_alive:
+            self._release_connection(connection)
+        else:
+            writer.close()
+        return code, body
+
+    async def _request_call(self, method, url, **params):
+        query = params.get('params')
+        if query:
+            url += '?' + urlencode(query)
+        headers = self._headers.copy()
+        headers.update(params.get('headers', {}))
+        data = params.get('data', '')
+        if not isinstance(data, bytes):
+            data = data.encode('utf-8')
+        request = self._http_request(method, urlsplit(url), data, headers)
+        try:
+            code, body = await asyncio.wait_for(request, self._timeout)
+        except asyncio.TimeoutError:
+            raise self._error('Request timeout.')
+        except (asyncio.IncompleteReadError, ConnectionError, OSError,
+                ValueError) as http_error:
+            raise self._error(http_error)
+        if self._text_data_type:
+            return code, body.decode('utf-8')
+        return code, body
+
+    async def _request(self, request_id, action, request, **params):
+        method = params.pop('method', 'GET')
+        url = self._url + params.pop('url')
+        request_delete_keys = params.pop('request_delete_keys', [])
+        request_key = params.pop('request_key', None)
+        response_key = params.pop('response_key', None)
+        for request_delete_key in request_delete_keys:
+            del request[request_delete_key]
+        if request:
+            if request_key:
+                request = request[request_key]
+            params['data'] = self._encode(request)
+        code, data = await self._request_call(method, url, **params)
+        response = {self.REQUEST_ID_KEY: request_id,
+                    self.REQUEST_ACTION_KEY: action}
+        if code in self._success_codes:
+            response[self.RESPONSE_STATUS_KEY] = self.RESPONSE_SUCCESS_STATUS
+            if not data:
+                return response
+            if response_key:
+                response[response_key] = self._decode(data)
+                return response
+            response.update(self._decode(data))
+            return response
+        response[self.RESPONSE_STATUS_KEY] = self.RESPONSE_ERROR_STATUS
+        response[self.RESPONSE_CODE_KEY] = code
+        if not data:
+            return response
+        try:
+            response_error = self._decode(data)['message']
+        except Exception:
+            response_error = data
+        response[self.RESPONSE_ERROR_KEY] = response_error
+        return response
+
+    async def _subscription_request(self, request_id, action,
+                                    subscription_request,
+                                    response_subscription_id_key):
+        response = await self._subscription_probe(**subscription_request)
+        if response[self.RESPONSE_STATUS_KEY] != self.RESPONSE_SUCCESS_STATUS:
+            return response
+        subscription_id = subscription_request['subscription_id']
+        subscription_task = asyncio.ensure_future(
+            self._subscription(**subscription_request))
+        self._subscription_tasks[subscription_id] = subscription_task
+        return {self.REQUEST_ID_KEY: request_id,
+                self.REQUEST_ACTION_KEY: action,
+                self.RESPONSE_STATUS_KEY: self.RESPONSE_SUCCESS_STATUS,
+                response_subscription_id_key: subscription_id}
+
+    async def _subscription_probe(self, subscription_id, request_id, action,
+                                  request, params):
+        params = params.copy()
+        params.pop('response_error_handler', None)
+        params.pop('response_error_handler_args', None)
+        params.pop('params_timestamp_key', None)
+        params.pop('response_timestamp_key', None)
+        params.pop('response_subscription_id_key', None)
+        params['params'] = dict(params.get('params', {}), waitTimeout=0,
+                                limit=0)
+        return await self._request(request_id, action, request.copy(),
+                                   **params)
+
+    async def _subscription(self, subscription_id, request_id, action, request,
+                            params):
+        params = params.copy()
+        params['params'] = params.get('params', {}).copy()
+        params['headers'] = params.get('headers', {}).copy()
+        response_error_handler = params.pop('response_error_handler', None)
+        response_error_handler_args = params.pop('response_error_handler_args',
+                                                 None)
+        response_key = params['response_key']
+        params_timestamp_key = params.pop('params_timestamp_key', 'timestamp')
+        response_timestamp_key = params.pop('response_timestamp_key',
+                                            'timestamp')
+        response_subscription_id_key = params.pop(
+            'response_subscription_id_key', 'subscriptionId')
+        try:
+            while subscription_id in self._subscription_tasks:
+                response = await self._request(request_id, action,
+                                               request.copy(), **params)
+                response_status = response[self.RESPONSE_STATUS_KEY]
+                if response_status != self.RESPONSE_SUCCESS_STATUS:
+                    response_code = response[self.RESPONSE_CODE_KEY]
+                    error = 'Subscription request error. Action: %s. Code: %s.'
+                    error %= (action, response_code)
+                    if not response_error_handler:
+                        raise self._error(error)
+                    if not await response_error_handler(
+                            params, response_code,
+                            *response_error_handler_args):
+                        raise self._error(error)
+                    response = await self._request(request_id, action,
+                                                   request.copy(), **params)
+                    response_status = response[self.RESPONSE_STATUS_KEY]
+                    if response_status != self.RESPONSE_SUCCESS_STATUS:
+                        raise self._error(error)
+                events = response[response_key]
+                if not len(events):
+                    continue
+                timestamp = events[-1][response_timestamp_key]
+                params['params'][params_timestamp_key] = timestamp
+                events = [{self.REQUEST_ACTION_KEY: action,
+                           response_key: event,
+                           response_subscription_id_key: subscription_id}
+                          for event in events]
+                self._events_queue.put_nowait(events)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._exception_info = sys.exc_info()
+            self._events_queue.put_nowait(None)
+
+    def _remove_subscription_request(self, request_id, action, subscription_id,
+                                     response_code, response_error):
+        subscription_task = self._subscription_tasks.pop(subscription_id, None)
+        if not subscription_task:
+            return {self.REQUEST_ID_KEY: request_id,
+                    self.REQUEST_ACTION_KEY: action,
+                    self.RESPONSE_STATUS_KEY: self.RESPONSE_ERROR_STATUS,
+                    self.RESPONSE_CODE_KEY: response_code,
+                    self.RESPONSE_ERROR_KEY: response_error}
+        subscription_task.cancel()
+        return {self.REQUEST_ID_KEY: request_id,
+                self.REQUEST_ACTION_KEY: action,
+                self.RESPONSE_STATUS_KEY: self.RESPONSE_SUCCESS_STATUS}
+
+    def disconnect(self):
+        super(AsyncHttpTransport, self).disconnect()
+        if self._events_queue:
+            self._events_queue.put_nowait(None)
+
+    async def send_request(self, request_id, action, request, **params):
+        response = await self.request(request_id, action, request, **params)
+        self._events_queue.put_nowait([response])
+
+    async def request(self, request_id, action, request, **params):
+        self._ensure_connected()
+        subscription_request = params.pop('subscription_request', {})
+        response_subscription_id_key = params.pop(
+            'response_subscription_id_key', 'subscriptionId')
+        remove_subscription_request = params.pop('remove_subscription_request',
+                                                 {})
+        if subscription_request:
+            return await self._subscription_request(
+                request_id, action, subscription_request,
+                response_subscription_id_key)
+        if remove_subscription_request:
+            return self._remove_subscription_request(
+                request_id, action, **remove_subscription_request)
+        return await self._request(request_id, action, request, **params)
+
+
+class AsyncHttpTransportError(TransportError):
+    """Async http transport error."""
@@ -0,0 +1,77 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+from devicehive.transports.transport import Transport
+import asyncio
+import sys
+
+
+class AsyncTransport(Transport):
+    """Async transport class."""
+
+    def __init__(self, name, error, data_format_class, data_format_options,
+                 handler_class, handler_options):
+        super(AsyncTransport, self).__init__(name, error, data_format_class,
+                                             data_format_options,
+                                             handler_class, handler_options)
+        self._connection_task = None
+
+    async def _handle_connect(self):
+        await self._handler.handle_connect()
+
+    async def _handle_event(self, event):
+        await self._handler.handle_event(event)
+
+    async def _handle_events(self, events):
+        await self._handler.handle_events(events)
+
+    async def _handle_disconnect(self):
+        await self._handler.handle_disconnect()
+
+    async def _connection(self, url, options):
+        try:
+            await self._connect(url, **options)
+            await self._receive()
+            await self._disconnect()
+        except Exception:
+            self._exception_info = sys.exc_info()
+
+    async def _connect(self, url, **options):
+        raise NotImplementedError
+
+    async def _receive(self):
+        raise NotImplementedError
+
+    async def _disconnect(self):
+        raise NotImplementedError
+
+    def connect(self, url, **options):
+        self._ensure_not_connected()
+        self._exception_info = None
+        self._connection_task = asyncio.ensure_future(
+            self._connection(url, options))
+
+    async def join(self, timeout=None):
+        await asyncio.wait([self._connection_task], timeout=timeout)
+
+    def is_alive(self):
+        return not self._connection_task.done()
+
+    async def send_request(self, request_id, action, request, **params):
+        raise NotImplementedError
+
+    async def request(self, request_id, action, request, **params):
+        raise NotImplementedError
@@ -0,0 +1,292 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+from devicehive.transports.async_transport import AsyncTransport
+from devicehive.transports.transport import TransportError
+from urllib.parse import urlsplit
+import websocket
+import asyncio
+import base64
+import hashlib
+import struct
+import ssl
+import sys
+import os
+
+
+class AsyncWebsocketTransport(AsyncTransport):
+    """Async websocket transport class."""
+
+    WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+    def __init__(self, data_format_class, data_format_options, handler_class,
+                 handler_options):
+        super(AsyncWebsocketTransport, self).__init__(
+            'websocket', AsyncWebsocketTransportError, data_format_class,
+            data_format_options, handler_class, handler_options)
+        self._reader = None
+        self._writer = None
+        self._write_lock = None
+        self._event_task = None
+        self._ping_task = None
+        self._pong_received = False
+        self._event_queue = None
+        self._response_futures = {}
+        if self._text_data_type:
+            self._data_opcode = websocket.ABNF.OPCODE_TEXT
+        else:
+            self._data_opcode = websocket.ABNF.OPCODE_BINARY
+
+    async def _websocket_call(self, websocket_coroutine):
+        try:
+            return await websocket_coroutine
+        except (asyncio.IncompleteReadError, ConnectionError,
+                OSError) as websocket_error:
+            error = websocket_error
+        raise self._error(error)
+
+    async def _open_connection(self, url, timeout, headers, ssl_context):
+        url = urlsplit(url)
+        secure = url.scheme == 'wss'
+        port = url.port or (443 if secure else 80)
+        if secure and not ssl_context:
+            ssl_context = ssl.create_default_context()
+        if not secure:
+            ssl_context = None
+        connection = asyncio.open_connection(url.hostname, port,
+                                             ssl=ssl_context)
+        self._reader, self._writer = await asyncio.wait_for(connection,
+                                                            timeout)
+        path = url.path or '/'
+        if url.query:
+            path += '?' + url.query
+        host = url.hostname
+        if url.port:
+            host += ':%s' % url.port
+        key = base64.b64encode(os.urandom(16)).decode('utf-8')
+        handshake = ['GET %s HTTP/1.1' % path,
+                     'Host: %s' % host,
+                     'Upgrade: websocket',
+                     'Connection: Upgrade',
+                     'Sec-WebSocket-Key: %s' % key,
+                     'Sec-WebSocket-Version: 13']
+        handshake.extend('%s: %s' % header for header in headers.items())
+        handshake = '\r\n'.join(handshake) + '\r\n\r\n'
+        self._writer.write(handshake.encode('utf-8'))
+        await self._writer.drain()
+        response = await asyncio.wait_for(
+            self._reader.readuntil(b'\r\n\r\n'), timeout)
+        lines = response.decode('utf-8').split('\r\n')
+        status = lines[0].split(' ', 2)
+        if len(status) < 2 or status[1] != '101':
+            raise self._error('Handshake status: %s.' % lines[0])
+        response_headers = {}
+        for line in lines[1:]:
+            if ':' not in line:
+                continue
+            name, value = line.split(':', 1)
+            response_headers[name.strip().lower()] = value.strip()
+        accept = hashlib.sha1((key + self.WEBSOCKET_GUID).encode('utf-8'))
+        accept = base64.b64encode(accept.digest()).decode('utf-8')
+        if response_headers.get('sec-websocket-accept') != accept:
+            raise self._error('Invalid handshake accept key.')
+
+    async def _connect(self, url, **options):
+        timeout = options.pop('timeout', None)
+        headers = options.pop('headers', {})
+        ssl_context = options.pop('ssl_context', None)
+        pong_timeout = options.pop('pong_timeout', None)
+        self._write_lock = asyncio.Lock()
+        self._event_queue = asyncio.Queue()
+        self._response_futures = {}
+        try:
+            await self._websocket_call(self._open_connection(
+                url, timeout, headers, ssl_context))
+        except BaseException:
+            if self._writer:
+                self._writer.close()
+            raise
+        self._connected = True
+        self._event_task = asyncio.ensure_future(self._event())
+        if pong_timeout:
+            self._ping_task = asyncio.ensure_future(self._ping(pong_timeout))
+        await self._handle_connect()
+
+    async def _read_frame(self):
+        header = await self._reader.readexactly(2)
+        fin = header[0] & 0x80
+        opcode = header[0] & 0x0f
+        masked = header[1] & 0x80
+        length = header[1] & 0x7f
+        if length == 126:
+            length = struct.unpack('!H', await self._reader.readexactly(2))[0]
+        elif length == 127:
+            length = struct.unpack('!Q', await self._reader.readexactly(8))[0]
+        mask = None
+        if masked:
+            mask = await self._reader.readexactly(4)
+        data = await self._reader.readexactly(length)
+        if mask:
+            data = websocket.ABNF.mask(mask, data)
+        return fin, opcode, data
+
+    async def _recv_data(self):
+        frames = []
+        frames_opcode = None
+        while True:
+            fin, opcode, data = await self._read_frame()
+            if opcode == websocket.ABNF.OPCODE_PING:
+                await self._write_frame(data, websocket.ABNF.OPCODE_PONG)
+                continue
+            if opcode in (websocket.ABNF.OPCODE_PONG,
+                          websocket.ABNF.OPCODE_CLOSE):
+                return opcode, data
+            if opcode != websocket.ABNF.OPCODE_CONT:
+                frames_opcode = opcode
+                frames = []
+            frames.append(data)
+            if fin:
+                return frames_opcode, b''.join(frames)
+
+    async def _write_frame(self, data, opcode):
+        frame = websocket.ABNF.create_frame(data, opcode).format()
+        async with self._write_lock:
+            self._writer.write(frame)
+            await self._writer.drain()
+
+    async def _event(self):
+        while self._connected:
+            try:
+                opcode, data = await self._websocket_call(self._recv_data())
+                if opcode in (websocket.ABNF.OPCODE_TEXT,
+                              websocket.ABNF.OPCODE_BINARY):
+                    if opcode == websocket.ABNF.OPCODE_TEXT and \
+                            not self._bytes_decoding:
+                        data = data.decode('utf-8')
+                    if not self._response_data(data):
+                        self._event_queue.put_nowait(data)
+                        continue
+                    event = self._decode(data)
+                    request_id = event.get(self.REQUEST_ID_KEY)
+                    if not request_id:
+                        self._event_queue.put_nowait(event)
+                        continue
+                    response_future = self._response_futures.pop(request_id,
+                                                                  None)
+                    if response_future and not response_future.done():
+                        response_future.set_result(event)
+                    continue
+                if opcode == websocket.ABNF.OPCODE_PONG:
+                    self._pong_received = True
+                    continue
+                if opcode == websocket.ABNF.OPCODE_CLOSE:
+                    self._cancel_response_futures()
+                    self._event_queue.put_nowait(None)
+                    return
+            except Exception:
+                self._exception_info = sys.exc_info()
+                self._cancel_response_futures()
+                self._event_queue.put_nowait(None)
+                return
+
+    async def _ping(self, pong_timeout):
+        while self._connected:
+            try:
+                await self._websocket_call(
+                    self._write_frame(b'', websocket.ABNF.OPCODE_PING))
+            except self._error:
+                self._connected = False
+                self._event_queue.put_nowait(None)
+                return
+            self._pong_received = False
+            await asyncio.sleep(pong_timeout)
+            if not self._pong_received:
+                self._connected = False
+                self._event_queue.put_nowait(None)
+                return
+
+    async def _receive(self):
+        while self._connected and not self._exception_info:
+            events = [await self._event_queue.get()]
+            while events[-1] is not None and not self._event_queue.empty():
+                events.append(self._event_queue.get_nowait())
+            closed = events[-1] is None
+            if closed:
+                events.pop()
+            if events:
+                await self._handle_events([self._decode_event(event)
+                                           for event in events])
+            if closed:
+                return
+
+    def _cancel_tasks(self):
+        for task in (self._event_task, self._ping_task):
+            if task:
+                task.cancel()
+        self._event_task = None
+        self._ping_task = None
+
+    def _cancel_response_futures(self):
+        response_futures = self._response_futures
+        self._response_futures = {}
+        for response_future in response_futures.values():
+            if response_future.done():
+                continue
+            response_future.set_exception(
+                self._error('Connection has closed.'))
+
+    async def _disconnect(self):
+        self._cancel_tasks()
+        try:
+            await self._websocket_call(
+                self._write_frame(b'', websocket.ABNF.OPCODE_CLOSE))
+        finally:
+            self._writer.close()
+            self._pong_received = False
+            self._cancel_response_futures()
+        await self._handle_disconnect()
+
+    async def _send_request(self, request_id, action, request):
+        request[self.REQUEST_ID_KEY] = request_id
+        request[self.REQUEST_ACTION_KEY] = action
+        await self._websocket_call(self._write_frame(self._encode(request),
+                                                     self._data_opcode))
+
+    def disconnect(self):
+        super(AsyncWebsocketTransport, self).disconnect()
+        if self._event_queue:
+            self._event_queue.put_nowait(None)
+
+    async def send_request(self, request_id, action, request, **params):
+        self._ensure_connected()
+        await self._send_request(request_id, action, request)
+
+    async def request(self, request_id, action, request, **params):
+        self._ensure_connected()
+        timeout = params.pop('timeout', 30)
+        response_future = asyncio.get_event_loop().create_future()
+        self._response_futures[request_id] = response_future
+        try:
+            await self._send_request(request_id, action, request)
+            return await asyncio.wait_for(response_future, timeout)
+        except asyncio.TimeoutError:
+            raise self._error('Response timeout.')
+        finally:
+            self._response_futures.pop(request_id, None)
+
+
+class AsyncWebsocketTransportError(TransportError):
+    """Async websocket transport error."""
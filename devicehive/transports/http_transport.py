@@ -16,10 +16,15 @@
 
 from devicehive.transports.transport import Transport
 from devicehive.transports.transport import TransportError
+from devicehive.transports.transport import EventQueue
+from devicehive.transports.transport import Future
 import requests
 import threading
+import logging
 import sys
-import time
+
+
+logger = logging.getLogger(__name__)
 
 
 class HttpTransport(Transport):
@@ -33,47 +38,114 @@ class HttpTransport(Transport):
                                             handler_options)
         self._url = None
         self._options = None
-        self._events_queue_sleep = None
-        self._events_queue = []
-        self._subscription_ids = []
+        self._session_pool_size = None
+        self._max_host_connections = None
+        self._keep_alive = None
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+        self._connections_semaphore = None
+        self._events_queue = EventQueue()
+        self._requests_queue = EventQueue()
+        self._coalesce_subscriptions = None
+        self._subscriptions = {}
+        self._subscription_groups = {}
+        self._subscriptions_lock = threading.Lock()
         self._success_codes = [200, 201, 204]
 
     def _connect(self, url, **options):
         self._url = url
+        self._session_pool_size = options.pop('session_pool_size', 10)
+        self._max_host_connections = options.pop('max_host_connections', 10)
+        self._keep_alive = options.pop('keep_alive', True)
+        self._connections_semaphore = threading.BoundedSemaphore(
+            self._max_host_connections)
+        num_request_workers = options.pop('request_workers', 4)
+        self._coalesce_subscriptions = options.pop('coalesce_subscriptions',
+                                                   True)
+        options.pop('events_queue_sleep_time', None)
         self._options = options
-        self._events_queue_sleep_time = options.pop('events_queue_sleep_time',
-                                                    1e-6)
+        self._events_queue = EventQueue()
+        self._requests_queue = EventQueue()
         if not self._url.endswith('/'):
             self._url += '/'
         self._connected = True
+        for request_worker_num in range(num_request_workers):
+            request_worker_thread_name = '%s-transport-request-%s'
+            request_worker_thread_name %= (self._name, request_worker_num)
+            request_worker_thread = threading.Thread(
+                target=self._request_worker, args=(self._requests_queue,))
+            request_worker_thread.daemon = True
+            request_worker_thread.name = request_worker_thread_name
+            request_worker_thread.start()
         self._handle_connect()
 
     def _receive(self):
         while self._connected and not self._exception_info:
-            if not self._events_queue:
-                time.sleep(self._events_queue_sleep_time)
-                continue
-            for event in self._events_queue.pop(0):
-                self._handle_event(event)
-                if not self._connected:
-                    return
+            events = self._events_queue.get()
+            if events is None:
+                return
+            self._handle_events(events)
 
     def _disconnect(self):
-        self._events_queue = []
-        self._subscription_ids = []
+        self._events_queue.close()
+        self._events_queue.clear()
+        self._requests_queue.close()
+        with self._subscriptions_lock:
+            for subscription_group in self._subscriptions.values():
+                subscription_group.clear()
+            self._subscriptions = {}
+            self._subscription_groups = {}
+        self._close_sessions()
         self._handle_disconnect()
 
+    def _create_session(self):
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1,
+                                                pool_maxsize=1)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if not self._keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def _acquire_session(self):
+        self._connections_semaphore.acquire()
+        with self._sessions_lock:
+            if self._sessions:
+                return self._sessions.pop()
+        return self._create_session()
+
+    def _release_session(self, session):
+        try:
+            with self._sessions_lock:
+                if len(self._sessions) < self._session_pool_size:
+                    self._sessions.append(session)
+                    return
+            session.close()
+        finally:
+            self._connections_semaphore.release()
+
+    def _close_sessions(self):
+        with self._sessions_lock:
+            sessions = self._sessions
+            self._sessions = []
+        for session in sessions:
+            session.close()
+
     def _request_call(self, method, url, **params):
         options = self._options.copy()
         options.update(params)
+        session = self._acquire_session()
         try:
-            response = requests.request(method, url, **options)
+            response = session.request(method, url, **options)
             code = response.status_code
             if self._text_data_type:
                 return code, response.text
             return code, response.content
         except requests.RequestException as http_error:
             error = http_error
+        finally:
+            self._release_session(session)
         raise self._error(error)
 
     def _request(self, request_id, action, request, **params):
@@ -111,20 +183,25 @@ class HttpTransport(Transport):
         response[self.RESPONSE_ERROR_KEY] = response_error
         return response
 
+    def _request_worker(self, requests_queue):
+        while True:
+            request_args = requests_queue.get()
+            if request_args is None:
+                return
+            response_future, request_id, action, request, params = request_args
+            try:
+                response = self.request(request_id, action, request, **params)
+                response_future.set_result(response)
+            except:
+                response_future.set_exception(sys.exc_info()[1])
+
     def _subscription_request(self, request_id, action, subscription_request,
                               response_subscription_id_key):
         response = self._subscription_probe(**subscription_request)
         if response[self.RESPONSE_STATUS_KEY] != self.RESPONSE_SUCCESS_STATUS:
             return response
         subscription_id = subscription_request['subscription_id']
-        self._subscription_ids.append(subscription_id)
-        subscription_thread_name = '%s-transport-subscription-%s'
-        subscription_thread_name %= (self._name, subscription_id)
-        subscription_thread = threading.Thread(target=self._subscription,
-                                               kwargs=subscription_request)
-        subscription_thread.daemon = True
-        subscription_thread.name = subscription_thread_name
-        subscription_thread.start()
+        self._add_subscription(**subscription_request)
         return {self.REQUEST_ID_KEY: request_id,
                 self.REQUEST_ACTION_KEY: action,
                 self.RESPONSE_STATUS_KEY: self.RESPONSE_SUCCESS_STATUS,
@@ -138,28 +215,80 @@ class HttpTransport(Transport):
         params.pop('params_timestamp_key', None)
         params.pop('response_timestamp_key', None)
         params.pop('response_subscription_id_key', None)
-
+        params['params'] = params.get('params', {}).copy()
         params['params']['waitTimeout'] = 0
         params['params']['limit'] = 0
         return self._request(request_id, action, request.copy(), **params)
 
-    def _subscription(self, subscription_id, request_id, action, request,
-                      params):
-        response_error_handler = params.pop('response_error_handler', None)
-        response_error_handler_args = params.pop('response_error_handler_args',
-                                                 None)
-        response_key = params['response_key']
-        params_timestamp_key = params.pop('params_timestamp_key', 'timestamp')
-        response_timestamp_key = params.pop('response_timestamp_key',
-                                            'timestamp')
-        response_subscription_id_key = params.pop(
-            'response_subscription_id_key', 'subscriptionId')
-        while subscription_id in self._subscription_ids:
+    def _add_subscription(self, subscription_id, request_id, action, request,
+                          params):
+        key = SubscriptionGroup.group_key(action, params)
+        if not self._coalesce_subscriptions:
+            key += (subscription_id,)
+        with self._subscriptions_lock:
+            subscription_group = self._subscription_groups.get(key)
+            if subscription_group and subscription_group.compatible(params):
+                subscription_group.add(subscription_id, params)
+                self._subscriptions[subscription_id] = subscription_group
+                return
+            subscription_group = SubscriptionGroup(key, request_id, action,
+                                                   request, params)
+            subscription_group.add(subscription_id, params)
+            self._subscription_groups[key] = subscription_group
+            self._subscriptions[subscription_id] = subscription_group
+        self._start_subscription(subscription_group, subscription_id)
+
+    def _start_subscription(self, subscription_group, subscription_id):
+        subscription_thread_name = '%s-transport-subscription-%s'
+        subscription_thread_name %= (self._name, subscription_id)
+        subscription_thread = threading.Thread(target=self._subscription,
+                                               args=(subscription_group,))
+        subscription_thread.daemon = True
+        subscription_thread.name = subscription_thread_name
+        subscription_thread.start()
+
+    def _split_subscription_group(self, subscription_group):
+        with self._subscriptions_lock:
+            if self._subscription_groups.get(
+                    subscription_group.key) is subscription_group:
+                del self._subscription_groups[subscription_group.key]
+            subscription_groups = subscription_group.split()
+            subscription_group.clear()
+            for split_subscription_group in subscription_groups:
+                subscription_id, = split_subscription_group.subscription_ids
+                self._subscriptions[subscription_id] = \
+                    split_subscription_group
+        for split_subscription_group in subscription_groups:
+            subscription_id, = split_subscription_group.subscription_ids
+            self._start_subscription(split_subscription_group,
+                                     subscription_id)
+
+    def _poll_params(self, subscription_group):
+        with self._subscriptions_lock:
+            if not subscription_group.subscription_ids:
+                if self._subscription_groups.get(
+                        subscription_group.key) is subscription_group:
+                    del self._subscription_groups[subscription_group.key]
+                return None, None
+            return (subscription_group.poll_params(),
+                    subscription_group.subscription_ids)
+
+    def _subscription(self, subscription_group):
+        action = subscription_group.action
+        request_id = subscription_group.request_id
+        request = subscription_group.request
+        params = subscription_group.params
+        response_error_handler = subscription_group.response_error_handler
+        response_error_handler_args = \
+            subscription_group.response_error_handler_args
+        while self._connected:
             try:
-                response = self._request(request_id, action, request.copy(),
-                                         **params)
-                if subscription_id not in self._subscription_ids:
+                poll_params, subscription_ids = self._poll_params(
+                    subscription_group)
+                if poll_params is None:
                     return
+                response = self._request(request_id, action, request.copy(),
+                                         **poll_params)
                 response_status = response[self.RESPONSE_STATUS_KEY]
                 if response_status != self.RESPONSE_SUCCESS_STATUS:
                     response_code = response[self.RESPONSE_CODE_KEY]
@@ -167,44 +296,66 @@ class HttpTransport(Transport):
                     error %= (action, response_code)
                     if not response_error_handler:
                         raise self._error(error)
-                    if not response_error_handler(params, response_code,
-                                                  *response_error_handler_args):
+                    if not response_error_handler(
+                            params, response_code,
+                            *response_error_handler_args):
                         raise self._error(error)
-                    response = self._request(request_id, action, request.copy(),
-                                             **params)
-                    if subscription_id not in self._subscription_ids:
-                        return
+                    poll_params['headers'] = params['headers'].copy()
+                    response = self._request(request_id, action,
+                                             request.copy(), **poll_params)
                     response_status = response[self.RESPONSE_STATUS_KEY]
                     if response_status != self.RESPONSE_SUCCESS_STATUS:
                         raise self._error(error)
-                events = response[response_key]
-                if not len(events):
+                with self._subscriptions_lock:
+                    events = subscription_group.dispatch(
+                        response[subscription_group.response_key],
+                        subscription_ids)
+                if not events:
                     continue
-                timestamp = events[-1][response_timestamp_key]
-                if not params.get('params'):
-                    params['params'] = {}
-                params['params'][params_timestamp_key] = timestamp
                 events = [{self.REQUEST_ACTION_KEY: action,
-                           response_key: event,
-                           response_subscription_id_key: subscription_id}
-                          for event in events]
-                self._events_queue.append(events)
+                           subscription_group.response_key: event,
+                           subscription_group.response_subscription_id_key:
+                               subscription_id}
+                          for subscription_id, event in events]
+                self._events_queue.put(events)
             except:
+                if len(subscription_group.subscription_ids) > 1:
+                    logger.warning('Coalesced subscription poll failure. '
+                                   'Action: %s. Polling subscriptions %s '
+                                   'separately.', action,
+                                   subscription_group.subscription_ids,
+                                   exc_info=True)
+                    self._split_subscription_group(subscription_group)
+                    return
                 self._exception_info = sys.exc_info()
+                self._events_queue.close()
+                return
 
     def _remove_subscription_request(self, request_id, action, subscription_id,
                                      response_code, response_error):
-        if subscription_id not in self._subscription_ids:
+        with self._subscriptions_lock:
+            subscription_group = self._subscriptions.pop(subscription_id, None)
+            if subscription_group:
+                subscription_group.remove(subscription_id)
+        if not subscription_group:
             return {self.REQUEST_ID_KEY: request_id,
                     self.REQUEST_ACTION_KEY: action,
                     self.RESPONSE_STATUS_KEY: self.RESPONSE_ERROR_STATUS,
                     self.RESPONSE_CODE_KEY: response_code,
                     self.RESPONSE_ERROR_KEY: response_error}
-        self._subscription_ids.remove(subscription_id)
         return {self.REQUEST_ID_KEY: request_id,
                 self.REQUEST_ACTION_KEY: action,
                 self.RESPONSE_STATUS_KEY: self.RESPONSE_SUCCESS_STATUS}
 
+    @property
+    def subscription_groups(self):
+        subscription_groups = []
+        with self._subscriptions_lock:
+            for subscription_group in self._subscriptions.values():
+                if subscription_group not in subscription_groups:
+                    subscription_groups.append(subscription_group)
+        return subscription_groups
+
     def send_request(self, request_id, action, request, **params):
         self._ensure_connected()
         subscription_request = params.pop('subscription_request', {})
@@ -221,7 +372,15 @@ class HttpTransport(Transport):
                 request_id, action, **remove_subscription_request)
         else:
             response = self._request(request_id, action, request, **params)
-        self._events_queue.append([response])
+        self._events_queue.put([response])
+
+    @property
+    def events_queue(self):
+        return self._events_queue
+
+    def disconnect(self):
+        super(HttpTransport, self).disconnect()
+        self._events_queue.close()
 
     def request(self, request_id, action, request, **params):
         self._ensure_connected()
@@ -239,6 +398,185 @@ class HttpTransport(Transport):
                 request_id, action, **remove_subscription_request)
         return self._request(request_id, action, request, **params)
 
+    def request_async(self, request_id, action, request, **params):
+        self._ensure_connected()
+        response_future = Future(self._error)
+        if not self._requests_queue.put((response_future, request_id, action,
+                                         request, params)):
+            response_future.set_exception(
+                self._error('Connection has closed.'))
+        return response_future
+
+
+class SubscriptionGroup(object):
+    """Subscription group class."""
+
+    PARAMS_NAMES_KEY = 'names'
+
+    def __init__(self, key, request_id, action, request, params):
+        params = params.copy()
+        params['params'] = params.get('params', {}).copy()
+        params['headers'] = params.get('headers', {}).copy()
+        self._key = key
+        self._request_id = request_id
+        self._action = action
+        self._request = request
+        self._response_error_handler = params.pop('response_error_handler',
+                                                  None)
+        self._response_error_handler_args = params.pop(
+            'response_error_handler_args', None)
+        self._response_key = params['response_key']
+        self._params_timestamp_key = params.pop('params_timestamp_key',
+                                                'timestamp')
+        self._response_timestamp_key = params.pop('response_timestamp_key',
+                                                  'timestamp')
+        self._response_subscription_id_key = params.pop(
+            'response_subscription_id_key', 'subscriptionId')
+        params['params'].pop(self.PARAMS_NAMES_KEY, None)
+        params['params'].pop(self._params_timestamp_key, None)
+        self._params = params
+        self._names = {}
+        self._timestamps = {}
+        self._members_params = {}
+
+    @staticmethod
+    def group_key(action, params):
+        params_timestamp_key = params.get('params_timestamp_key', 'timestamp')
+        excluded_keys = (SubscriptionGroup.PARAMS_NAMES_KEY,
+                         params_timestamp_key)
+        poll_params = tuple(sorted((key, str(value)) for key, value
+                                   in params.get('params', {}).items()
+                                   if key not in excluded_keys))
+        return action, params['url'], poll_params
+
+    @property
+    def key(self):
+        return self._key
+
+    @property
+    def request_id(self):
+        return self._request_id
+
+    @property
+    def action(self):
+        return self._action
+
+    @property
+    def request(self):
+        return self._request
+
+    @property
+    def params(self):
+        return self._params
+
+    @property
+    def response_error_handler(self):
+        return self._response_error_handler
+
+    @property
+    def response_error_handler_args(self):
+        return self._response_error_handler_args
+
+    @property
+    def response_key(self):
+        return self._response_key
+
+    @property
+    def response_subscription_id_key(self):
+        return self._response_subscription_id_key
+
+    @property
+    def subscription_ids(self):
+        return list(self._names)
+
+    def _add(self, subscription_id, params, timestamp):
+        names = params.get('params', {}).get(self.PARAMS_NAMES_KEY)
+        if names:
+            names = frozenset(names.split(','))
+        self._names[subscription_id] = names
+        self._timestamps[subscription_id] = timestamp
+        self._members_params[subscription_id] = params
+
+    def compatible(self, params):
+        timestamp = params.get('params', {}).get(self._params_timestamp_key)
+        if not self._timestamps:
+            return True
+        timestamps = [member_timestamp for member_timestamp
+                      in self._timestamps.values() if member_timestamp]
+        if not timestamp:
+            return not timestamps
+        return len(timestamps) == len(self._timestamps)
+
+    def add(self, subscription_id, params):
+        timestamp = params.get('params', {}).get(self._params_timestamp_key)
+        self._add(subscription_id, params, timestamp)
+
+    def split(self):
+        subscription_groups = []
+        for subscription_id, params in self._members_params.items():
+            subscription_group = SubscriptionGroup(
+                self._key + (subscription_id,), self._request_id,
+                self._action, self._request, params)
+            subscription_group._add(subscription_id, params,
+                                    self._timestamps[subscription_id])
+            subscription_groups.append(subscription_group)
+        return subscription_groups
+
+    def remove(self, subscription_id):
+        self._names.pop(subscription_id, None)
+        self._timestamps.pop(subscription_id, None)
+        self._members_params.pop(subscription_id, None)
+
+    def clear(self):
+        self._names = {}
+        self._timestamps = {}
+        self._members_params = {}
+
+    def poll_params(self):
+        poll_params = self._params.copy()
+        poll_params['params'] = self._params['params'].copy()
+        poll_params['headers'] = self._params['headers'].copy()
+        names = set()
+        for subscription_names in self._names.values():
+            if not subscription_names:
+                names = None
+                break
+            names.update(subscription_names)
+        if names:
+            poll_params['params'][self.PARAMS_NAMES_KEY] = ','.join(
+                sorted(names))
+        timestamps = [timestamp for timestamp in self._timestamps.values()
+                      if timestamp]
+        if timestamps:
+            poll_params['params'][self._params_timestamp_key] = min(timestamps)
+        return poll_params
+
+    def dispatch(self, events, polled_subscription_ids):
+        subscription_events = []
+        polled_subscription_ids = [subscription_id for subscription_id
+                                   in polled_subscription_ids
+                                   if subscription_id in self._names]
+        for event in events:
+            timestamp = event[self._response_timestamp_key]
+            for subscription_id in polled_subscription_ids:
+                names = self._names[subscription_id]
+                if names and event.get(self._response_key) not in names:
+                    continue
+                subscription_timestamp = self._timestamps[subscription_id]
+                if subscription_timestamp and \
+                        timestamp <= subscription_timestamp:
+                    continue
+                subscription_events.append((subscription_id, event))
+        if not events:
+            return subscription_events
+        timestamp = events[-1][self._response_timestamp_key]
+        for subscription_id in polled_subscription_ids:
+            subscription_timestamp = self._timestamps[subscription_id]
+            if not subscription_timestamp or \
+                    subscription_timestamp < timestamp:
+                self._timestamps[subscription_id] = timestamp
+        return subscription_events
+
 
 class HttpTransportError(TransportError):
     """Http transport error."""
@@ -14,6 +14,7 @@
 # =============================================================================
 
 
+from collections import deque
 import sys
 import threading
 
@@ -47,18 +48,33 @@ class Transport(object):
     def _binary_data_type(self):
         return self._data_format.binary_data_type
 
+    @property
+    def _bytes_decoding(self):
+        return self._data_format.bytes_decoding
+
     def _encode(self, obj):
         return self._data_format.encode(obj)
 
     def _decode(self, data):
         return self._data_format.decode(data)
 
+    def _response_data(self, data):
+        return self._data_format.may_contain_key(data, self.REQUEST_ID_KEY)
+
+    def _decode_event(self, event):
+        if isinstance(event, dict):
+            return event
+        return self._decode(event)
+
     def _handle_connect(self):
         self._handler.handle_connect()
 
     def _handle_event(self, event):
         self._handler.handle_event(event)
 
+    def _handle_events(self, events):
+        self._handler.handle_events(events)
+
     def _handle_disconnect(self):
         self._handler.handle_disconnect()
 
@@ -133,6 +149,166 @@ class Transport(object):
     def request(self, request_id, action, request, **params):
         raise NotImplementedError
 
+    def request_async(self, request_id, action, request, **params):
+        raise NotImplementedError
+
+    def cancel_request(self, request_id):
+        pass
+
+
+class Future(object):
+    """Future class."""
+
+    def __init__(self, error=None):
+        self._error = error or TransportError
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._result = None
+        self._exception = None
+        self._callbacks = []
+
+    def _set(self, result, exception):
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self._result = result
+            self._exception = exception
+            self._event.set()
+            callbacks = self._callbacks
+            self._callbacks = []
+        for callback in callbacks:
+            callback(self)
+        return True
+
+    def set_result(self, result):
+        return self._set(result, None)
+
+    def set_exception(self, exception):
+        return self._set(None, exception)
+
+    def add_done_callback(self, callback):
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def done(self):
+        return self._event.is_set()
+
+    def wait(self, timeout=None):
+        return self._event.wait(timeout)
+
+    def exception(self, timeout=None):
+        if not self._event.wait(timeout):
+            raise self._error('Response timeout.')
+        return self._exception
+
+    def result(self, timeout=None):
+        exception = self.exception(timeout)
+        if exception:
+            raise exception
+        return self._result
+
+
+class EventQueue(object):
+    """Event queue class."""
+
+    BLOCK_OVERFLOW_POLICY = 'block'
+    DROP_OLDEST_OVERFLOW_POLICY = 'drop_oldest'
+    DROP_NEWEST_OVERFLOW_POLICY = 'drop_newest'
+    OVERFLOW_POLICIES = (BLOCK_OVERFLOW_POLICY, DROP_OLDEST_OVERFLOW_POLICY,
+                         DROP_NEWEST_OVERFLOW_POLICY)
+
+    def __init__(self, max_size=0, overflow_policy=BLOCK_OVERFLOW_POLICY):
+        assert overflow_policy in self.OVERFLOW_POLICIES, \
+            'Unexpected overflow policy'
+        self._max_size = max_size
+        self._overflow_policy = overflow_policy
+        self._events = deque()
+        self._condition = threading.Condition(threading.Lock())
+        self._closed = False
+        self._num_queued = 0
+        self._num_dropped = 0
+
+    def _full(self):
+        return 0 < self._max_size <= len(self._events)
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    @property
+    def overflow_policy(self):
+        return self._overflow_policy
+
+    @property
+    def size(self):
+        return len(self._events)
+
+    @property
+    def num_queued(self):
+        return self._num_queued
+
+    @property
+    def num_dropped(self):
+        return self._num_dropped
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def put(self, event):
+        with self._condition:
+            while self._full() and not self._closed:
+                if self._overflow_policy == self.DROP_NEWEST_OVERFLOW_POLICY:
+                    self._num_dropped += 1
+                    return False
+                if self._overflow_policy == self.DROP_OLDEST_OVERFLOW_POLICY:
+                    self._events.popleft()
+                    self._num_dropped += 1
+                    break
+                self._condition.wait()
+            if self._closed:
+                self._num_dropped += 1
+                return False
+            self._events.append(event)
+            self._num_queued += 1
+            self._condition.notify_all()
+            return True
+
+    def get(self):
+        with self._condition:
+            while not self._events and not self._closed:
+                self._condition.wait()
+            if not self._events:
+                return None
+            event = self._events.popleft()
+            self._condition.notify_all()
+            return event
+
+    def get_batch(self, max_size=0):
+        with self._condition:
+            while not self._events and not self._closed:
+                self._condition.wait()
+            if not 0 < max_size < len(self._events):
+                events = list(self._events)
+                self._events.clear()
+            else:
+                events = [self._events.popleft() for _ in range(max_size)]
+            self._condition.notify_all()
+            return events
+
+    def clear(self):
+        with self._condition:
+            self._events.clear()
+            self._condition.notify_all()
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
 
 class TransportError(IOError):
     """Transport error."""
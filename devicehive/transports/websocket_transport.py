@@ -16,6 +16,8 @@
 
 from devicehive.transports.transport import Transport
 from devicehive.transports.transport import TransportError
+from devicehive.transports.transport import Future
+from devicehive.transports.transport import EventQueue
 import websocket
 import socket
 import threading
@@ -33,13 +35,20 @@ class WebsocketTransport(Transport):
                                                  data_format_class,
                                                  data_format_options,
                                                  handler_class, handler_options)
-        self._websocket = websocket.WebSocket()
+        self._websocket = websocket.WebSocket(
+            skip_utf8_validation=self._bytes_decoding)
         self._connection_lock = threading.Lock()
-        self._event_queue_sleep_time = None
-        self._response_sleep_time = None
+        self._send_lock = threading.Lock()
+        self._send_thread = None
+        self._send_batch_max_size = None
         self._pong_received = False
-        self._event_queue = []
-        self._responses = {}
+        self._event_queue = EventQueue()
+        self._send_queue = EventQueue()
+        self._num_sent_frames = 0
+        self._num_send_calls = 0
+        self._send_latency_sum = 0
+        self._response_futures = {}
+        self._response_futures_lock = threading.Lock()
         if self._text_data_type:
             self._data_opcode = websocket.ABNF.OPCODE_TEXT
         else:
@@ -54,14 +63,24 @@ class WebsocketTransport(Transport):
 
     def _connect(self, url, **options):
         timeout = options.pop('timeout', None)
-        event_queue_sleep_time = options.pop('event_queue_sleep_time', 1e-6)
-        response_sleep_time = options.pop('response_sleep_time', 1e-6)
+        event_queue_max_size = options.pop('event_queue_max_size', 0)
+        event_queue_overflow_policy = options.pop(
+            'event_queue_overflow_policy', EventQueue.BLOCK_OVERFLOW_POLICY)
+        options.pop('event_queue_sleep_time', None)
+        options.pop('response_sleep_time', None)
         pong_timeout = options.pop('pong_timeout', None)
+        self._send_batch_max_size = options.pop('send_batch_max_size', 64)
         self._websocket.timeout = timeout
-        self._event_queue_sleep_time = event_queue_sleep_time
-        self._response_sleep_time = response_sleep_time
+        self._event_queue = EventQueue(event_queue_max_size,
+                                       event_queue_overflow_policy)
+        self._send_queue = EventQueue()
         self._websocket_call(self._websocket.connect, url, **options)
         self._connected = True
+        self._send_thread = threading.Thread(target=self._send,
+                                             args=(self._send_queue,))
+        self._send_thread.name = '%s-transport-send' % self._name
+        self._send_thread.daemon = True
+        self._send_thread.start()
         event_thread = threading.Thread(target=self._event)
         event_thread.name = '%s-transport-event' % self._name
         event_thread.daemon = True
@@ -82,81 +101,195 @@ class WebsocketTransport(Transport):
                         self._websocket.recv_data, True)
                 if opcode in (websocket.ABNF.OPCODE_TEXT,
                               websocket.ABNF.OPCODE_BINARY):
-                    if opcode == websocket.ABNF.OPCODE_TEXT:
+                    if opcode == websocket.ABNF.OPCODE_TEXT and \
+                            not self._bytes_decoding:
                         data = data.decode('utf-8')
+                    if not self._response_data(data):
+                        self._event_queue.put(data)
+                        continue
                     event = self._decode(data)
                     request_id = event.get(self.REQUEST_ID_KEY)
                     if not request_id:
-                        self._event_queue.append(event)
+                        self._event_queue.put(event)
                         continue
-                    self._responses[request_id] = event
+                    response_future = self._pop_response_future(request_id)
+                    if response_future:
+                        response_future.set_result(event)
                     continue
                 if opcode == websocket.ABNF.OPCODE_PONG:
                     self._pong_received = True
                     continue
                 if opcode == websocket.ABNF.OPCODE_CLOSE:
+                    self._event_queue.close()
+                    self._cancel_response_futures()
                     return
             except:
                 self._exception_info = sys.exc_info()
+                self._event_queue.close()
+                self._cancel_response_futures()
+                return
+
+    def _send(self, send_queue):
+        send_error = None
+        while True:
+            send_items = send_queue.get_batch(self._send_batch_max_size)
+            if not send_items:
+                return
+            if not send_error:
+                try:
+                    self._send_frames([data for data, _, _ in send_items])
+                except self._error as error:
+                    send_error = error
+                    self._exception_info = sys.exc_info()
+                    self._event_queue.close()
+            if send_error:
+                for _, response_future, _ in send_items:
+                    if response_future:
+                        response_future.set_exception(send_error)
+                self._cancel_response_futures()
+                continue
+            send_time = time.time()
+            for _, _, queue_time in send_items:
+                self._send_latency_sum += send_time - queue_time
+            self._num_sent_frames += len(send_items)
+            self._num_send_calls += 1
+
+    def _send_frames(self, frames):
+        with self._send_lock:
+            if len(frames) == 1:
+                self._websocket_call(self._websocket.send, frames[0],
+                                     opcode=self._data_opcode)
+                return
+            data = b''.join(websocket.ABNF.create_frame(frame,
+                                                        self._data_opcode)
+                            .format() for frame in frames)
+            self._websocket_call(self._send_data, data)
+
+    def _send_data(self, data):
+        if not self._websocket.sock:
+            raise websocket.WebSocketConnectionClosedException(
+                'Socket is already closed.')
+        self._websocket.sock.sendall(data)
 
     def _ping(self, pong_timeout):
         while self._connected:
             try:
-                self._websocket_call(self._websocket.ping)
+                with self._send_lock:
+                    self._websocket_call(self._websocket.ping)
             except self._error:
                 self._connected = False
+                self._event_queue.close()
                 return
             self._pong_received = False
             time.sleep(pong_timeout)
             if not self._pong_received:
                 self._connected = False
+                self._event_queue.close()
                 return
 
     def _receive(self):
         while self._connected and not self._exception_info:
-            if not self._event_queue:
-                time.sleep(self._event_queue_sleep_time)
-                continue
-            for event in self._event_queue:
-                self._handle_event(event)
-                if not self._connected:
-                    return
-            self._event_queue = []
+            events = self._event_queue.get_batch()
+            if not events:
+                return
+            self._handle_events([self._decode_event(event)
+                                 for event in events])
 
     def _disconnect(self):
-        self._websocket_call(self._websocket.ping)
-        with self._connection_lock:
-            self._websocket_call(self._websocket.close)
-        self._pong_received = False
-        self._event_queue = []
-        self._responses = {}
-        self._handle_disconnect()
+        self._send_queue.close()
+        self._send_thread.join()
+        try:
+            with self._send_lock:
+                self._websocket_call(self._websocket.ping)
+            with self._connection_lock:
+                self._websocket_call(self._websocket.close)
+        finally:
+            self._pong_received = False
+            self._event_queue.close()
+            self._event_queue.clear()
+            self._cancel_response_futures()
+            self._handle_disconnect()
 
-    def _send_request(self, request_id, action, request):
+    def _send_request(self, request_id, action, request, response_future=None):
         request[self.REQUEST_ID_KEY] = request_id
         request[self.REQUEST_ACTION_KEY] = action
-        self._websocket_call(self._websocket.send, self._encode(request),
-                             opcode=self._data_opcode)
-
-    def _receive_response(self, request_id, timeout):
-        start_time = time.time()
-        while time.time() - timeout < start_time:
-            response = self._responses.get(request_id)
-            if response:
-                del self._responses[request_id]
-                return response
-            time.sleep(self._response_sleep_time)
+        send_item = (self._encode(request), response_future, time.time())
+        if not self._send_queue.put(send_item):
+            raise self._error('Connection has closed.')
+
+    def _add_response_future(self, request_id):
+        response_future = Future(self._error)
+        with self._response_futures_lock:
+            self._response_futures[request_id] = response_future
+        return response_future
+
+    def _pop_response_future(self, request_id):
+        with self._response_futures_lock:
+            return self._response_futures.pop(request_id, None)
+
+    def _cancel_response_futures(self):
+        with self._response_futures_lock:
+            response_futures = self._response_futures
+            self._response_futures = {}
+        for response_future in response_futures.values():
+            response_future.set_exception(
+                self._error('Connection has closed.'))
+
+    def _receive_response(self, request_id, response_future, timeout):
+        if response_future.wait(timeout):
+            return response_future.result()
+        self._pop_response_future(request_id)
         raise self._error('Response timeout.')
 
+    @property
+    def event_queue(self):
+        return self._event_queue
+
+    @property
+    def send_queue(self):
+        return self._send_queue
+
+    @property
+    def num_sent_frames(self):
+        return self._num_sent_frames
+
+    @property
+    def num_send_calls(self):
+        return self._num_send_calls
+
+    @property
+    def average_send_latency(self):
+        if not self._num_sent_frames:
+            return 0
+        return self._send_latency_sum / self._num_sent_frames
+
+    def disconnect(self):
+        super(WebsocketTransport, self).disconnect()
+        self._event_queue.close()
+
     def send_request(self, request_id, action, request, **params):
         self._ensure_connected()
         self._send_request(request_id, action, request)
 
     def request(self, request_id, action, request, **params):
-        self._ensure_connected()
         timeout = params.pop('timeout', 30)
-        self._send_request(request_id, action, request)
-        return self._receive_response(request_id, timeout)
+        response_future = self.request_async(request_id, action, request)
+        return self._receive_response(request_id, response_future, timeout)
+
+    def request_async(self, request_id, action, request, **params):
+        self._ensure_connected()
+        response_future = self._add_response_future(request_id)
+        try:
+            self._send_request(request_id, action, request, response_future)
+        except self._error:
+            self._pop_response_future(request_id)
+            raise
+        return response_future
+
+    def cancel_request(self, request_id):
+        response_future = self._pop_response_future(request_id)
+        if response_future:
+            response_future.set_exception(self._error('Request cancelled.'))
 
 
 class WebsocketTransportError(TransportError):
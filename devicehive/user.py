@@ -18,6 +18,7 @@ from devicehive.api_request import AuthApiRequest
 from devicehive.api_request import ApiRequestError
 from devicehive.network import Network
 from devicehive.device_type import DeviceType
+from devicehive.entity_cache import EntityCache
 
 
 class User(object):
@@ -78,6 +79,13 @@ class User(object):
             return
         raise UserError('User have access to all device types.')
 
+    def _cache(self, user):
+        self._api.entity_cache.put(EntityCache.USER_ENTITY, user[self.ID_KEY],
+                                   user)
+
+    def _uncache(self):
+        self._api.entity_cache.remove(EntityCache.USER_ENTITY, self._id)
+
     @property
     def id(self):
         return self._id
@@ -113,6 +121,7 @@ class User(object):
         auth_api_request.response_key('user')
         user = auth_api_request.execute('User get failure.')
         self._init(user)
+        self._cache(user)
 
     def save(self):
         self._ensure_exists()
@@ -125,6 +134,7 @@ class User(object):
         auth_api_request.action('user/update')
         auth_api_request.set('user', user, True)
         auth_api_request.execute('User save failure.')
+        self._uncache()
 
     def update_password(self, password):
         self._ensure_exists()
@@ -135,6 +145,7 @@ class User(object):
         auth_api_request.action('user/update')
         auth_api_request.set('user', user, True)
         auth_api_request.execute('User password update failure.')
+        self._uncache()
 
     def remove(self):
         self._ensure_exists()
@@ -143,6 +154,7 @@ class User(object):
         auth_api_request.url('user/{userId}', userId=self._id)
         auth_api_request.action('user/delete')
         auth_api_request.execute('User remove failure.')
+        self._uncache()
         self._id = None
         self._login = None
         self._last_login = None
@@ -170,6 +182,7 @@ class User(object):
                              userId=self._id, networkId=network_id)
         auth_api_request.action('user/assignNetwork')
         auth_api_request.execute('Assign network failure.')
+        self._uncache()
 
     def unassign_network(self, network_id):
         self._ensure_exists()
@@ -179,6 +192,7 @@ class User(object):
                              userId=self._id, networkId=network_id)
         auth_api_request.action('user/unassignNetwork')
         auth_api_request.execute('Unassign network failure.')
+        self._uncache()
 
     def list_device_types(self):
         self._ensure_exists()
@@ -198,6 +212,7 @@ class User(object):
         auth_api_request.url('user/{userId}/devicetype/all', userId=self._id)
         auth_api_request.action('user/allowAllDeviceTypes')
         auth_api_request.execute('Assign all device types failure.')
+        self._uncache()
         self._all_device_types_available = True
 
     def disallow_all_device_types(self):
@@ -208,6 +223,7 @@ class User(object):
         auth_api_request.url('user/{userId}/devicetype/all', userId=self._id)
         auth_api_request.action('user/disallowAllDeviceTypes')
         auth_api_request.execute('Unassign device type failure.')
+        self._uncache()
         self._all_device_types_available = False
 
     def assign_device_type(self, device_type_id):
@@ -219,6 +235,7 @@ class User(object):
                              userId=self._id, deviceTypeId=device_type_id)
         auth_api_request.action('user/assignDeviceType')
         auth_api_request.execute('Assign device type failure.')
+        self._uncache()
 
     def unassign_device_type(self, device_type_id):
         self._ensure_exists()
@@ -229,6 +246,7 @@ class User(object):
                              userId=self._id, deviceTypeId=device_type_id)
         auth_api_request.action('user/unassignDeviceType')
         auth_api_request.execute('Unassign device type failure.')
+        self._uncache()
 
 
 class UserError(ApiRequestError):
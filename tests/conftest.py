@@ -20,6 +20,10 @@ from tests.test import Test
 
 
 USER_ROLES = ['admin', 'client']
+collect_ignore = []
+if six.PY2:
+    collect_ignore.append('test_api_async.py')
+    collect_ignore.append('test_async_transports.py')
 
 
 def pytest_addoption(parser):
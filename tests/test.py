@@ -33,18 +33,20 @@ class TestHandler(Handler):
     """Test handler class."""
 
     def __init__(self, api, handle_connect, handle_command_insert,
-                 handle_command_update, handle_notification):
+                 handle_command_update, handle_notification,
+                 handle_notifications=None):
         super(TestHandler, self).__init__(api)
         self._handle_connect = handle_connect
         self._handle_command_insert = handle_command_insert
         self._handle_command_update = handle_command_update
         self._handle_notification = handle_notification
+        self._handle_notifications = handle_notifications
         self.data = {}
 
     def handle_connect(self):
         self._handle_connect(self)
         if not any([self._handle_command_insert, self._handle_command_update,
-                    self._handle_notification]):
+                    self._handle_notification, self._handle_notifications]):
             self.disconnect()
 
     def handle_command_insert(self, command):
@@ -62,6 +64,12 @@ class TestHandler(Handler):
             return
         self._handle_notification(self, notification)
 
+    def handle_notifications(self, notifications):
+        if not self._handle_notifications:
+            return super(TestHandler, self).handle_notifications(
+                notifications)
+        self._handle_notifications(self, notifications)
+
     def disconnect(self):
         self.api.disconnect()
 
@@ -138,6 +146,14 @@ class Test(object):
     def entity_ids(self):
         return self._entity_ids
 
+    @property
+    def transport_url(self):
+        return self._transport_url
+
+    @property
+    def credentials(self):
+        return self._credentials
+
     @property
     def transport_name(self):
         return self._transport_name
@@ -205,19 +221,22 @@ class Test(object):
             return
         pytest.skip('Not implemented for "login/password" credentials.')
 
-    def device_hive_api(self):
-        return DeviceHiveApi(self._transport_url, **self._credentials)
+    def device_hive_api(self, **options):
+        options.update(self._credentials)
+        return DeviceHiveApi(self._transport_url, **options)
 
     def run(self, handle_connect, handle_command_insert=None,
             handle_command_update=None, handle_notification=None,
-            handle_timeout=60):
+            handle_notifications=None, handle_timeout=60, **options):
         handler_kwargs = {'handle_connect': handle_connect,
                           'handle_command_insert': handle_command_insert,
                           'handle_command_update': handle_command_update,
-                          'handle_notification': handle_notification}
+                          'handle_notification': handle_notification,
+                          'handle_notifications': handle_notifications}
+        options.update(self._credentials)
         device_hive = DeviceHive(TestHandler, **handler_kwargs)
         device_hive.connect(self._transport_url, transport_keep_alive=False,
-                            **self._credentials)
+                            **options)
 
         start_time = time.time()
         while time.time() - handle_timeout < start_time:
@@ -15,8 +15,14 @@
 
 
 from six import string_types
-from devicehive import ApiResponseError, SubscriptionError
+from devicehive import ApiResponseError, SubscriptionError, FileTokenStore
+from devicehive import DeviceError, HistoryExporterError
 from devicehive.user import User
+from devicehive.handler_process_pool import HandlerProcessError
+import threading
+import json
+import time
+import os
 
 
 def test_get_info(test):
@@ -32,6 +38,30 @@ def test_get_info(test):
     assert info['rest_server_url'] is None
 
 
+def test_session(test):
+    device_hive_api = test.device_hive_api(session=True)
+    _, device_ids = test.generate_ids('s', test.DEVICE_ENTITY, 4)
+    results = []
+
+    def put_device(num):
+        device = device_hive_api.put_device(device_ids[num])
+        results.append(device.id)
+
+    info = device_hive_api.get_info()
+    assert isinstance(info['api_version'], string_types)
+    threads = [threading.Thread(target=put_device, args=(num,))
+               for num in range(4)]
+    [thread.start() for thread in threads]
+    [thread.join() for thread in threads]
+    assert sorted(results) == device_ids
+    for result in results:
+        device_hive_api.get_device(result).remove()
+    device_hive_api.disconnect()
+    info = device_hive_api.get_info()
+    assert isinstance(info['api_version'], string_types)
+    device_hive_api.disconnect()
+
+
 def test_get_cluster_info(test):
     device_hive_api = test.device_hive_api()
     cluster_info = device_hive_api.get_cluster_info()
@@ -66,6 +96,33 @@ def test_refresh_token(test):
     assert isinstance(access_token, string_types)
 
 
+def test_token_expiration(test):
+
+    def handle_connect(handler):
+        token = handler.api.token
+        assert token.expiration > time.time()
+        assert not token.expired
+
+    test.run(handle_connect)
+
+
+def test_token_store(test, tmpdir):
+    test.not_access_token_cred_implementation()
+    token_store = FileTokenStore(str(tmpdir.join('tokens.json')))
+    access_tokens = []
+
+    def handle_connect(handler):
+        access_tokens.append(handler.api.token.access_token)
+        handler.api.get_info()
+
+    test.run(handle_connect, token_store=token_store)
+    test.run(handle_connect, token_store=token_store)
+    assert os.stat(token_store.path).st_mode & 0o777 == 0o600
+    assert access_tokens[0] == access_tokens[1]
+    assert token_store.key('url', 'login', 'password') != token_store.key(
+        'url', 'login', 'wrong-password')
+
+
 def test_subscribe_insert_commands(test):
     test.only_admin_implementation()
 
@@ -521,6 +578,25 @@ def test_list_devices(test):
     [test_device.remove() for test_device in test_devices]
 
 
+def test_iter_devices(test):
+    device_hive_api = test.device_hive_api()
+    test_id, device_ids = test.generate_ids('i-d', test.DEVICE_ENTITY, 5)
+    test_devices = [device_hive_api.put_device(device_id)
+                    for device_id in device_ids]
+    name_pattern = test_id + '%'
+    devices = device_hive_api.iter_devices(name_pattern=name_pattern,
+                                           sort_field='name', sort_order='ASC',
+                                           take=2)
+    assert [device.id for device in devices] == device_ids
+    devices = device_hive_api.iter_devices(name_pattern=name_pattern,
+                                           sort_field='name', sort_order='ASC',
+                                           take=2, skip=3)
+    assert [device.id for device in devices] == device_ids[3:]
+    name_pattern = test.generate_id('i-d-n-e')
+    assert not list(device_hive_api.iter_devices(name_pattern=name_pattern))
+    [test_device.remove() for test_device in test_devices]
+
+
 def test_get_device(test):
     device_hive_api = test.device_hive_api()
     device_id = test.generate_id('g-d', test.DEVICE_ENTITY)
@@ -570,6 +646,134 @@ def test_put_device(test):
     device.remove()
 
 
+def test_put_devices(test):
+    device_hive_api = test.device_hive_api()
+    _, device_ids = test.generate_ids('p-ds', test.DEVICE_ENTITY, 3)
+    data = {'data_key': 'data_value'}
+    devices = [device_ids[0],
+               {'device_id': device_ids[1], 'data': data},
+               {'device_id': device_ids[2], 'network_id': -1}]
+    results = device_hive_api.put_devices(devices)
+    assert [result['device_id'] for result in results] == device_ids
+    device = results[0]['device']
+    assert device.id == device_ids[0]
+    assert device.name == device_ids[0]
+    assert isinstance(device.network_id, int)
+    assert not results[0]['error']
+    assert results[1]['device'].data == data
+    assert not results[2]['device']
+    assert isinstance(results[2]['error'], ApiResponseError)
+    results = device_hive_api.put_devices(device_ids[:2], fetch=False)
+    assert [result['device'].id for result in results] == device_ids[:2]
+    assert results[0]['device'].network_id is None
+    [result['device'].remove() for result in results]
+    try:
+        device_hive_api.put_devices([device_ids[0],
+                                     {'device_id': device_ids[1], 'key': 1}])
+        assert False
+    except DeviceError as device_error:
+        assert str(device_error) == 'Device 1 has unexpected keys: key.'
+    assert not device_hive_api.list_devices(name=device_ids[0])
+
+
+def test_entity_cache(test):
+    _, device_ids = test.generate_ids('e-c', test.DEVICE_ENTITY, 2)
+
+    def handle_connect(handler):
+        entity_cache = handler.api.entity_cache
+        device = handler.api.put_device(device_ids[0])
+        assert handler.api.get_device(device_ids[0]).name == device_ids[0]
+        assert entity_cache.hits == 1
+        assert not entity_cache.misses
+        device.name = '%s-name' % device_ids[0]
+        device.save()
+        assert handler.api.get_device(device_ids[0]).name == device.name
+        assert entity_cache.misses == 1
+        handler.api.put_device(device_ids[1])
+        assert entity_cache.size == 1
+        assert entity_cache.evictions == 1
+        device.remove()
+        try:
+            handler.api.get_device(device_ids[0])
+            assert False
+        except ApiResponseError as api_response_error:
+            if test.is_user_admin:
+                assert api_response_error.code == 404
+            else:
+                assert api_response_error.code == 403
+        handler.api.get_device(device_ids[1]).remove()
+
+    test.run(handle_connect, entity_cache={'max_size': 1, 'ttl': 60})
+
+
+def test_user_entity_cache(test):
+    test.only_admin_implementation()
+    login = test.generate_id('u-e-c', test.USER_ENTITY)
+    password = test.generate_id('u-e-c')
+
+    def handle_connect(handler):
+        user = handler.api.create_user(login, password, User.CLIENT_ROLE, {},
+                                       False)
+        user = handler.api.get_user(user.id)
+        user.allow_all_device_types()
+        cached_user = handler.api.get_user(user.id)
+        assert cached_user.all_device_types_available
+        cached_user.disallow_all_device_types()
+        assert not handler.api.get_user(user.id).all_device_types_available
+        user.remove()
+
+    test.run(handle_connect, entity_cache={'max_size': 10, 'ttl': 60})
+
+
+def test_export_notifications(test, tmpdir):
+    device_hive_api = test.device_hive_api()
+    device_id = test.generate_id('e-n', test.DEVICE_ENTITY)
+    notification_name = test.generate_id('e-n')
+    device = device_hive_api.put_device(device_id)
+    start = device_hive_api.get_info()['server_timestamp']
+    notifications = [device.send_notification(notification_name,
+                                              parameters={'key': i})
+                     for i in range(5)]
+    end = device_hive_api.get_info()['server_timestamp']
+    path = str(tmpdir.join('notifications.ndjson'))
+    checkpoint_path = str(tmpdir.join('notifications.checkpoint'))
+    count = device_hive_api.export_notifications(
+        path, device_id, start, end, notification=notification_name,
+        window=0.05, take=2, checkpoint_path=checkpoint_path)
+    assert count == len(notifications)
+    with open(path) as ndjson_file:
+        lines = [json.loads(line) for line in ndjson_file]
+    assert [line['id'] for line in lines] == [notification.id
+                                             for notification in notifications]
+    assert [line['parameters'] for line in lines] == [
+        {'key': i} for i in range(5)]
+    count = device_hive_api.export_notifications(
+        path, device_id, start, end, notification=notification_name,
+        window=0.05, checkpoint_path=checkpoint_path)
+    assert count == len(notifications)
+    with open(path) as ndjson_file:
+        assert len(ndjson_file.readlines()) == len(notifications)
+    try:
+        device_hive_api.export_notifications(
+            path, device_id, start, end, window=0.05,
+            checkpoint_path=checkpoint_path)
+        assert False
+    except HistoryExporterError:
+        pass
+    with open(path) as ndjson_file:
+        assert len(ndjson_file.readlines()) == len(notifications)
+    path = str(tmpdir.join('notifications.csv'))
+    count = device_hive_api.export_notifications(
+        path, device_id, start, end, notification=notification_name,
+        output_format='csv')
+    assert count == len(notifications)
+    with open(path) as csv_file:
+        lines = csv_file.readlines()
+    assert lines[0] == 'id,deviceId,notification,timestamp,parameters\n'
+    assert len(lines) == len(notifications) + 1
+    device.remove()
+
+
 def test_list_networks(test):
     test.only_admin_implementation()
     device_hive_api = test.device_hive_api()
@@ -819,3 +1023,203 @@ def test_create_user(test):
     except ApiResponseError as api_response_error:
         assert api_response_error.code == 403
     user.remove()
+
+
+def test_apply_connect_calls(test):
+    device_hive_api = test.device_hive_api()
+    server_timestamp = device_hive_api.get_info()['server_timestamp']
+
+    def handle_connect(handler):
+        device_id = test.generate_id('a-c-c', test.DEVICE_ENTITY)
+        device = handler.api.put_device(device_id)
+        commands_subscription = handler.api.subscribe_insert_commands(
+            device_id)
+        notifications_subscription = handler.api.subscribe_notifications(
+            device_id)
+        commands_subscription_id = commands_subscription.id
+        notifications_subscription_id = notifications_subscription.id
+        for subscription in (commands_subscription,
+                             notifications_subscription):
+            subscription._remove_api_request().execute('Unsubscribe failure.')
+        handler.api.apply_connect_calls()
+        assert handler.api.server_timestamp >= server_timestamp
+        assert commands_subscription.id != commands_subscription_id
+        assert notifications_subscription.id != notifications_subscription_id
+        commands_subscription.remove()
+        notifications_subscription.remove()
+        device.remove()
+
+    test.run(handle_connect, fast_connect=True)
+
+
+def test_subscription_timestamp(test):
+
+    def handle_connect(handler):
+        device_id = test.generate_id('s-t', test.DEVICE_ENTITY)
+        device = handler.api.put_device(device_id)
+        notification = device.send_notification('%s-name' % device_id)
+        handler.data['device'] = device
+        handler.data['notification_id'] = notification.id
+        handler.data['subscription'] = device.subscribe_notifications(
+            timestamp=handler.api.server_timestamp)
+        assert handler.data['subscription'].timestamp == \
+            handler.api.server_timestamp
+
+    def handle_notification(handler, notification):
+        subscription = handler.data['subscription']
+        assert notification.id == handler.data['notification_id']
+        assert subscription.timestamp == notification.timestamp
+        assert not subscription.handle_event(
+            'notification/insert', {'notification': {
+                'id': notification.id, 'timestamp': notification.timestamp}})
+        subscription.remove()
+        handler.data['device'].remove()
+        handler.disconnect()
+
+    test.run(handle_connect, handle_notification=handle_notification)
+
+
+def test_subscription_callback(test):
+
+    def handle_connect(handler):
+        device_id = test.generate_id('s-c', test.DEVICE_ENTITY)
+        device = handler.api.put_device(device_id)
+        notification = device.send_notification('%s-name' % device_id)
+
+        def callback(callback_notification):
+            assert callback_notification.id == notification.id
+            device.remove()
+            handler.disconnect()
+
+        subscription = device.subscribe_notifications(
+            timestamp=handler.api.server_timestamp, callback=callback)
+        assert subscription.callback == callback
+
+    def handle_notification(handler, notification):
+        assert False
+
+    test.run(handle_connect, handle_notification=handle_notification)
+
+
+def test_handle_events(test):
+    notification_names = ['a', 'b', 'c']
+
+    def handle_connect(handler):
+        device_id = test.generate_id('h-e', test.DEVICE_ENTITY)
+        device = handler.api.put_device(device_id)
+        timestamp = handler.api.server_timestamp
+        handler.data['device'] = device
+        handler.data['ids'] = [device.send_notification(name).id
+                               for name in notification_names]
+        handler.data['received_ids'] = []
+        handler.data['num_notifications'] = []
+        device.subscribe_notifications(timestamp=timestamp)
+        time.sleep(1)
+
+    def handle_notifications(handler, notifications):
+        handler.data['num_notifications'].append(len(notifications))
+        handler.data['received_ids'].extend(notification.id
+                                            for notification in notifications)
+        if len(handler.data['received_ids']) < len(notification_names):
+            return
+        assert handler.data['received_ids'] == handler.data['ids']
+        assert max(handler.data['num_notifications']) > 1
+        handler.data['device'].remove()
+        handler.disconnect()
+
+    test.run(handle_connect, handle_notifications=handle_notifications)
+
+
+def test_handler_workers(test):
+    notification_names = ['a', 'b', 'c']
+
+    def handle_connect(handler):
+        timestamp = handler.api.server_timestamp
+        handler.data['devices'] = {}
+        handler.data['ids'] = {}
+        handler.data['received_ids'] = {}
+        handler.data['lock'] = threading.Lock()
+        for index in range(2):
+            device_id = test.generate_id('h-w-%s' % index, test.DEVICE_ENTITY)
+            device = handler.api.put_device(device_id)
+            handler.data['devices'][device_id] = device
+            handler.data['ids'][device_id] = [
+                device.send_notification(name).id
+                for name in notification_names]
+            handler.data['received_ids'][device_id] = []
+            device.subscribe_notifications(timestamp=timestamp)
+
+    def handle_notification(handler, notification):
+        received_ids = handler.data['received_ids']
+        with handler.data['lock']:
+            received_ids[notification.device_id].append(notification.id)
+            if sum(len(ids) for ids in received_ids.values()) != 6:
+                return
+        assert received_ids == handler.data['ids']
+        for device in handler.data['devices'].values():
+            device.remove()
+        handler.disconnect()
+
+    test.run(handle_connect, handle_notification=handle_notification,
+             handler_workers=2)
+
+
+def test_handler_processes(test):
+    num_commands = 2
+    device_ids = []
+
+    def handle_connect(handler):
+        updated_commands = []
+
+        def handle_command_update(command):
+            updated_commands.append(command)
+            if len(updated_commands) == len(device_ids) * num_commands:
+                handler.disconnect()
+
+        for index in range(3):
+            device_id = test.generate_id('h-p-%s' % index, test.DEVICE_ENTITY)
+            device_ids.append(device_id)
+            device = handler.api.put_device(device_id)
+            device.subscribe_insert_commands()
+            device.subscribe_update_commands(callback=handle_command_update)
+        for device_id in device_ids:
+            device = handler.api.get_device(device_id)
+            for _ in range(num_commands):
+                device.send_command('%s-name' % device_id)
+
+    def handle_command_insert(handler, command):
+        command.status = 'status'
+        command.result = {'pid': os.getpid()}
+        command.save()
+
+    test.run(handle_connect, handle_command_insert=handle_command_insert,
+             handler_processes=2)
+    device_hive_api = test.device_hive_api()
+    for device_id in device_ids:
+        device = device_hive_api.get_device(device_id)
+        commands = device.list_commands()
+        assert len(commands) == num_commands
+        assert all(command.status == 'status' for command in commands)
+        pids = set(command.result['pid'] for command in commands)
+        assert len(pids) == 1
+        assert os.getpid() not in pids
+        device.remove()
+
+
+def test_handler_processes_exception(test):
+
+    def handle_connect(handler):
+        device_id = test.generate_id('h-p-e', test.DEVICE_ENTITY)
+        device = handler.api.put_device(device_id)
+        device.subscribe_insert_commands()
+        device.send_command('%s-name' % device_id)
+
+    def handle_command_insert(handler, command):
+        raise ValueError('Handler process failure.')
+
+    try:
+        test.run(handle_connect, handle_command_insert=handle_command_insert,
+                 handler_processes=2)
+        assert False
+    except HandlerProcessError as handler_process_error:
+        assert 'Handler process failure.' in str(handler_process_error)
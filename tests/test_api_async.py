@@ -0,0 +1,65 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+from devicehive import AsyncDeviceHive, AsyncHandler
+import asyncio
+
+
+class AsyncTestHandler(AsyncHandler):
+    """Async test handler class."""
+
+    def __init__(self, api, test):
+        super(AsyncTestHandler, self).__init__(api)
+        self._test = test
+        self.data = {}
+
+    async def handle_connect(self):
+        device_id = self._test.generate_id('a-d', self._test.DEVICE_ENTITY)
+        notification_names = ['%s-name-%s' % (device_id, i) for i in range(2)]
+        device = await self.api.put_device(device_id)
+        assert device.id == device_id
+        notifications = await asyncio.gather(
+            *[device.send_notification(notification_name)
+              for notification_name in notification_names])
+        self.data['device'] = device
+        self.data['notification_ids'] = [notification.id
+                                         for notification in notifications]
+        self.data['subscription'] = await device.subscribe_notifications()
+
+    async def handle_notification(self, notification):
+        assert notification.id in self.data['notification_ids']
+        self.data['notification_ids'].remove(notification.id)
+        if self.data['notification_ids']:
+            return
+        await self.data['subscription'].remove()
+        await self.data['device'].remove()
+        self.api.disconnect()
+
+
+def test_async_subscribe_notifications(test):
+    device_hive = AsyncDeviceHive(AsyncTestHandler, test)
+    connect = device_hive.connect(test.transport_url,
+                                  transport_keep_alive=False,
+                                  **test.credentials)
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(connect)
+        loop.run_until_complete(asyncio.wait_for(device_hive.transport.join(),
+                                                 60))
+    finally:
+        loop.close()
+    assert not device_hive.transport.exception_info
+    assert not device_hive.handler.data['notification_ids']
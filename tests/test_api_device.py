@@ -533,3 +533,44 @@ def test_send_notification(test):
             assert api_response_error.code == 404
         else:
             assert api_response_error.code == 403
+
+
+def test_send_notification_async(test):
+
+    def handle_connect(handler):
+        device_id = test.generate_id('d-s-n-a', test.DEVICE_ENTITY)
+        notification_names = ['%s-name-%s' % (device_id, i) for i in range(10)]
+        parameters = {'parameters_key': 'parameters_value'}
+        device = handler.api.put_device(device_id)
+        notification_futures = [
+            device.send_notification_async(notification_name,
+                                           parameters=parameters)
+            for notification_name in notification_names]
+        for notification_name, notification_future in zip(
+                notification_names, notification_futures):
+            notification = notification_future.result()
+            assert notification_future.done()
+            assert notification.device_id == device_id
+            assert isinstance(notification.id, int)
+            assert notification.notification == notification_name
+            assert notification.parameters == parameters
+            assert notification.timestamp
+        device_1 = handler.api.get_device(device_id)
+        device.remove()
+        try:
+            device.send_notification_async(notification_names[0])
+            assert False
+        except DeviceError:
+            pass
+        notification_future = device_1.send_notification_async(
+            notification_names[0])
+        try:
+            notification_future.result()
+            assert False
+        except ApiResponseError as api_response_error:
+            if test.is_user_admin:
+                assert api_response_error.code == 404
+            else:
+                assert api_response_error.code == 403
+
+    test.run(handle_connect)
@@ -0,0 +1,362 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+from devicehive.transports.async_http_transport import AsyncHttpTransport
+from devicehive.transports.async_websocket_transport import \
+    AsyncWebsocketTransport
+from devicehive.transports.async_websocket_transport import \
+    AsyncWebsocketTransportError
+from devicehive.data_formats.json_data_format import JsonDataFormat
+from devicehive.async_device import AsyncDevice
+from urllib.parse import urlsplit
+import websocket
+import asyncio
+import base64
+import hashlib
+import struct
+import pytest
+
+
+class TransportHandler(object):
+    """Transport handler class."""
+
+    def __init__(self, transport):
+        self.transport = transport
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(asyncio.wait_for(coroutine, 10))
+    finally:
+        loop.close()
+
+
+async def start_server(handle_connection):
+    server = await asyncio.start_server(handle_connection, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, port
+
+
+async def read_request(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    headers = dict((name.strip().lower(), value.strip())
+                   for name, value in (line.split(':', 1)
+                                       for line in lines[1:] if ':' in line))
+    body = await reader.readexactly(int(headers.get('content-length', 0)))
+    return lines[0], headers, body
+
+
+def http_transport(connection_pool_size=10):
+    transport = AsyncHttpTransport(JsonDataFormat, {}, TransportHandler, {})
+    transport._headers = {}
+    transport._connection_pool_size = connection_pool_size
+    return transport
+
+
+def websocket_frame(data, opcode, fin=True, mask=None):
+    header = bytearray([(0x80 if fin else 0) | opcode])
+    mask_bit = 0x80 if mask else 0
+    if len(data) < 126:
+        header.append(mask_bit | len(data))
+    elif len(data) < 0x10000:
+        header.append(mask_bit | 126)
+        header.extend(struct.pack('!H', len(data)))
+    else:
+        header.append(mask_bit | 127)
+        header.extend(struct.pack('!Q', len(data)))
+    if mask:
+        header.extend(mask)
+        data = websocket.ABNF.mask(mask, data)
+    return bytes(header) + data
+
+
+async def read_websocket_frame(reader):
+    header = await reader.readexactly(2)
+    opcode = header[0] & 0x0f
+    length = header[1] & 0x7f
+    if length == 126:
+        length = struct.unpack('!H', await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack('!Q', await reader.readexactly(8))[0]
+    mask = await reader.readexactly(4)
+    data = await reader.readexactly(length)
+    return opcode, websocket.ABNF.mask(mask, data)
+
+
+async def websocket_handshake(reader, writer, accept_key=None):
+    _, headers, _ = await read_request(reader)
+    if accept_key is None:
+        accept_key = headers['sec-websocket-key'] + \
+            AsyncWebsocketTransport.WEBSOCKET_GUID
+        accept_key = hashlib.sha1(accept_key.encode('utf-8')).digest()
+        accept_key = base64.b64encode(accept_key).decode('utf-8')
+    writer.write(('HTTP/1.1 101 Switching Protocols\r\n'
+                  'Upgrade: websocket\r\n'
+                  'Connection: Upgrade\r\n'
+                  'Sec-WebSocket-Accept: %s\r\n\r\n' %
+                  accept_key).encode('utf-8'))
+    await writer.drain()
+    return headers
+
+
+def test_http_request_content_length_and_keep_alive():
+    connections = []
+
+    async def handle_connection(reader, writer):
+        connections.append(writer)
+        while True:
+            try:
+                request_line, headers, body = await read_request(reader)
+            except asyncio.IncompleteReadError:
+                return
+            assert headers['host'].startswith('127.0.0.1:')
+            response = request_line.encode('utf-8') + b' ' + body
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s' %
+                         (len(response), response))
+            await writer.drain()
+
+    async def requests():
+        server, port = await start_server(handle_connection)
+        transport = http_transport()
+        url = urlsplit('http://127.0.0.1:%s/info?a=1' % port)
+        try:
+            first = await transport._http_request('POST', url, b'one', {})
+            second = await transport._http_request('GET', url, b'', {})
+        finally:
+            transport._close_connections()
+            server.close()
+        return first, second
+
+    first, second = run(requests())
+    assert first == (200, b'POST /info?a=1 HTTP/1.1 one')
+    assert second == (200, b'GET /info?a=1 HTTP/1.1 ')
+    assert len(connections) == 1
+
+
+def test_http_request_chunked_body_and_connection_close():
+    async def handle_connection(reader, writer):
+        await read_request(reader)
+        writer.write(b'HTTP/1.1 200 OK\r\n'
+                     b'Transfer-Encoding: chunked\r\n'
+                     b'Connection: close\r\n\r\n'
+                     b'5\r\nhello\r\n'
+                     b'6;ext=1\r\n world\r\n'
+                     b'0\r\n\r\n')
+        await writer.drain()
+        writer.close()
+
+    async def request():
+        server, port = await start_server(handle_connection)
+        transport = http_transport()
+        url = urlsplit('http://127.0.0.1:%s/' % port)
+        try:
+            response = await transport._http_request('GET', url, b'', {})
+            return response, len(transport._connections)
+        finally:
+            transport._close_connections()
+            server.close()
+
+    response, num_pooled_connections = run(request())
+    assert response == (200, b'hello world')
+    assert num_pooled_connections == 0
+
+
+def test_http_request_retries_stale_pooled_connection():
+    connections = []
+
+    async def handle_connection(reader, writer):
+        connections.append(writer)
+        await read_request(reader)
+        writer.write(b'HTTP/1.1 204 No Content\r\n\r\n')
+        await writer.drain()
+        if len(connections) == 1:
+            writer.close()
+            return
+        await reader.read()
+
+    async def requests():
+        server, port = await start_server(handle_connection)
+        transport = http_transport()
+        url = urlsplit('http://127.0.0.1:%s/' % port)
+        try:
+            first = await transport._http_request('GET', url, b'', {})
+            await asyncio.sleep(0.1)
+            second = await transport._http_request('GET', url, b'', {})
+        finally:
+            transport._close_connections()
+            server.close()
+        return first, second
+
+    first, second = run(requests())
+    assert first == (204, b'')
+    assert second == (204, b'')
+    assert len(connections) == 2
+
+
+def test_http_request_cancellation_closes_connection():
+    request_received = []
+
+    async def handle_connection(reader, writer):
+        await read_request(reader)
+        request_received.append(True)
+        await reader.read()
+
+    async def request():
+        server, port = await start_server(handle_connection)
+        transport = http_transport()
+        url = urlsplit('http://127.0.0.1:%s/' % port)
+        task = asyncio.ensure_future(transport._http_request('GET', url, b'',
+                                                             {}))
+        try:
+            while not request_received:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return len(transport._connections)
+        finally:
+            transport._close_connections()
+            server.close()
+
+    assert run(request()) == 0
+
+
+def test_http_request_call_timeout():
+    async def handle_connection(reader, writer):
+        await read_request(reader)
+        await reader.read()
+
+    async def request():
+        server, port = await start_server(handle_connection)
+        transport = http_transport()
+        transport._timeout = 0.1
+        url = 'http://127.0.0.1:%s/' % port
+        try:
+            with pytest.raises(transport.error):
+                await transport._request_call('GET', url)
+            return len(transport._connections)
+        finally:
+            transport._close_connections()
+            server.close()
+
+    assert run(request()) == 0
+
+
+def test_websocket_handshake_and_frames():
+    received_frames = []
+    large_data = b'x' * 70000
+
+    async def handle_connection(reader, writer):
+        headers = await websocket_handshake(reader, writer)
+        assert headers['upgrade'] == 'websocket'
+        assert headers['x-test'] == 'yes'
+        writer.write(websocket_frame(b'{"a":1}', websocket.ABNF.OPCODE_TEXT,
+                                     mask=b'abcd'))
+        writer.write(websocket_frame(b'p', websocket.ABNF.OPCODE_PING))
+        writer.write(websocket_frame(b'b' * 300,
+                                     websocket.ABNF.OPCODE_BINARY))
+        writer.write(websocket_frame(large_data[:10],
+                                     websocket.ABNF.OPCODE_TEXT, fin=False))
+        writer.write(websocket_frame(large_data[10:],
+                                     websocket.ABNF.OPCODE_CONT))
+        await writer.drain()
+        received_frames.append(await read_websocket_frame(reader))
+        received_frames.append(await read_websocket_frame(reader))
+
+    async def frames():
+        server, port = await start_server(handle_connection)
+        transport = AsyncWebsocketTransport(JsonDataFormat, {},
+                                            TransportHandler, {})
+        transport._write_lock = asyncio.Lock()
+        url = 'ws://127.0.0.1:%s/api/websocket' % port
+        try:
+            await transport._open_connection(url, 5, {'X-Test': 'yes'}, None)
+            result = [await transport._recv_data() for _ in range(3)]
+            await transport._write_frame(b'reply', websocket.ABNF.OPCODE_TEXT)
+            await asyncio.sleep(0.1)
+            return result
+        finally:
+            transport._writer.close()
+            server.close()
+
+    result = run(frames())
+    assert result == [(websocket.ABNF.OPCODE_TEXT, b'{"a":1}'),
+                      (websocket.ABNF.OPCODE_BINARY, b'b' * 300),
+                      (websocket.ABNF.OPCODE_TEXT, large_data)]
+    assert received_frames == [(websocket.ABNF.OPCODE_PONG, b'p'),
+                               (websocket.ABNF.OPCODE_TEXT, b'reply')]
+
+
+def test_websocket_handshake_errors():
+    async def handle_invalid_key(reader, writer):
+        await websocket_handshake(reader, writer, 'invalid')
+
+    async def handle_invalid_status(reader, writer):
+        await read_request(reader)
+        writer.write(b'HTTP/1.1 403 Forbidden\r\nContent-Length: 0\r\n\r\n')
+        await writer.drain()
+
+    async def connect(handle_connection):
+        server, port = await start_server(handle_connection)
+        transport = AsyncWebsocketTransport(JsonDataFormat, {},
+                                            TransportHandler, {})
+        url = 'ws://127.0.0.1:%s/' % port
+        try:
+            with pytest.raises(AsyncWebsocketTransportError) as error:
+                await transport._connect(url, timeout=5)
+            return str(error.value), transport._writer.is_closing()
+        finally:
+            server.close()
+
+    assert run(connect(handle_invalid_key)) == (
+        'Invalid handshake accept key.', True)
+    error, closed = run(connect(handle_invalid_status))
+    assert error == 'Handshake status: HTTP/1.1 403 Forbidden.'
+    assert closed
+
+
+def test_async_device_async_methods():
+    calls = []
+
+    class AsyncDeviceApi(object):
+        """Async device api class."""
+
+        async def send_command(self, **kwargs):
+            calls.append(('command', kwargs))
+            return 'command'
+
+        async def send_notification(self, **kwargs):
+            calls.append(('notification', kwargs))
+            return 'notification'
+
+    async def send():
+        device = AsyncDevice(AsyncDeviceApi(), {'id': 'device-id',
+                                                'name': 'device-id',
+                                                'data': None,
+                                                'networkId': 1,
+                                                'deviceTypeId': 1,
+                                                'isBlocked': False})
+        command = device.send_command_async('command-name', lifetime=5)
+        notification = device.send_notification_async('notification-name')
+        assert isinstance(command, asyncio.Future)
+        return await command, await notification
+
+    assert run(send()) == ('command', 'notification')
+    assert calls[0][1]['command_name'] == 'command-name'
+    assert calls[0][1]['lifetime'] == 5
+    assert calls[1][1]['notification_name'] == 'notification-name'
@@ -0,0 +1,124 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+from devicehive.data_formats.json_data_format import JsonDataFormat
+from devicehive.data_formats.message_pack_data_format import \
+    MessagePackDataFormat
+import pytest
+
+
+NOTIFICATION_EVENT = {
+    'action': 'notification/insert',
+    'subscriptionId': 1,
+    'notification': {'id': 1234567890, 'deviceId': 'device-id',
+                     'networkId': 1, 'deviceTypeId': 1,
+                     'notification': 'temperature',
+                     'timestamp': '2018-01-01T00:00:00.000',
+                     'parameters': {'value': -21.5, 'values': [1, 2, 3],
+                                    'unit': u'\u00b0C', 'ok': True,
+                                    'error': None}}}
+COMMAND_REQUEST = {
+    'action': 'command/insert',
+    'requestId': 'a3b2c1d0-1111-2222-3333-444455556666',
+    'deviceId': 'device-id',
+    'command': {'command': 'set', 'lifetime': 600,
+                'parameters': {'interval': 30, 'threshold': 0.25,
+                               'name': u'\u043d\u0430\u0437\u0432\u0430',
+                               'escape': u'"\\/\n\t\x01\u2028',
+                               'values': [0, -1, 2 ** 63 - 1, 0.1, -0.0,
+                                          123456789.123, None, False]}}}
+
+
+def test_message_pack_round_trip():
+    data_format = MessagePackDataFormat()
+    assert data_format.binary_data_type
+    values = [None, True, False, 0, 127, 128, -1, -32, -33, -128, -129,
+              255, 256, 65535, 65536, -32768, -32769, 2 ** 32, -2 ** 31 - 1,
+              2 ** 64 - 1, -2 ** 63, 0.5, -1e300, u'', u'a' * 31, u'a' * 32,
+              u'a' * 256, u'a' * 65536, [], list(range(16)), {},
+              dict((str(i), i) for i in range(16)), NOTIFICATION_EVENT]
+    for value in values:
+        assert data_format.decode(data_format.encode(value)) == value
+
+
+def test_message_pack_format():
+    data_format = MessagePackDataFormat()
+    assert data_format.encode({u'a': [1, -1, None]}) == \
+        b'\x81\xa1a\x93\x01\xff\xc0'
+    assert data_format.encode(1.5) == b'\xcb?\xf8\x00\x00\x00\x00\x00\x00'
+    assert data_format.decode(b'\xca?\xc0\x00\x00') == 1.5
+    assert data_format.decode(b'\xc4\x02ab') == b'ab'
+    with pytest.raises(ValueError):
+        data_format.encode(2 ** 64)
+    with pytest.raises(ValueError):
+        data_format.decode(b'\xc1')
+    with pytest.raises(ValueError):
+        data_format.decode(b'\x01\x02')
+
+
+def test_message_pack_smaller_than_json():
+    json_data = JsonDataFormat().encode(NOTIFICATION_EVENT)
+    message_pack_data = MessagePackDataFormat().encode(NOTIFICATION_EVENT)
+    assert len(message_pack_data) < len(json_data)
+
+
+@pytest.mark.parametrize('backend', JsonDataFormat.available_backends())
+def test_json_backend_conformance(backend):
+    data_format = JsonDataFormat(backend)
+    json_data_format = JsonDataFormat(JsonDataFormat.JSON_BACKEND)
+    assert data_format.backend == backend
+    assert data_format.text_data_type
+    assert data_format.bytes_decoding == (
+        backend == JsonDataFormat.ORJSON_BACKEND or
+        JsonDataFormat.JSON_BYTES_DECODING)
+    for value in [NOTIFICATION_EVENT, COMMAND_REQUEST, [], {}, u'', 0]:
+        data = data_format.encode(value)
+        assert data == json_data_format.encode(value)
+        assert isinstance(data, bytes)
+        assert data_format.decode(data) == value
+        assert data_format.decode(data.decode('utf-8')) == value
+        assert data_format.decode(bytearray(data)) == value
+    value = [1e300, 1e-07, 1e16]
+    assert data_format.decode(json_data_format.encode(value)) == value
+    assert json_data_format.decode(data_format.encode(value)) == value
+    for value, data in [({1: u'a'}, b'{"1":"a"}'),
+                        ([2 ** 64, -2 ** 63 - 1],
+                         b'[18446744073709551616,-9223372036854775809]'),
+                        (u'\ud800', b'"\\ud800"'),
+                        ({u'a\udfff': u'b'}, b'{"a\\udfff":"b"}')]:
+        assert data_format.encode(value) == data
+    assert data_format.decode(b'"\\ud800"') == u'\ud800'
+    assert data_format.decode(b'[NaN]')[0] != data_format.decode(b'[NaN]')[0]
+    if backend == JsonDataFormat.JSON_BACKEND:
+        assert data_format.encode([float('nan')]) == b'[NaN]'
+    else:
+        assert data_format.encode([float('nan')]) == b'[null]'
+
+
+def test_json_default_backend():
+    data_format = JsonDataFormat()
+    assert data_format.backend == JsonDataFormat.JSON_BACKEND
+    assert data_format.bytes_decoding == JsonDataFormat.JSON_BYTES_DECODING
+
+
+@pytest.mark.parametrize('data_format', [JsonDataFormat(),
+                                         MessagePackDataFormat()])
+def test_may_contain_key(data_format):
+    data = data_format.encode(COMMAND_REQUEST)
+    assert data_format.may_contain_key(data, 'requestId')
+    data = data_format.encode(NOTIFICATION_EVENT)
+    assert not data_format.may_contain_key(data, 'requestId')
+    assert data_format.may_contain_key(data, 'subscriptionId')
@@ -0,0 +1,249 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+from devicehive.transports.http_transport import HttpTransport
+from devicehive.transports.http_transport import SubscriptionGroup
+from devicehive.data_formats.json_data_format import JsonDataFormat
+from devicehive.api_request import SubscriptionApiRequest
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+from six.moves.urllib.parse import urlsplit, parse_qs
+import threading
+import json
+import time
+
+
+EVENTS = [{'id': 1, 'notification': 'a', 'timestamp': '2018-01-01T00:00:01'},
+          {'id': 2, 'notification': 'a', 'timestamp': '2018-01-01T00:00:03'},
+          {'id': 3, 'notification': 'b', 'timestamp': '2018-01-01T00:00:04'},
+          {'id': 4, 'notification': 'a', 'timestamp': '2018-01-01T00:00:05'},
+          {'id': 5, 'notification': 'c', 'timestamp': '2018-01-01T00:00:06'}]
+
+
+class PollServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """Poll server class."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        BaseHTTPServer.HTTPServer.__init__(self, ('127.0.0.1', 0),
+                                           PollRequestHandler)
+        self.polls = []
+        self.fail_names = set()
+        self.connections = 0
+        self.max_connections = 0
+        self.connections_lock = threading.Lock()
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%s/' % self.server_address[1]
+
+
+class PollRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Poll request handler class."""
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self, code, data):
+        data = json.dumps(data).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _slow_respond(self):
+        with self.server.connections_lock:
+            self.server.connections += 1
+            self.server.max_connections = max(self.server.max_connections,
+                                              self.server.connections)
+        time.sleep(0.1)
+        with self.server.connections_lock:
+            self.server.connections -= 1
+        self._respond(200, [])
+
+    def do_GET(self):
+        if self.path.startswith('/slow'):
+            return self._slow_respond()
+        params = dict((key, values[0]) for key, values
+                      in parse_qs(urlsplit(self.path).query).items())
+        if params.get('limit') == '0':
+            return self._respond(200, [])
+        names = params.get('names')
+        timestamp = params.get('timestamp')
+        self.server.polls.append((names, timestamp))
+        if names in self.server.fail_names:
+            self.server.fail_names.remove(names)
+            return self._respond(500, {'message': 'Poll failure.'})
+        if names:
+            names = names.split(',')
+        events = [event for event in EVENTS
+                  if (not names or event['notification'] in names) and
+                  (not timestamp or event['timestamp'] > timestamp)]
+        if not events:
+            time.sleep(0.05)
+        self._respond(200, events)
+
+
+class EventsHandler(object):
+    """Events handler class."""
+
+    def __init__(self, transport):
+        self._transport = transport
+        self.events = []
+
+    def handle_connect(self):
+        pass
+
+    def handle_events(self, events):
+        self.events.extend(events)
+
+    def handle_disconnect(self):
+        pass
+
+
+def subscription_request(subscription_id, names=(), timestamp=None):
+    subscription_api_request = SubscriptionApiRequest()
+    subscription_api_request.action('notification/insert')
+    subscription_api_request.url('device/notification/poll')
+    subscription_api_request.param('deviceId', 'device-id')
+    subscription_api_request.param('names', ','.join(names))
+    subscription_api_request.param('timestamp', timestamp)
+    subscription_api_request.response_key('notification')
+    return subscription_api_request.extract(subscription_id,
+                                            'request-%s' % subscription_id)
+
+
+def subscribe(transport, subscription_id, names=(), timestamp=None):
+    response = transport.request(
+        'subscribe-%s' % subscription_id, 'notification/subscribe', {},
+        subscription_request=subscription_request(subscription_id, names,
+                                                  timestamp))
+    assert response['status'] == 'success'
+
+
+def received_event_ids(transport, subscription_id, num_events):
+    for _ in range(100):
+        event_ids = [event['notification']['id']
+                     for event in transport.handler.events
+                     if event['subscriptionId'] == subscription_id]
+        if len(event_ids) >= num_events:
+            return event_ids
+        time.sleep(0.02)
+    return event_ids
+
+
+def run_transport(test, **options):
+    server = PollServer()
+    server_thread = threading.Thread(target=server.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+    transport = HttpTransport(JsonDataFormat, {}, EventsHandler, {})
+    transport.connect(server.url, **options)
+    while not transport.connected:
+        time.sleep(0.01)
+    try:
+        test(server, transport)
+    finally:
+        transport.disconnect()
+        transport.join(5)
+        server.shutdown()
+        server.server_close()
+
+
+def test_subscription_group_poll_params_and_dispatch():
+    params = subscription_request('s1', ['a'])['params']
+    subscription_group = SubscriptionGroup(
+        SubscriptionGroup.group_key('notification/insert', params), 'r1',
+        'notification/insert', {}, params)
+    subscription_group.add('s1', params)
+    subscription_group.add('s2', subscription_request('s2', ['b'])['params'])
+    poll_params = subscription_group.poll_params()
+    assert poll_params['params']['names'] == 'a,b'
+    assert 'timestamp' not in poll_params['params']
+    events = subscription_group.dispatch(EVENTS[:3], ['s1', 's2'])
+    assert [(subscription_id, event['id'])
+            for subscription_id, event in events] == [('s1', 1), ('s1', 2),
+                                                      ('s2', 3)]
+    poll_params = subscription_group.poll_params()
+    assert poll_params['params']['timestamp'] == EVENTS[2]['timestamp']
+    assert not subscription_group.compatible(
+        subscription_request('s3')['params'])
+    assert subscription_group.compatible(
+        subscription_request('s3', timestamp=EVENTS[0]['timestamp'])[
+            'params'])
+    split_subscription_groups = subscription_group.split()
+    assert [split_subscription_group.subscription_ids
+            for split_subscription_group in split_subscription_groups] == [
+        ['s1'], ['s2']]
+    assert split_subscription_groups[1].poll_params()['params'] == {
+        'deviceId': 'device-id', 'names': 'b',
+        'timestamp': EVENTS[2]['timestamp']}
+
+
+def test_coalesced_subscriptions():
+    def test(server, transport):
+        timestamp = EVENTS[0]['timestamp']
+        subscribe(transport, 's1', ['a'], timestamp)
+        subscribe(transport, 's2', ['b'], timestamp)
+        assert received_event_ids(transport, 's1', 2) == [2, 4]
+        assert received_event_ids(transport, 's2', 1) == [3]
+        assert len(transport.subscription_groups) == 1
+        assert ('a,b', timestamp) in server.polls
+
+    run_transport(test)
+
+
+def test_subscription_without_timestamp_is_not_coalesced():
+    def test(server, transport):
+        subscribe(transport, 's1', ['a'], EVENTS[0]['timestamp'])
+        subscribe(transport, 's2', ['c'])
+        assert received_event_ids(transport, 's1', 2) == [2, 4]
+        time.sleep(0.2)
+        assert received_event_ids(transport, 's2', 1) == [5]
+        assert len(transport.subscription_groups) == 2
+        assert ('a,c', EVENTS[0]['timestamp']) not in server.polls
+
+    run_transport(test)
+
+
+def test_coalesced_subscription_failure_is_isolated():
+    def test(server, transport):
+        timestamp = EVENTS[0]['timestamp']
+        server.fail_names.add('a,b')
+        subscribe(transport, 's1', ['a'], timestamp)
+        subscribe(transport, 's2', ['b'], timestamp)
+        assert received_event_ids(transport, 's1', 2) == [2, 4]
+        assert received_event_ids(transport, 's2', 1) == [3]
+        assert not transport.exception_info
+        assert len(transport.subscription_groups) == 2
+
+    run_transport(test)
+
+
+def test_max_host_connections():
+    def test(server, transport):
+        request_threads = [
+            threading.Thread(target=transport._request_call,
+                             args=('GET', server.url + 'slow'))
+            for _ in range(6)]
+        for request_thread in request_threads:
+            request_thread.start()
+        for request_thread in request_threads:
+            request_thread.join(5)
+        assert server.max_connections == 2
+
+    run_transport(test, max_host_connections=2)
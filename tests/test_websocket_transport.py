@@ -0,0 +1,86 @@
+# Copyright (C) 2018 DataArt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# =============================================================================
+
+
+from devicehive.transports.websocket_transport import WebsocketTransport
+from devicehive.transports.websocket_transport import WebsocketTransportError
+from devicehive.data_formats.json_data_format import JsonDataFormat
+import threading
+import socket
+import pytest
+
+
+class FailingWebsocket(object):
+    """Failing websocket class."""
+
+    def __init__(self):
+        self.timeout = None
+        self.sock = None
+        self.fail = threading.Event()
+
+    def connect(self, url, **options):
+        pass
+
+    def recv_data(self, control_frame):
+        self.fail.wait()
+        raise socket.error('Connection reset.')
+
+    def send(self, data, opcode):
+        pass
+
+    def ping(self):
+        raise socket.error('Broken pipe.')
+
+    def close(self):
+        pass
+
+
+class TransportHandler(object):
+    """Transport handler class."""
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.connected = threading.Event()
+        self.disconnected = False
+
+    def handle_connect(self):
+        self.connected.set()
+
+    def handle_events(self, events):
+        pass
+
+    def handle_disconnect(self):
+        self.disconnected = True
+
+
+def test_socket_failure_fails_pending_requests():
+    transport = WebsocketTransport(JsonDataFormat, {}, TransportHandler, {})
+    failing_websocket = FailingWebsocket()
+    transport._websocket = failing_websocket
+    transport.connect('ws://127.0.0.1/api/websocket')
+    assert transport.handler.connected.wait(5)
+    response_future = transport.request_async('r1', 'server/info', {})
+    failing_websocket.fail.set()
+    transport.join(5)
+    assert not transport.is_alive()
+    assert response_future.wait(0)
+    with pytest.raises(WebsocketTransportError):
+        response_future.result(0)
+    assert transport.handler.disconnected
+    assert isinstance(transport.exception_info[1], WebsocketTransportError)
+    for thread in threading.enumerate():
+        if thread.name == 'websocket-transport-event':
+            thread.join(5)
+            assert not thread.is_alive()